@@ -19,7 +19,9 @@ else:
 
 # pattoo imports
 from pattoo.cli.cli import Parser
-from pattoo.cli import cli_show, cli_create, cli_set, cli_import, cli_assign
+from pattoo.cli import (
+    cli_show, cli_create, cli_set, cli_import, cli_assign, cli_migrate,
+    cli_export)
 from pattoo.db.db import connectivity
 
 
@@ -59,6 +61,12 @@ def main():
     elif args.action == 'assign':
         cli_assign.process(args)
 
+    elif args.action == 'migrate':
+        cli_migrate.process(args)
+
+    elif args.action == 'export':
+        cli_export.process(args)
+
     # Print help if no argument options were triggered
     parser.print_help(sys.stderr)
     sys.exit(1)
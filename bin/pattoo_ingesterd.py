@@ -10,6 +10,7 @@ from __future__ import print_function
 from time import sleep, time
 import sys
 import os
+import signal
 
 # Try to create a working PYTHONPATH
 _BIN_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
@@ -29,7 +30,8 @@ from pattoo_shared.agent import Agent, AgentCLI
 from pattoo.constants import PATTOO_INGESTERD_NAME, PATTOO_INGESTER_SCRIPT
 from pattoo.configuration import ConfigIngester as Config
 from pattoo import sysinfo
-from pattoo.ingest import files
+from pattoo.ingest import files, watch, retention
+from pattoo.ingest.records import WorkerPool
 from pattoo.db.db import connectivity
 
 
@@ -49,6 +51,7 @@ class PollingAgent(Agent):
         """
         # Initialize key variables
         Agent.__init__(self, parent, config=config)
+        self._pool = None
 
     def query(self):
         """Query all remote targets for data.
@@ -61,13 +64,65 @@ class PollingAgent(Agent):
 
         """
         # Initialize key variables
-        use_script = False
-        _running = False
         config = self.config
         interval = config.ingester_interval()
         script = '{}{}{}'.format(
             _BIN_DIRECTORY, os.sep, PATTOO_INGESTER_SCRIPT)
 
+        # Create a worker pool that is reused for every ingester cycle
+        if config.multiprocessing() is True:
+            self._pool = WorkerPool(
+                maxtasksperchild=config.worker_max_tasks())
+
+        # Close the worker pool when the daemon is stopped
+        signal.signal(signal.SIGTERM, _terminate)
+        try:
+            self._ingest(script, interval)
+        finally:
+            self.close()
+
+    def close(self):
+        """Terminate the worker processes.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def _ingest(self, script, interval):
+        """Ingest agent data until the daemon is stopped.
+
+        Args:
+            script: Ingester script used instead of ingesting in this process
+                if enabled
+            interval: Interval between ingester cycles
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        use_script = False
+        _running = False
+        config = self.config
+
+        # Purge expired data without delaying ingestion
+        retention.start(config.purge_interval())
+
+        # Ingest files as soon as they arrive
+        if config.ingester_mode() == 'continuous':
+            watch.process_continuously(
+                batch_size=config.batch_size(),
+                latency=config.batch_latency(),
+                pool=self._pool)
+            return
+
         # Post data to the remote server
         while True:
             # Get start time
@@ -85,7 +140,7 @@ class PollingAgent(Agent):
                     success = not bool(_result)
                 else:
                     # Process cache with function
-                    success = files.process_cache()
+                    success = files.process_cache(pool=self._pool)
 
                 if bool(success) is False:
                     log_message = ('''\
@@ -112,6 +167,20 @@ for possible causes.''')
             sleep(sleep_time)
 
 
+def _terminate(signum, frame):
+    """Exit when the daemon is stopped so that cleanup code runs.
+
+    Args:
+        signum: Signal number
+        frame: Current stack frame
+
+    Returns:
+        None
+
+    """
+    sys.exit(0)
+
+
 def check_lockfile():
     """Delete lockfile if found and ingester is not running.
 
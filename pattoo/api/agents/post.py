@@ -4,7 +4,7 @@
 import os
 import json
 import sys
-from random import randrange
+import itertools
 import hashlib
 import uuid
 
@@ -14,14 +14,18 @@ from flask import Blueprint, request, abort, session, jsonify
 # pattoo imports
 from pattoo_shared import log
 from pattoo_shared.constants import CACHE_KEYS
-from pattoo_shared.configuration import ServerConfig as Config
+from pattoo.configuration import ConfigAgent as Config
 from pattoo.constants import PATTOO_API_AGENT_NAME
+from pattoo import spool
 from pattoo_shared.files import get_gnupg
 
 
 # Define the POST global variable
 POST = Blueprint('POST', __name__)
 
+# Sequence number of cache files created by this process
+_SEQUENCE = itertools.count(1)
+
 
 @POST.route('/receive/<source>', methods=['POST'])
 def receive(source):
@@ -37,10 +41,6 @@ def receive(source):
     # Initialize key variables
     prefix = 'Invalid posted data.'
 
-    # Read configuration
-    config = Config()
-    cache_dir = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
-
     # Get JSON from incoming agent POST
     try:
         posted_data = request.json
@@ -73,17 +73,9 @@ def receive(source):
         log.log2exception(20025, _exception, message=log_message)
         abort(404)
 
-    # Create filename. Add a suffix in the event the source is posting
-    # frequently.
-    suffix = str(randrange(100000)).zfill(6)
-    json_path = (
-        '{}{}{}_{}_{}.json'.format(
-            cache_dir, os.sep, timestamp, source, suffix))
-
-    # Create cache file
+    # Save the data for the ingester
     try:
-        with open(json_path, 'w+') as temp_file:
-            json.dump(posted_data, temp_file)
+        _save(posted_data, source, timestamp)
     except Exception as err:
         log_message = '{}'.format(err)
         log.log2warning(20016, log_message)
@@ -344,7 +336,6 @@ def crypt_receive():
 
     # Read configuration
     config = Config()
-    cache_dir = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
 
     try:
         # Retrieves Pgpier class
@@ -432,20 +423,9 @@ def crypt_receive():
             log.log2exception(20181, _exception, message=log_message)
             abort(404)
 
-        # Create filename. Add a suffix in the event the source is posting
-        # frequently.
-        suffix = str(randrange(100000)).zfill(6)
-        json_path = (
-                     '{}{}{}_{}_{}.json'
-                     .format(
-                             cache_dir, os.sep, timestamp, source, suffix
-                             )
-                     )
-        
-        # Create cache file
+        # Save the data for the ingester
         try:
-            with open(json_path, 'w+') as temp_file:
-                json.dump(posted_data, temp_file)
+            _save(posted_data, source, timestamp)
         except Exception as err:
             log_message = '{}'.format(err)
             log.log2warning(20182, log_message)
@@ -462,3 +442,44 @@ def crypt_receive():
         log.log2info(20184, message)
         
     return message, response
+
+
+def _save(posted_data, source, timestamp):
+    """Save data posted by an agent for the ingester.
+
+    Errors aren't trapped so that each API route logs them with its own
+    log codes.
+
+    Args:
+        posted_data: Data posted by the agent
+        source: Unique Identifier of an pattoo agent
+        timestamp: Timestamp of the posted data
+
+    Returns:
+        None
+
+    """
+    # Read configuration
+    config = Config()
+    cache_dir = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+
+    # Create cache file or append to the spool segment of this process
+    if config.spool_mode() == 'segments':
+        _writer = spool.writer(
+            cache_dir,
+            max_size=config.spool_segment_size(),
+            max_age=config.spool_segment_age())
+        _writer.append(posted_data, timestamp=timestamp)
+    else:
+        # Create filename. The process ID and sequence number make it
+        # unique in the event the source is posting frequently.
+        filename = '{}_{}_{}_{}.json'.format(
+            timestamp, source, os.getpid(), next(_SEQUENCE))
+        json_path = '{}{}{}'.format(cache_dir, os.sep, filename)
+
+        # Write to a temporary file the ingester ignores, then rename it.
+        # The ingester will therefore never read partially written files.
+        temp_path = '{}{}.{}.tmp'.format(cache_dir, os.sep, filename)
+        with open(temp_path, 'w+') as temp_file:
+            json.dump(posted_data, temp_file)
+        os.rename(temp_path, json_path)
@@ -9,6 +9,7 @@ from pattoo_shared.constants import PATTOO_API_WEB_PREFIX
 
 # Import pattoo modules
 from pattoo.db import POOL
+from pattoo.api.web import caching
 
 # Setup REST URI prefix
 PATTOO_API_WEB_REST_PREFIX = '{}/rest'.format(PATTOO_API_WEB_PREFIX)
@@ -16,8 +17,9 @@ PATTOO_API_WEB_REST_PREFIX = '{}/rest'.format(PATTOO_API_WEB_PREFIX)
 # Setup flask
 PATTOO_API_WEB = Flask(__name__)
 
-# Setup memcache. Required for all API imports
-CACHE = Cache(PATTOO_API_WEB, config={'CACHE_TYPE': 'simple'})
+# Setup the response cache. Required for all API imports
+CACHE = Cache()
+caching.init_app(CACHE, PATTOO_API_WEB)
 
 # Import PATTOO_API_WEB Blueprints (MUST be done after CACHE)
 from pattoo.api.web.graphql import GRAPHQL
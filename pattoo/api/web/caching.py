@@ -0,0 +1,154 @@
+"""Configure the cache of web API responses.
+
+The default 'simple' cache is private to each web API process. The
+'filesystem', 'memcached' and 'redis' caches are shared by all the
+processes, so identical requests to different gunicorn workers are only
+answered from the database once.
+
+"""
+
+# Standard imports
+import sys
+import hashlib
+from functools import wraps
+from datetime import datetime, timezone
+
+# PIP libraries
+from flask import request, make_response
+
+# Import project libraries
+from pattoo_shared import log
+from pattoo.configuration import ConfigPattoo as Config
+
+
+def config(_config=None):
+    """Get the Flask-Caching configuration.
+
+    Args:
+        _config: ConfigPattoo object. Created if None
+
+    Returns:
+        result: Dict of Flask-Caching configuration values
+
+    """
+    # Initialize key variables
+    if _config is None:
+        _config = Config()
+    cache_type = _config.response_cache_type()
+    result = {'CACHE_DEFAULT_TIMEOUT': _config.response_cache_timeout()}
+
+    # Add settings of the cache type
+    if cache_type == 'filesystem':
+        result['CACHE_TYPE'] = 'FileSystemCache'
+        result['CACHE_DIR'] = _config.response_cache_directory()
+    elif cache_type == 'memcached':
+        result['CACHE_TYPE'] = 'MemcachedCache'
+        result['CACHE_MEMCACHED_SERVERS'] = _config.response_cache_servers()
+    elif cache_type == 'redis':
+        result['CACHE_TYPE'] = 'RedisCache'
+        result['CACHE_REDIS_URL'] = _config.response_cache_servers()[0]
+    else:
+        result['CACHE_TYPE'] = 'SimpleCache'
+    return result
+
+
+def init_app(cache, app):
+    """Initialize the cache of a Flask application.
+
+    The 'memcached' and 'redis' caches require optional client libraries.
+    The 'simple' cache is used if the configured cache cannot be created.
+
+    Args:
+        cache: flask_caching.Cache object
+        app: Flask object
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    _config = config()
+
+    try:
+        cache.init_app(app, config=_config)
+    except:
+        _exception = sys.exc_info()
+        log_message = ('''\
+Cannot create a "{}" response cache. Using a cache private to each \
+process instead.'''.format(_config['CACHE_TYPE']))
+        log.log2exception(20229, _exception, message=log_message)
+        cache.init_app(app, config={
+            'CACHE_TYPE': 'SimpleCache',
+            'CACHE_DEFAULT_TIMEOUT': _config['CACHE_DEFAULT_TIMEOUT']})
+
+
+def conditional(make_etag, last_modified):
+    """Decorate views to support conditional requests.
+
+    Responses get an ETag and a Last-Modified header. Requests with a
+    matching If-None-Match header get an empty 304 response without calling
+    the view.
+
+    Args:
+        make_etag: Function creating the ETag from the view arguments
+        last_modified: Function getting the timestamp in milliseconds of the
+            most recent data from the view arguments
+
+    Returns:
+        decorator: Decorator
+
+    """
+    def decorator(function):
+        """Decorate the view.
+
+        Args:
+            function: View function
+
+        Returns:
+            wrapper: Decorated view function
+
+        """
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            """Run the view if the client's copy of the response is stale.
+
+            Args:
+                args: View arguments
+                kwargs: View keyword arguments
+
+            Returns:
+                response: Flask response
+
+            """
+            # Use the client's copy if it is current
+            etag = make_etag(*args, **kwargs)
+            if request.if_none_match.contains(etag) is True:
+                response = make_response('', 304)
+            else:
+                response = make_response(function(*args, **kwargs))
+
+            # Add headers
+            response.set_etag(etag)
+            timestamp = last_modified(*args, **kwargs)
+            if bool(timestamp) is True:
+                response.last_modified = datetime.fromtimestamp(
+                    timestamp // 1000, tz=timezone.utc)
+            return response
+        return wrapper
+    return decorator
+
+
+def key(*args):
+    """Create a cache key.
+
+    Args:
+        args: Values that uniquely identify the cached response
+
+    Returns:
+        result: Cache key that is valid for all cache types
+
+    """
+    # Memcached keys are limited to 250 characters without spaces
+    value = '\n'.join([str(_) for _ in args])
+    result = 'pattoo/{}'.format(hashlib.md5(value.encode()).hexdigest())
+    return result
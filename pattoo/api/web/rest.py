@@ -1,40 +1,280 @@
 """Pattoo version routes."""
 
+# Standard imports
+import time
+
 # PIP libraries
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, request, stream_with_context
+from pattoo_shared.times import normalized_timestamp
 
 # pattoo imports
-from pattoo.api.web import CACHE
+from pattoo.api.web import CACHE, caching, serialize
 from pattoo import data
 from pattoo import uri
-from pattoo.db.table.datapoint import DataPoint
+from pattoo import downsample
+from pattoo.db import export
+from pattoo.db.table.datapoint import DataPoint, DataPoints
 
 # Define the various global variables
 REST_API_DATA = Blueprint('REST_API_DATA', __name__)
 
 
+def _data_key(idx_datapoint):
+    """Create the cache key of route_data responses.
+
+    Responses only change when new data is ingested or the time range moves
+    to the next polling interval, so the key includes both. This allows a
+    shared cache to answer identical requests to all the web API processes
+    until the next polling interval.
+
+    Args:
+        idx_datapoint: DataPoint.idx_datapoint key
+
+    Returns:
+        result: Cache key
+
+    """
+    # Create key
+    _datapoint = DataPoint(idx_datapoint, cached=True)
+    result = caching.key(
+        request.path, _query_string(), serialize.negotiate(),
+        normalized_timestamp(_datapoint.polling_interval()),
+        _datapoint.last_timestamp())
+    return result
+
+
+def _data_batch_key():
+    """Create the cache key of route_data_batch responses.
+
+    Args:
+        None
+
+    Returns:
+        result: Cache key
+
+    """
+    # Create key
+    _datapoints = DataPoints(_idx_datapoints(), cached=True)
+    result = caching.key(
+        request.path, _query_string(), serialize.negotiate(),
+        normalized_timestamp(_datapoints.polling_interval()),
+        _datapoints.last_timestamp())
+    return result
+
+
+def _data_last_modified(idx_datapoint):
+    """Get the timestamp of the most recent data of route_data responses.
+
+    Args:
+        idx_datapoint: DataPoint.idx_datapoint key
+
+    Returns:
+        result: Timestamp
+
+    """
+    result = DataPoint(idx_datapoint, cached=True).last_timestamp()
+    return result
+
+
+def _data_batch_last_modified():
+    """Get the timestamp of the most recent data of route_data_batch responses.
+
+    Args:
+        None
+
+    Returns:
+        result: Timestamp
+
+    """
+    result = DataPoints(_idx_datapoints(), cached=True).last_timestamp()
+    return result
+
+
 @REST_API_DATA.route('/data/<int:idx_datapoint>')
-@CACHE.cached(query_string=True, timeout=10)
+@caching.conditional(_data_key, _data_last_modified)
+@CACHE.cached(make_cache_key=_data_key)
 def route_data(idx_datapoint):
     """Provide data from the Data table.
 
     Args:
         idx_datapoint: DataPoint.idx_datapoint key
 
+    Query string:
+        secondsago: Number of seconds of data to return
+        points: Maximum number of points to return. All points are returned
+            if not provided
+        bucket: Method used to reduce the number of points to 'points'.
+            Either 'lttb' (default), 'minmax' or 'mean'
+        format: 'rows' (default) or 'columns'. Overrides the Accept header
+
     Returns:
-        _result: JSONify list of dicts {timestamp: value} from the Data table.
+        _result: JSON list of dicts {timestamp: value} from the Data table,
+            or dict of timestamps and values lists
 
     """
     # Initialize key variables
     _result = {}
     secondsago = data.integerize(request.args.get('secondsago'))
+    points = data.integerize(request.args.get('points'))
+    bucket = request.args.get('bucket', 'lttb')
+    _format = serialize.negotiate()
     ts_start = uri.chart_timestamp_args(idx_datapoint, secondsago)
 
-    # Get data
-    _datapoint = DataPoint(idx_datapoint)
+    # Get data. Read pre-aggregated rollups when fewer points are required.
+    _datapoint = DataPoint(idx_datapoint, cached=True)
     ts_stop = _datapoint.last_timestamp()
-    _result = _datapoint.data(ts_start, ts_stop)
+    step = None
+    if bool(points) is True and bool(ts_stop) is True:
+        step = max(0, ts_stop - ts_start) // max(1, points)
+
+    # Downsampled data is converted to columns afterwards
+    if bool(points) is True:
+        _result = downsample.downsample(
+            _datapoint.data(ts_start, ts_stop, step=step), points,
+            method=bucket)
+        if _format == 'columns':
+            _result = serialize.columns(_result)
+    else:
+        _result = _datapoint.data(
+            ts_start, ts_stop, columnar=_format == 'columns')
+
+    # Return
+    result = serialize.response(_result, _format)
+    return result
+
+
+@REST_API_DATA.route('/data')
+@caching.conditional(_data_batch_key, _data_batch_last_modified)
+@CACHE.cached(make_cache_key=_data_batch_key)
+def route_data_batch():
+    """Provide data of multiple DataPoints from the Data table.
+
+    Args:
+        None
+
+    Query string:
+        idx_datapoints: Comma separated list of DataPoint.idx_datapoint keys
+        secondsago: Number of seconds of data to return
+        points: Maximum number of points to return per DataPoint. All points
+            are returned if not provided
+        bucket: Method used to reduce the number of points to 'points'.
+            Either 'lttb' (default), 'minmax' or 'mean'
+        format: 'rows' (default) or 'columns'. Overrides the Accept header
+
+    Returns:
+        _result: JSON dict of lists of dicts {timestamp: value}, or of dicts
+            of timestamps and values lists, keyed by idx_datapoint
+
+    """
+    # Initialize key variables
+    secondsago = data.integerize(request.args.get('secondsago'))
+    points = data.integerize(request.args.get('points'))
+    bucket = request.args.get('bucket', 'lttb')
+    _format = serialize.negotiate()
+    columnar = bool(points) is False and _format == 'columns'
+
+    # Get data of all DataPoints with a single query. Read pre-aggregated
+    # rollups when fewer points are required.
+    _datapoints = DataPoints(_idx_datapoints(), cached=True)
+    ts_start = uri.timestamp_args(
+        secondsago,
+        now=normalized_timestamp(_datapoints.polling_interval()))
+    ts_stop = _datapoints.last_timestamp()
+    step = None
+    if bool(points) is True and bool(ts_stop) is True:
+        step = max(0, ts_stop - ts_start) // max(1, points)
+    _data = _datapoints.data(ts_start, step=step, columnar=columnar)
+
+    # Downsample. Downsampled data is converted to columns afterwards.
+    _result = {}
+    for idx_datapoint, values in _data.items():
+        if bool(points) is True:
+            values = downsample.downsample(values, points, method=bucket)
+            if _format == 'columns':
+                values = serialize.columns(values)
+        _result[str(idx_datapoint)] = values
 
     # Return
-    result = jsonify(_result)
+    result = serialize.response(_result, _format)
+    return result
+
+
+@REST_API_DATA.route('/export')
+def route_export():
+    """Export stored data values of multiple DataPoints.
+
+    The export is streamed as it is read from the database and isn't cached.
+
+    Args:
+        None
+
+    Query string:
+        idx_datapoints: Comma separated list of DataPoint.idx_datapoint keys
+        ts_start: Start time in milliseconds. Defaults to 'secondsago'
+        ts_stop: Stop time in milliseconds. Defaults to now
+        secondsago: Number of seconds before ts_stop to start the export.
+            Defaults to one week
+        compression: 'gzip' to compress the export
+
+    Returns:
+        result: Flask response of the pattoo.db.export format. Compressed
+            exports are sent as is with the GZIP_MIMETYPE media type
+
+    """
+    # Initialize key variables
+    ts_stop = data.integerize(request.args.get('ts_stop'))
+    if ts_stop is None:
+        ts_stop = int(time.time() * 1000)
+    ts_start = data.integerize(request.args.get('ts_start'))
+    if ts_start is None:
+        ts_start = uri.timestamp_args(
+            data.integerize(request.args.get('secondsago')), now=ts_stop)
+    compression = request.args.get('compression')
+    if compression in export.COMPRESSIONS:
+        mimetype = export.GZIP_MIMETYPE
+    else:
+        compression = None
+        mimetype = export.MIMETYPE
+
+    # Stream the export. The request context is kept for the database
+    # session of the server side cursor.
+    result = Response(
+        stream_with_context(export.export(
+            sorted(set(_idx_datapoints())), ts_start, ts_stop,
+            compression=compression)),
+        mimetype=mimetype)
+    return result
+
+
+def _idx_datapoints():
+    """Get the DataPoint.idx_datapoint keys of the request.
+
+    Args:
+        None
+
+    Returns:
+        result: List of DataPoint.idx_datapoint keys
+
+    """
+    # Ignore invalid values
+    result = [
+        data.integerize(_) for _ in request.args.get(
+            'idx_datapoints', '').split(',')]
+    result = [_ for _ in result if _ is not None]
+    return result
+
+
+def _query_string():
+    """Get the query string of the request in a consistent order.
+
+    Args:
+        None
+
+    Returns:
+        result: Query string
+
+    """
+    # Sort so that argument order doesn't create different keys
+    result = '&'.join(
+        '{}={}'.format(*_) for _ in sorted(request.args.items(multi=True)))
     return result
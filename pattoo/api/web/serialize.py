@@ -0,0 +1,118 @@
+"""Serialize web API responses.
+
+Data is returned as a list of {'timestamp': timestamp, 'value': value} dicts
+by default. The 'columns' format returns a single dict of 'timestamps' and
+'values' lists instead, which is much quicker to create and parse for large
+time ranges. Clients select it with the 'format=columns' query string or
+an Accept header of COLUMNS_MIMETYPE.
+
+The orjson or ujson packages are used to encode JSON when installed.
+
+"""
+
+# Standard imports
+import json
+
+# PIP libraries
+from flask import request, Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# Supported formats. The first is the default.
+FORMATS = ['rows', 'columns']
+
+# Media types of the formats
+JSON_MIMETYPE = 'application/json'
+COLUMNS_MIMETYPE = 'application/vnd.pattoo.columns+json'
+
+
+def negotiate():
+    """Get the format of the response to the current request.
+
+    Args:
+        None
+
+    Returns:
+        result: One of the FORMATS values. The query string takes precedence
+            over the Accept header
+
+    """
+    # Use the query string
+    result = request.args.get('format')
+    if result in FORMATS:
+        return result
+
+    # Use the Accept header
+    mimetype = request.accept_mimetypes.best_match(
+        [JSON_MIMETYPE, COLUMNS_MIMETYPE], default=JSON_MIMETYPE)
+    if mimetype == COLUMNS_MIMETYPE:
+        result = 'columns'
+    else:
+        result = 'rows'
+    return result
+
+
+def columns(points):
+    """Convert a list of timestamp, value dicts to the 'columns' format.
+
+    Args:
+        points: List of timestamp, value dicts
+
+    Returns:
+        result: Dict of 'timestamps' and 'values' lists
+
+    """
+    result = {
+        'timestamps': [_['timestamp'] for _ in points],
+        'values': [_['value'] for _ in points]}
+    return result
+
+
+def dumps(value):
+    """Encode a value as JSON.
+
+    Args:
+        value: Value to encode
+
+    Returns:
+        result: UTF-8 encoded JSON bytes
+
+    """
+    # Use the fastest encoder available
+    if orjson is not None:
+        result = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    elif ujson is not None:
+        result = ujson.dumps(value).encode()
+    else:
+        result = json.dumps(value, separators=(',', ':')).encode()
+    return result
+
+
+def response(value, _format='rows'):
+    """Create a JSON response.
+
+    Args:
+        value: Value to return
+        _format: One of the FORMATS values
+
+    Returns:
+        result: Flask response
+
+    """
+    # Create the response
+    if _format == 'columns':
+        mimetype = COLUMNS_MIMETYPE
+    else:
+        mimetype = JSON_MIMETYPE
+    result = Response(dumps(value), mimetype=mimetype)
+
+    # The format may depend on the Accept header
+    result.vary.add('Accept')
+    return result
@@ -0,0 +1,200 @@
+"""In-memory caches used by pattoo."""
+
+# Standard imports
+import time
+from collections import OrderedDict
+
+
+class LRU():
+    """Dict-like cache that evicts the least recently used entries."""
+
+    def __init__(self, maxsize=1024):
+        """Initialize the class.
+
+        Args:
+            maxsize: Maximum number of entries to keep
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._maxsize = max(1, int(maxsize))
+        self._data = OrderedDict()
+
+    def __contains__(self, key):
+        """Determine whether key is cached without updating its usage.
+
+        Args:
+            key: Key
+
+        Returns:
+            result: True if found
+
+        """
+        return key in self._data
+
+    def __len__(self):
+        """Get the number of cached entries.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of entries
+
+        """
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """Get a cached value.
+
+        Args:
+            key: Key
+            default: Value to return if key is not cached
+
+        Returns:
+            result: Cached value
+
+        """
+        # Return default if not found
+        if key not in self._data:
+            return default
+
+        # Mark as most recently used
+        self._data.move_to_end(key)
+        result = self._data[key]
+        return result
+
+    def put(self, key, value):
+        """Cache a value.
+
+        Args:
+            key: Key
+            value: Value
+
+        Returns:
+            None
+
+        """
+        # Add the value and evict the least recently used entries
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Remove a cached value.
+
+        Args:
+            key: Key
+            default: Value to return if key is not cached
+
+        Returns:
+            result: Value removed from the cache
+
+        """
+        return self._data.pop(key, default)
+
+    def clear(self):
+        """Remove all cached values.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        self._data.clear()
+
+
+class TTL(LRU):
+    """LRU cache whose entries expire a fixed time after being cached."""
+
+    def __init__(self, maxsize=1024, ttl=60):
+        """Initialize the class.
+
+        Args:
+            maxsize: Maximum number of entries to keep
+            ttl: Number of seconds entries are kept
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        LRU.__init__(self, maxsize=maxsize)
+        self._ttl = ttl
+
+    def __contains__(self, key):
+        """Determine whether key is cached without updating its usage.
+
+        Args:
+            key: Key
+
+        Returns:
+            result: True if found and not expired
+
+        """
+        result = key in self._data and self._expired(key) is False
+        return result
+
+    def get(self, key, default=None):
+        """Get a cached value.
+
+        Args:
+            key: Key
+            default: Value to return if key is not cached or has expired
+
+        Returns:
+            result: Cached value
+
+        """
+        # Remove expired entries
+        if key in self._data and self._expired(key) is True:
+            self._data.pop(key)
+
+        # Return
+        result = LRU.get(self, key, default=(default, None))[0]
+        return result
+
+    def put(self, key, value):
+        """Cache a value.
+
+        Args:
+            key: Key
+            value: Value
+
+        Returns:
+            None
+
+        """
+        LRU.put(self, key, (value, time.monotonic() + self._ttl))
+
+    def pop(self, key, default=None):
+        """Remove a cached value.
+
+        Args:
+            key: Key
+            default: Value to return if key is not cached
+
+        Returns:
+            result: Value removed from the cache
+
+        """
+        result = self._data.pop(key, (default, None))[0]
+        return result
+
+    def _expired(self, key):
+        """Determine whether a cached entry has expired.
+
+        Args:
+            key: Key of a cached entry
+
+        Returns:
+            result: True if expired
+
+        """
+        result = time.monotonic() >= self._data[key][1]
+        return result
@@ -85,6 +85,12 @@ class Parser():
         # Parse "assign", return object used for parser
         _Assign(subparsers, width=width)
 
+        # Parse "migrate", return object used for parser
+        _Migrate(subparsers, width=width)
+
+        # Parse "export", return object used for parser
+        _Export(subparsers, width=width)
+
         # Show help if no arguments
         if len(sys.argv) == 1:
             parser.print_help(sys.stderr)
@@ -536,3 +542,147 @@ class _Import():
             help='CSV filename',
             type=str,
             required=True)
+
+
+class _Migrate():
+    """Class gathers all CLI 'migrate' information."""
+
+    def __init__(self, subparsers, width=80):
+        """Intialize the class."""
+        # Initialize key variables
+        parser = subparsers.add_parser(
+            'migrate',
+            help=textwrap.fill(
+                'Migrate the pattoo DB storage format.', width=width)
+        )
+
+        # Add subparser
+        self.subparsers = parser.add_subparsers(dest='qualifier')
+
+        # Execute all methods in this Class
+        for name in dir(self):
+            # Get all attributes of Class
+            attribute = getattr(self, name)
+
+            # Determine whether attribute is a method
+            if ismethod(attribute):
+                # Ignore if method name is reserved (eg. __Init__)
+                if name.startswith('_'):
+                    continue
+
+                # Execute
+                attribute(width=width)
+
+    def data(self, width=80):
+        """Process migrate data CLI commands.
+
+        Args:
+            width: Width of the help text string to STDIO before wrapping
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        parser = self.subparsers.add_parser(
+            'data',
+            help=textwrap.fill('''\
+Convert stored data values to the configured db_value_type. Stop the \
+pattoo_ingesterd daemon first.''', width=width)
+        )
+
+        # Add arguments
+        parser.add_argument(
+            '--batch_size',
+            help='Number of rows copied per transaction',
+            type=int,
+            default=10000,
+            required=False)
+
+
+class _Export():
+    """Class gathers all CLI 'export' information."""
+
+    def __init__(self, subparsers, width=80):
+        """Intialize the class."""
+        # Initialize key variables
+        parser = subparsers.add_parser(
+            'export',
+            help=textwrap.fill(
+                'Export data from the pattoo DB.', width=width)
+        )
+
+        # Add subparser
+        self.subparsers = parser.add_subparsers(dest='qualifier')
+
+        # Execute all methods in this Class
+        for name in dir(self):
+            # Get all attributes of Class
+            attribute = getattr(self, name)
+
+            # Determine whether attribute is a method
+            if ismethod(attribute):
+                # Ignore if method name is reserved (eg. __Init__)
+                if name.startswith('_'):
+                    continue
+
+                # Execute
+                attribute(width=width)
+
+    def data(self, width=80):
+        """Process export data CLI commands.
+
+        Args:
+            width: Width of the help text string to STDIO before wrapping
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        parser = self.subparsers.add_parser(
+            'data',
+            help=textwrap.fill('''\
+Export the data values of DataPoints to a file in the pattoo binary columnar \
+format.''', width=width)
+        )
+
+        # Add arguments
+        parser.add_argument(
+            '--idx_datapoints',
+            help='Comma separated list of DataPoint indexes',
+            type=str,
+            required=True)
+
+        parser.add_argument(
+            '--start',
+            help='Start time in milliseconds. Default: one week ago',
+            type=int,
+            required=False)
+
+        parser.add_argument(
+            '--stop',
+            help='Stop time in milliseconds. Default: now',
+            type=int,
+            required=False)
+
+        parser.add_argument(
+            '--filename',
+            help='Name of the export file',
+            type=str,
+            required=True)
+
+        parser.add_argument(
+            '--compression',
+            help='Compression of the export file',
+            choices=['gzip'],
+            required=False)
+
+        parser.add_argument(
+            '--chunk_size',
+            help=textwrap.fill(
+                'Number of rows read from the database at a time. '
+                'Default: the db_chunk_size configuration value',
+                width=width),
+            type=int,
+            required=False)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Process CLI arguments."""
+
+from __future__ import print_function
+import sys
+import time
+
+# Import project libraries
+from pattoo_shared import log
+from pattoo.db import export
+from pattoo import uri
+
+
+def process(args):
+    """Process cli arguments.
+
+    Args:
+        args: CLI argparse parser arguments
+
+    Returns:
+        None
+
+    """
+    # Process options
+    if args.qualifier == 'data':
+        _process_data(args)
+        sys.exit(0)
+
+
+def _process_data(args):
+    """Process export data cli arguments.
+
+    Args:
+        args: CLI argparse parser arguments
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    ts_stop = args.stop if args.stop is not None else int(time.time() * 1000)
+    ts_start = args.start if args.start is not None else uri.timestamp_args(
+        now=ts_stop)
+    try:
+        idx_datapoints = sorted(set(
+            int(_) for _ in args.idx_datapoints.split(',') if _.strip()))
+    except ValueError:
+        log_message = ('''\
+Invalid --idx_datapoints value "{}"'''.format(args.idx_datapoints))
+        log.log2die(20232, log_message)
+
+    # Export
+    size = 0
+    with open(args.filename, 'wb') as f_handle:
+        for block in export.export(
+                idx_datapoints, ts_start, ts_stop,
+                compression=args.compression, chunk_size=args.chunk_size):
+            f_handle.write(block)
+            size += len(block)
+    print('Done. Exported {} bytes to {}.'.format(size, args.filename))
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Process CLI arguments."""
+
+from __future__ import print_function
+import sys
+
+# Import project libraries
+from pattoo.configuration import ConfigPattoo as Config
+from pattoo.db import migrate
+
+
+def process(args):
+    """Process cli arguments.
+
+    Args:
+        args: CLI argparse parser arguments
+
+    Returns:
+        None
+
+    """
+    # Process options
+    if args.qualifier == 'data':
+        _process_data(args)
+        sys.exit(0)
+
+
+def _process_data(args):
+    """Process migrate data cli arguments.
+
+    Args:
+        args: CLI argparse parser arguments
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    value_type = Config().db_value_type()
+
+    # Convert
+    print('Converting data values to {}.'.format(migrate.TYPES[value_type]))
+    count = migrate.data(
+        value_type, batch_size=args.batch_size,
+        progress=lambda _: print('Copied {} rows.'.format(_)))
+    print('Done. Converted {} rows.'.format(count))
+    if migrate.rollups(value_type) is True:
+        print('Converted data summaries.')
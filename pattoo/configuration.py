@@ -167,72 +167,96 @@ class ConfigPattoo(ServerConfig):
             result = int(intermediate)
         return result
 
-    def ip_listen_address(self):
-        """Get ip_listen_address.
+    def db_rollups(self):
+        """Get db_rollups.
 
         Args:
             None
 
         Returns:
-            result: result
+            result: True if the pt_data_rollup table is maintained and used
+                for long range queries
 
         """
         # Get result
-        key = PATTOO_API_WEB_NAME
-        sub_key = 'ip_listen_address'
-        result = search(
+        key = 'pattoo_db'
+        sub_key = 'db_rollups'
+        intermediate = configuration.search(
             key, sub_key, self._server_yaml_configuration, die=False)
 
-        # Default to 0.0.0.0
-        if result is None:
-            result = '0.0.0.0'
+        # Set default
+        result = _boolean(intermediate, default=False)
         return result
 
-    def ip_bind_port(self):
-        """Get ip_bind_port.
+    def db_chunk_size(self):
+        """Get db_chunk_size.
 
         Args:
             None
 
         Returns:
-            result: result
+            result: Number of rows fetched at a time by queries that read
+                large numbers of rows with a server side cursor
 
         """
-        # Initialize key variables
-        key = PATTOO_API_WEB_NAME
-        sub_key = 'ip_bind_port'
-
         # Get result
-        intermediate = search(
+        key = 'pattoo_db'
+        sub_key = 'db_chunk_size'
+        intermediate = configuration.search(
             key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Set default
         if intermediate is None:
-            result = 20202
+            result = 10000
         else:
-            result = int(intermediate)
+            result = max(1, int(intermediate))
         return result
 
+    def db_partition_days(self):
+        """Get db_partition_days.
 
-class ConfigAgent(ServerConfig):
-    """Class gathers all configuration information.
+        Args:
+            None
 
-    Only processes the following YAML keys in the configuration file:
+        Returns:
+            result: Number of days per partition of the pt_data table. The
+                table isn't partitioned if 0
 
-        The value of the PATTOO_API_WEB_NAME constant
+        """
+        # Get result
+        key = 'pattoo_db'
+        sub_key = 'db_partition_days'
+        intermediate = configuration.search(
+            key, sub_key, self._server_yaml_configuration, die=False)
 
-    """
+        # Set default
+        result = _days(intermediate)
+        return result
 
-    def __init__(self):
-        """Initialize the class.
+    def db_value_type(self):
+        """Get db_value_type.
 
         Args:
             None
 
         Returns:
-            None
+            result: SQL type used to store data values. Either 'numeric' for
+                NUMERIC(40, 10) or 'double' for DOUBLE
 
         """
-        # Instantiate the Config parent
-        ServerConfig.__init__(self)
+        # Initialize key variables
+        default = 'numeric'
+
+        # Get result
+        key = 'pattoo_db'
+        sub_key = 'db_value_type'
+        result = configuration.search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Set default
+        if result not in ['numeric', 'double']:
+            result = default
+        return result
 
     def ip_listen_address(self):
         """Get ip_listen_address.
@@ -245,7 +269,7 @@ class ConfigAgent(ServerConfig):
 
         """
         # Get result
-        key = PATTOO_API_AGENT_NAME
+        key = PATTOO_API_WEB_NAME
         sub_key = 'ip_listen_address'
         result = search(
             key, sub_key, self._server_yaml_configuration, die=False)
@@ -266,7 +290,7 @@ class ConfigAgent(ServerConfig):
 
         """
         # Initialize key variables
-        key = PATTOO_API_AGENT_NAME
+        key = PATTOO_API_WEB_NAME
         sub_key = 'ip_bind_port'
 
         # Get result
@@ -278,141 +302,177 @@ class ConfigAgent(ServerConfig):
             result = int(intermediate)
         return result
 
-    def api_email_address(self):
-        """GET API email address from yaml file.
+    def metadata_cache_ttl(self):
+        """Get metadata_cache_ttl.
 
         Args:
             None
 
         Returns:
-            email (str): Email address of API
+            result: Number of seconds DataPoint metadata is cached by the
+                web API. Not cached if 0
+
         """
-        # Initialize key variables
-        key = PATTOO_API_AGENT_NAME
-        sub_key = 'api_encryption_email'
+        # Initialize key varibles
+        default = 10
 
-        result = search(
+        # Get result
+        key = PATTOO_API_WEB_NAME
+        sub_key = 'metadata_cache_ttl'
+        _result = search(
             key, sub_key, self._server_yaml_configuration, die=False)
-        if result is None:
-            result = 'pattoo_api@example.org'
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = abs(int(_result))
+            except:
+                result = default
         return result
 
+    def graphql_page_size(self):
+        """Get graphql_page_size.
 
-class ConfigIngester(ServerConfig):
-    """Class gathers all configuration information.
+        Args:
+            None
 
-    Only processes the following YAML keys in the configuration file:
+        Returns:
+            result: Maximum number of results per page of GraphQL queries.
+                None if unlimited, which must be configured with a value of 0
 
-        The value of the PATTOO_INGESTERD_NAME constant
+        """
+        # Initialize key varibles
+        default = 1000
 
-    """
+        # Get result
+        key = PATTOO_API_WEB_NAME
+        sub_key = 'graphql_page_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
 
-    def __init__(self):
-        """Initialize the class.
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = abs(int(_result))
+            except:
+                result = default
+            if result == 0:
+                result = None
+        return result
+
+    def versions_file(self):
+        """Get versions_file.
 
         Args:
             None
 
         Returns:
-            None
+            result: File to which the ingester publishes the most recent
+                timestamp of each DataPoint
 
         """
-        # Instantiate the Config parent
-        ServerConfig.__init__(self)
+        # Return
+        result = os.path.join(
+            self.daemon_directory(), 'pattoo_datapoint_versions.bin')
+        return result
 
-    def ingester_interval(self):
-        """Get ingester_interval.
+    def response_cache_type(self):
+        """Get response_cache_type.
 
         Args:
             None
 
         Returns:
-            result: result
+            result: Where web API responses are cached. One of 'simple',
+                'filesystem', 'memcached' or 'redis'
 
         """
+        # Initialize key variables
+        default = 'simple'
+
         # Get result
-        key = PATTOO_INGESTERD_NAME
-        sub_key = 'ingester_interval'
+        key = PATTOO_API_WEB_NAME
+        sub_key = 'response_cache_type'
         result = search(
             key, sub_key, self._server_yaml_configuration, die=False)
 
-        # Make sure we have an integer
-        try:
-            result = max(15, abs(int(result)))
-        except:
-            result = None
-
-        # Default to 1 hour
-        if result is None:
-            result = 3600
+        # Set default
+        if result not in ['simple', 'filesystem', 'memcached', 'redis']:
+            result = default
         return result
 
-    def graceful_timeout(self):
-        """Get graceful_timeout.
+    def response_cache_directory(self):
+        """Get response_cache_directory.
 
         Args:
             None
 
         Returns:
-            result: result
+            result: Directory of the 'filesystem' response cache
 
         """
         # Get result
-        key = PATTOO_INGESTERD_NAME
-        sub_key = 'graceful_timeout'
+        key = PATTOO_API_WEB_NAME
+        sub_key = 'response_cache_directory'
         result = search(
             key, sub_key, self._server_yaml_configuration, die=False)
 
-        # Make sure we have an integer
-        try:
-            result = int(result)
-        except:
-            result = None
-
-        # Default to 1 hour
+        # Set default
         if result is None:
-            result = 10
+            result = os.path.join(self.daemon_directory(), PATTOO_API_WEB_NAME)
+        else:
+            result = os.path.expanduser(result)
         return result
 
-    def multiprocessing(self):
-        """Get multiprocessing.
+    def response_cache_servers(self):
+        """Get response_cache_servers.
 
         Args:
             None
 
         Returns:
-            result: result
+            result: List of 'host:port' memcached servers, or a list with
+                the URL of the redis server
 
         """
+        # Initialize key variables
+        defaults = {
+            'memcached': ['localhost:11211'],
+            'redis': ['redis://localhost:6379/0']}
+
         # Get result
-        key = PATTOO_INGESTERD_NAME
-        sub_key = 'multiprocessing'
-        _result = search(
+        key = PATTOO_API_WEB_NAME
+        sub_key = 'response_cache_servers'
+        result = search(
             key, sub_key, self._server_yaml_configuration, die=False)
 
-        # Return
-        if _result is None:
-            result = True
-        else:
-            result = bool(_result)
+        # Set default
+        if bool(result) is False:
+            result = defaults.get(self.response_cache_type(), [])
+        elif isinstance(result, str) is True:
+            result = [result]
         return result
 
-    def batch_size(self):
-        """Get batch_size.
+    def response_cache_timeout(self):
+        """Get response_cache_timeout.
 
         Args:
             None
 
         Returns:
-            result: result
+            result: Maximum number of seconds web API responses are cached
 
         """
         # Initialize key varibles
-        default = 500
+        default = 300
 
         # Get result
-        key = PATTOO_INGESTERD_NAME
-        sub_key = 'batch_size'
+        key = PATTOO_API_WEB_NAME
+        sub_key = 'response_cache_timeout'
         _result = search(
             key, sub_key, self._server_yaml_configuration, die=False)
 
@@ -421,7 +481,721 @@ class ConfigIngester(ServerConfig):
             result = default
         else:
             try:
-                result = int(_result)
+                result = abs(int(_result))
             except:
                 result = default
         return result
+
+
+class ConfigAgent(ServerConfig):
+    """Class gathers all configuration information.
+
+    Only processes the following YAML keys in the configuration file:
+
+        The value of the PATTOO_API_WEB_NAME constant
+
+    """
+
+    def __init__(self):
+        """Initialize the class.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Instantiate the Config parent
+        ServerConfig.__init__(self)
+
+    def ip_listen_address(self):
+        """Get ip_listen_address.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'ip_listen_address'
+        result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Default to 0.0.0.0
+        if result is None:
+            result = '0.0.0.0'
+        return result
+
+    def ip_bind_port(self):
+        """Get ip_bind_port.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key variables
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'ip_bind_port'
+
+        # Get result
+        intermediate = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+        if intermediate is None:
+            result = 20202
+        else:
+            result = int(intermediate)
+        return result
+
+    def api_email_address(self):
+        """GET API email address from yaml file.
+
+        Args:
+            None
+
+        Returns:
+            email (str): Email address of API
+        """
+        # Initialize key variables
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'api_encryption_email'
+
+        result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+        if result is None:
+            result = 'pattoo_api@example.org'
+        return result
+
+    def spool_mode(self):
+        """Get spool_mode.
+
+        Args:
+            None
+
+        Returns:
+            result: How posted agent data is cached. Either 'files' for one
+                JSON file per post or 'segments' for appending to rotating
+                segment files
+
+        """
+        # Initialize key varibles
+        default = 'files'
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'spool_mode'
+        result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if result not in ['files', 'segments']:
+            result = default
+        return result
+
+    def spool_segment_size(self):
+        """Get spool_segment_size.
+
+        Args:
+            None
+
+        Returns:
+            result: Size in bytes at which a spool segment is closed
+
+        """
+        # Initialize key varibles
+        default = 4194304
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'spool_segment_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def spool_segment_age(self):
+        """Get spool_segment_age.
+
+        Args:
+            None
+
+        Returns:
+            result: Age in seconds at which a spool segment is closed
+
+        """
+        # Initialize key varibles
+        default = 10
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'spool_segment_age'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+
+class ConfigIngester(ServerConfig):
+    """Class gathers all configuration information.
+
+    Only processes the following YAML keys in the configuration file:
+
+        The value of the PATTOO_INGESTERD_NAME constant
+
+    """
+
+    def __init__(self):
+        """Initialize the class.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Instantiate the Config parent
+        ServerConfig.__init__(self)
+
+    def ingester_interval(self):
+        """Get ingester_interval.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'ingester_interval'
+        result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Make sure we have an integer
+        try:
+            result = max(15, abs(int(result)))
+        except:
+            result = None
+
+        # Default to 1 hour
+        if result is None:
+            result = 3600
+        return result
+
+    def graceful_timeout(self):
+        """Get graceful_timeout.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'graceful_timeout'
+        result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Make sure we have an integer
+        try:
+            result = int(result)
+        except:
+            result = None
+
+        # Default to 1 hour
+        if result is None:
+            result = 10
+        return result
+
+    def multiprocessing(self):
+        """Get multiprocessing.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'multiprocessing'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        result = _boolean(_result, default=True)
+        return result
+
+    def batch_size(self):
+        """Get batch_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 500
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'batch_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = int(_result)
+            except:
+                result = default
+        return result
+
+    def worker_max_tasks(self):
+        """Get worker_max_tasks.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of tasks an ingester worker process completes
+                before it is replaced by a new one
+
+        """
+        # Initialize key varibles
+        default = 1000
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'worker_max_tasks'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def checksum_cache_size(self):
+        """Get checksum_cache_size.
+
+        Args:
+            None
+
+        Returns:
+            result: Maximum number of agents whose checksums are cached by
+                each ingester process
+
+        """
+        # Initialize key varibles
+        default = 10000
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'checksum_cache_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def checksum_cache_ttl(self):
+        """Get checksum_cache_ttl.
+
+        Args:
+            None
+
+        Returns:
+            result: Maximum age in seconds of cached agent checksums
+
+        """
+        # Initialize key varibles
+        default = 600
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'checksum_cache_ttl'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = abs(int(_result))
+            except:
+                result = default
+        return result
+
+    def bulk_ingest(self):
+        """Get bulk_ingest.
+
+        Args:
+            None
+
+        Returns:
+            result: True if set based SQL statements should be used to insert
+                data into the database
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'bulk_ingest'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        result = _boolean(_result, default=False)
+        return result
+
+    def bulk_chunk_size(self):
+        """Get bulk_chunk_size.
+
+        Args:
+            None
+
+        Returns:
+            result: Maximum number of rows per bulk INSERT statement
+
+        """
+        # Initialize key varibles
+        default = 1000
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'bulk_chunk_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def record_budget(self):
+        """Get record_budget.
+
+        Args:
+            None
+
+        Returns:
+            result: Maximum number of cache records to hold in memory before
+                they are written to the database
+
+        """
+        # Initialize key varibles
+        default = 50000
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'record_budget'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def ingester_mode(self):
+        """Get ingester_mode.
+
+        Args:
+            None
+
+        Returns:
+            result: 'interval' to ingest the cache every ingester_interval
+                seconds or 'continuous' to ingest files as soon as they arrive
+
+        """
+        # Initialize key varibles
+        default = 'interval'
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'ingester_mode'
+        result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if result not in ['interval', 'continuous']:
+            result = default
+        return result
+
+    def batch_latency(self):
+        """Get batch_latency.
+
+        Args:
+            None
+
+        Returns:
+            result: Maximum number of seconds to wait for a batch to fill up
+                before ingesting it in continuous mode
+
+        """
+        # Initialize key varibles
+        default = 1.0
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'batch_latency'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0.0, float(_result))
+            except:
+                result = default
+        return result
+
+    def stats_interval(self):
+        """Get stats_interval.
+
+        Args:
+            None
+
+        Returns:
+            result: Interval in seconds between updates of the ingester
+                latency and throughput statistics in continuous mode
+
+        """
+        # Initialize key varibles
+        default = 60
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'stats_interval'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def retention(self):
+        """Get retention.
+
+        Args:
+            None
+
+        Returns:
+            result: Dict of the number of days data is kept. Keys are
+                'default' for an int applied to all data, 'data_types' for a
+                dict of days keyed by data type and 'agent_programs' for a
+                dict of days keyed by agent program. Data is kept forever
+                when the number of days is 0
+
+        """
+        # Initialize key varibles
+        result = {'default': 0, 'data_types': {}, 'agent_programs': {}}
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'retention'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+        if isinstance(_result, dict) is False:
+            return result
+
+        # Ignore invalid values
+        result['default'] = _days(_result.get('default'))
+        for (_key, _type) in [('data_types', int), ('agent_programs', str)]:
+            policies = _result.get(_key)
+            if isinstance(policies, dict) is False:
+                continue
+            for (item, days) in policies.items():
+                try:
+                    result[_key][_type(item)] = _days(days)
+                except:
+                    continue
+        return result
+
+    def rollup_retention(self):
+        """Get rollup_retention.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of days rollups are kept. Rollups are kept forever
+                when the number of days is 0
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'rollup_retention'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        result = _days(_result)
+        return result
+
+    def purge_interval(self):
+        """Get purge_interval.
+
+        Args:
+            None
+
+        Returns:
+            result: Interval in seconds between purges of expired data
+
+        """
+        # Initialize key varibles
+        default = 3600
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'purge_interval'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def purge_chunk_size(self):
+        """Get purge_chunk_size.
+
+        Args:
+            None
+
+        Returns:
+            result: Maximum number of rows deleted per statement when purging
+                expired data
+
+        """
+        # Initialize key varibles
+        default = 10000
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'purge_chunk_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+
+def _boolean(value, default=False):
+    """Convert a flag from the configuration to a boolean.
+
+    YAML strings such as 'False' or 'no' are converted as well as booleans.
+
+    Args:
+        value: Configured value
+        default: Value to return if value is None or invalid
+
+    Returns:
+        result: Boolean
+
+    """
+    # Convert
+    if value is None:
+        result = default
+    elif isinstance(value, str) is True:
+        _value = value.strip().lower()
+        if _value in ['true', 'yes', 'on', '1']:
+            result = True
+        elif _value in ['false', 'no', 'off', '0']:
+            result = False
+        else:
+            result = default
+    else:
+        result = bool(value)
+    return result
+
+
+def _days(value):
+    """Convert a retention period from the configuration to days.
+
+    Args:
+        value: Configured value
+
+    Returns:
+        result: Number of days. 0 if the value is invalid
+
+    """
+    try:
+        result = max(0, int(value))
+    except:
+        result = 0
+    return result
@@ -0,0 +1,113 @@
+"""Functions for calculating rates from counter values.
+
+Counter values are numpy arrays with one value per polling interval. NaN
+values indicate that there was no data for the polling interval. Rates are
+calculated between each value and the previous value that exists, so a gap
+doesn't hide the change in the counter across it.
+
+Counters that decrease have either wrapped around their limit or have been
+reset, usually by restarting the device. A decrease from more than half the
+limit of the data type is treated as a wrap. Any other decrease is treated
+as a reset to zero, so the new value is the change since the reset.
+
+"""
+
+# PIP3 imports
+import numpy as np
+
+# pattoo imports
+from pattoo_shared.constants import DATA_COUNT, DATA_COUNT64
+
+# Values at which counters wrap around to zero
+LIMITS = {DATA_COUNT: 2 ** 32, DATA_COUNT64: 2 ** 64}
+
+
+def deltas(values, data_type=None):
+    """Calculate the change between successive counter values.
+
+    Args:
+        values: numpy array of counter values. NaN where there is no data
+        data_type: DataPoint data type. Decreases are always treated as
+            resets if it isn't one of the LIMITS keys
+
+    Returns:
+        result: numpy masked array with the change of each value since the
+            previous value, starting with the second value. Masked where
+            there is no data
+
+    """
+    # Initialize key variables
+    _values = np.ma.masked_invalid(np.asarray(values, dtype=np.float64))
+    size = max(0, _values.size - 1)
+    result = np.ma.masked_all(size, dtype=np.float64)
+
+    # Only use values that exist
+    valid = np.flatnonzero(~np.ma.getmaskarray(_values))
+    if valid.size < 2:
+        return result
+    previous = _values.data[valid[:-1]]
+    current = _values.data[valid[1:]]
+    changes = current - previous
+
+    # Account for wraps and resets
+    decreased = changes < 0
+    if bool(decreased.any()) is True:
+        limits = _limits(previous, data_type)
+        wrapped = decreased & (previous > limits / 2)
+        changes = np.where(wrapped, changes + limits, changes)
+        changes = np.where(decreased & ~wrapped, current, changes)
+
+    # Return
+    result[valid[1:] - 1] = changes
+    return result
+
+
+def rates(values, polling_interval, data_type=None, places=10):
+    """Calculate per second rates from successive counter values.
+
+    Args:
+        values: numpy array of counter values. NaN where there is no data
+        polling_interval: Polling interval in milliseconds
+        data_type: DataPoint data type
+        places: Number of places to round rates
+
+    Returns:
+        result: numpy array of rates, starting with the second value. NaN
+            where there is no data
+
+    """
+    # Initialize key variables
+    _values = np.asarray(values, dtype=np.float64)
+    changes = deltas(_values, data_type=data_type)
+
+    # Get the number of polling intervals since the previous value, which is
+    # greater than one after gaps
+    slots = np.flatnonzero(~np.isnan(_values))
+    intervals = np.ones(changes.size, dtype=np.float64)
+    if slots.size > 1:
+        intervals[slots[1:] - 1] = np.diff(slots)
+
+    # Calculate the rates
+    result = np.ma.round(
+        changes / (intervals * polling_interval) * 1000, places)
+    result = result.filled(np.nan)
+    return result
+
+
+def _limits(values, data_type):
+    """Get the limits at which counters wrap around to zero.
+
+    Args:
+        values: numpy array of counter values
+        data_type: DataPoint data type
+
+    Returns:
+        result: numpy array of limits. Infinite if counters don't wrap
+
+    """
+    # 32 bit counters with larger values must be 64 bit counters
+    limit = LIMITS.get(data_type, np.inf)
+    result = np.full(values.size, float(limit))
+    if data_type == DATA_COUNT:
+        result[values >= limit] = float(LIMITS[DATA_COUNT64])
+    return result
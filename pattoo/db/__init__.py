@@ -40,43 +40,10 @@ def main():
     use_mysql = True
     global POOL
     global URL
-    pool_timeout = 30
-    pool_recycle = min(10, pool_timeout - 10)
-
-    # Get configuration
-    config = Config()
-
-    # Define SQLAlchemy parameters from configuration
-    pool_size = config.db_pool_size()
-    max_overflow = config.db_max_overflow()
 
     # Create DB connection pool
     if use_mysql is True:
-        URL = ('mysql+pymysql://{}:{}@{}/{}?charset=utf8mb4'.format(
-            config.db_username(), config.db_password(),
-            config.db_hostname(), config.db_name()))
-
-        # Fix for multiprocessing on pools.
-        # _add_engine_pidguard(QueuePool)
-
-        # Add MySQL to the pool
-        db_engine = create_engine(
-            URL,
-            echo=False,
-            echo_pool=False,
-            encoding='utf8',
-            poolclass=QueuePool,
-            max_overflow=max_overflow,
-            pool_size=pool_size,
-            pool_pre_ping=True,
-            pool_recycle=pool_recycle,
-            pool_timeout=pool_timeout)
-
-        # Fix for multiprocessing on engines.
-        # _add_engine_pidguard(db_engine)
-
-        # Ensure connections are disposed before sharing engine.
-        db_engine.dispose()
+        (URL, db_engine) = _engine()
 
         # Create database session object
         POOL = scoped_session(
@@ -91,6 +58,82 @@ def main():
         POOL = None
 
 
+def reconnect():
+    """Bind the POOL sessions to a new database engine.
+
+    Worker processes call this to use an engine and connections of their own
+    instead of the engine created when pattoo.db was first imported.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Nothing to do
+    if POOL is None:
+        return
+
+    # Replace the engine
+    previous = POOL.session_factory.kw.get('bind')
+    POOL.remove()
+    POOL.configure(bind=_engine()[1])
+    if previous is not None:
+        previous.dispose()
+
+
+def _engine():
+    """Create a database engine from the configuration.
+
+    Args:
+        None
+
+    Returns:
+        result: Tuple of (URL, engine)
+
+    """
+    # Initialize key variables
+    pool_timeout = 30
+    pool_recycle = min(10, pool_timeout - 10)
+
+    # Get configuration
+    config = Config()
+
+    # Define SQLAlchemy parameters from configuration
+    pool_size = config.db_pool_size()
+    max_overflow = config.db_max_overflow()
+    url = ('mysql+pymysql://{}:{}@{}/{}?charset=utf8mb4'.format(
+        config.db_username(), config.db_password(),
+        config.db_hostname(), config.db_name()))
+
+    # Fix for multiprocessing on pools.
+    # _add_engine_pidguard(QueuePool)
+
+    # Add MySQL to the pool
+    db_engine = create_engine(
+        url,
+        echo=False,
+        echo_pool=False,
+        encoding='utf8',
+        poolclass=QueuePool,
+        max_overflow=max_overflow,
+        pool_size=pool_size,
+        pool_pre_ping=True,
+        pool_recycle=pool_recycle,
+        pool_timeout=pool_timeout)
+
+    # Fix for multiprocessing on engines.
+    # _add_engine_pidguard(db_engine)
+
+    # Ensure connections are disposed before sharing engine.
+    db_engine.dispose()
+
+    # Return
+    result = (url, db_engine)
+    return result
+
+
 def _add_engine_pidguard(engine):
     """Add multiprocessing guards.
 
@@ -11,6 +11,7 @@ from sqlalchemy import and_
 from pattoo_shared import log
 from pattoo.db import POOL
 from pattoo.db.models import DataPoint
+from pattoo.configuration import ConfigPattoo as Config
 
 
 @contextmanager
@@ -96,6 +97,32 @@ def db_query(error_code, close=True):
             session.close()
 
 
+def stream(query, chunk_size=None):
+    """Read the rows of a query with a server side cursor.
+
+    Rows are fetched from the database 'chunk_size' rows at a time instead of
+    all at once. The session of the query cannot be used for other queries
+    until all the rows are read.
+
+    Args:
+        query: SQLAlchemy query
+        chunk_size: Number of rows fetched at a time. The db_chunk_size
+            configuration value is used if None
+
+    Returns:
+        result: Iterable of rows
+
+    """
+    # Initialize key variables
+    if chunk_size is None:
+        chunk_size = Config().db_chunk_size()
+
+    # Return
+    result = query.execution_options(stream_results=True).yield_per(
+        max(1, int(chunk_size)))
+    return result
+
+
 def connectivity(die=True):
     """Check connectivity to the database.
 
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Export pt_data values in a binary columnar format.
+
+Exports start with an 8 byte header made of the MAGIC bytes and a 4 byte
+little-endian unsigned version. The header is followed by frames, each
+holding consecutive values of a single DataPoint:
+
+    * 8 byte little-endian signed idx_datapoint
+    * 4 byte little-endian unsigned number of values N
+    * N 8 byte little-endian signed timestamps in milliseconds
+    * N 8 byte little-endian IEEE 754 double values
+
+Frames are ordered by idx_datapoint and timestamp. The values of a
+DataPoint may span several consecutive frames. With 'gzip' compression the
+whole export is a gzip stream with the GZIP_MIMETYPE media type. Rows are
+read with a server side cursor, so memory use doesn't depend on the size of
+the time range.
+
+"""
+
+# Standard libraries
+import zlib
+import gzip
+import struct
+from itertools import groupby, islice
+from operator import attrgetter
+
+# PIP libraries
+import numpy as np
+from sqlalchemy import and_
+
+# Import project libraries
+from pattoo.db import db
+from pattoo.db.models import Data
+from pattoo.configuration import ConfigPattoo as Config
+
+# Export format
+MAGIC = b'PTEX'
+VERSION = 1
+MIMETYPE = 'application/vnd.pattoo.export'
+GZIP_MIMETYPE = '{}+gzip'.format(MIMETYPE)
+COMPRESSIONS = ['gzip']
+_HEADER = struct.Struct('<4sI')
+_FRAME = struct.Struct('<qI')
+
+
+def export(
+        idx_datapoints, ts_start, ts_stop, compression=None,
+        chunk_size=None):
+    """Export the data of DataPoints.
+
+    Args:
+        idx_datapoints: List of DataPoint indexes
+        ts_start: Start time in milliseconds
+        ts_stop: Stop time in milliseconds
+        compression: One of the COMPRESSIONS values. None if uncompressed
+        chunk_size: Maximum number of values per frame, and number of rows
+            read from the database at a time. The db_chunk_size
+            configuration value is used if None
+
+    Returns:
+        result: Generator of export bytes
+
+    """
+    # Initialize key variables
+    if chunk_size is None:
+        chunk_size = Config().db_chunk_size()
+
+    # Return
+    result = encode(
+        frames(_rows(idx_datapoints, ts_start, ts_stop, chunk_size),
+               chunk_size=chunk_size),
+        compression=compression)
+    return result
+
+
+def frames(rows, chunk_size=10000):
+    """Create the header and frames of an export.
+
+    Args:
+        rows: Iterable of rows with idx_datapoint, timestamp and value
+            attributes ordered by idx_datapoint and timestamp
+        chunk_size: Maximum number of values per frame
+
+    Returns:
+        None
+
+    Yields:
+        The header, then each frame as bytes
+
+    """
+    # Header
+    yield _HEADER.pack(MAGIC, VERSION)
+
+    # Frames
+    for idx_datapoint, group in groupby(
+            rows, key=attrgetter('idx_datapoint')):
+        while True:
+            chunk = list(islice(group, chunk_size))
+            if bool(chunk) is False:
+                break
+            timestamps = np.fromiter(
+                (_.timestamp for _ in chunk), dtype='<i8', count=len(chunk))
+            values = np.fromiter(
+                (float(_.value) for _ in chunk), dtype='<f8',
+                count=len(chunk))
+            yield b''.join([
+                _FRAME.pack(idx_datapoint, len(chunk)),
+                timestamps.tobytes(), values.tobytes()])
+
+
+def encode(blocks, compression=None):
+    """Compress export bytes.
+
+    Args:
+        blocks: Iterable of export bytes
+        compression: One of the COMPRESSIONS values. None if uncompressed
+
+    Returns:
+        None
+
+    Yields:
+        Export bytes
+
+    """
+    # No compression
+    if compression is None:
+        yield from blocks
+        return
+
+    # Create a gzip stream
+    compressor = zlib.compressobj(wbits=31)
+    for block in blocks:
+        compressed = compressor.compress(block)
+        if bool(compressed) is True:
+            yield compressed
+    yield compressor.flush()
+
+
+def read(fp, compression=None):
+    """Read an export.
+
+    Args:
+        fp: Binary file object
+        compression: One of the COMPRESSIONS values. None if uncompressed
+
+    Returns:
+        None
+
+    Yields:
+        Tuples of (idx_datapoint, timestamps, values) where timestamps and
+        values are numpy arrays
+
+    """
+    # Initialize key variables
+    if compression == 'gzip':
+        fp = gzip.GzipFile(fileobj=fp)
+
+    # Verify the header
+    (magic, version) = _HEADER.unpack(_read(fp, _HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Invalid pattoo export header')
+
+    # Read the frames
+    while True:
+        header = fp.read(_FRAME.size)
+        if bool(header) is False:
+            break
+        (idx_datapoint, count) = _FRAME.unpack(
+            header + _read(fp, _FRAME.size - len(header)))
+        timestamps = np.frombuffer(_read(fp, count * 8), dtype='<i8')
+        values = np.frombuffer(_read(fp, count * 8), dtype='<f8')
+        yield (idx_datapoint, timestamps, values)
+
+
+def _read(fp, size):
+    """Read an exact number of bytes from a file object.
+
+    Args:
+        fp: Binary file object
+        size: Number of bytes
+
+    Returns:
+        result: Bytes
+
+    """
+    # Read until done as streams can return fewer bytes
+    result = b''
+    while len(result) < size:
+        block = fp.read(size - len(result))
+        if bool(block) is False:
+            raise ValueError('Truncated pattoo export')
+        result += block
+    return result
+
+
+def _rows(idx_datapoints, ts_start, ts_stop, chunk_size):
+    """Read Data rows with a server side cursor.
+
+    Args:
+        idx_datapoints: List of DataPoint indexes
+        ts_start: Start time in milliseconds
+        ts_stop: Stop time in milliseconds
+        chunk_size: Number of rows read from the database at a time
+
+    Returns:
+        None
+
+    Yields:
+        Rows ordered by idx_datapoint and timestamp
+
+    """
+    # Nothing to do
+    if bool(idx_datapoints) is False:
+        return
+
+    with db.db_query(20231) as session:
+        query = session.query(
+            Data.idx_datapoint, Data.timestamp, Data.value).filter(and_(
+                Data.idx_datapoint.in_(idx_datapoints),
+                Data.timestamp >= ts_start,
+                Data.timestamp <= ts_stop)).order_by(
+                    Data.idx_datapoint, Data.timestamp)
+        yield from db.stream(query, chunk_size=chunk_size)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""Convert the storage type of pt_data and pt_data_rollup values.
+
+pt_data values are copied in primary key order batches to a new table with
+the required column type, which then replaces the original table. Tables
+cannot be locked for the hours required to ALTER a large table in place.
+The much smaller pt_data_rollup table is converted in place. Stop the
+pattoo_ingesterd daemon during the migration. Agent data is kept in the
+cache directory and ingested when the daemon is restarted.
+
+"""
+
+# Standard libraries
+import time
+
+# PIP libraries
+from sqlalchemy import text
+
+# Import project libraries
+from pattoo_shared import log
+from pattoo.db import db, partition
+from pattoo.db.models import Data, DataPoint, DataRollup
+
+# SQL types of each value type
+TYPES = {'numeric': 'DECIMAL(40,10)', 'double': 'DOUBLE'}
+
+# SQL types of the sums of values of each value type
+SUM_TYPES = {'numeric': 'DECIMAL(50,10)', 'double': 'DOUBLE'}
+
+
+def value_type(connection, table=None, column='value'):
+    """Get the storage type of the values of a table column.
+
+    Args:
+        connection: SQLAlchemy engine or session
+        table: Name of the table. pt_data if None
+        column: Name of the column
+
+    Returns:
+        result: 'numeric' or 'double'
+
+    """
+    # Get the column type
+    row = connection.execute(text('''\
+SELECT DATA_TYPE FROM information_schema.COLUMNS \
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table \
+AND COLUMN_NAME = :column'''), {
+        'table': table or Data.__tablename__, 'column': column}).fetchone()
+
+    # Return
+    if row[0].lower() == 'double':
+        result = 'double'
+    else:
+        result = 'numeric'
+    return result
+
+
+def data(_value_type, batch_size=10000, progress=None):
+    """Convert the storage type of pt_data values.
+
+    Args:
+        _value_type: Required value type. One of the TYPES keys
+        batch_size: Maximum number of rows copied per statement
+        progress: Function called with the number of rows copied after each
+            batch. Ignored if None
+
+    Returns:
+        result: Number of rows copied
+
+    """
+    # Initialize key variables
+    table = Data.__tablename__
+    new = '{}_new'.format(table)
+    old = '{}_old'.format(table)
+    batch_size = max(1, int(batch_size))
+    ts_start = time.time()
+    last = None
+    result = 0
+
+    # Nothing to do. Stop if the database cannot be read.
+    with db.db_modify(20218, die=True) as session:
+        current = value_type(session)
+        interrupted = _exists(session, old)
+
+    # Don't overwrite the original values of an interrupted conversion
+    if interrupted is True:
+        log_message = _resume(table, old)
+        log.log2die(20237, log_message)
+    if current == _value_type:
+        log_message = 'Table {} values are already of type {}'.format(
+            table, TYPES[_value_type])
+        log.log2info(20219, log_message)
+        return result
+
+    # Create the new table with the same indexes and partitions
+    with db.db_modify(20220, die=True) as session:
+        session.execute(text('DROP TABLE IF EXISTS {}'.format(new)))
+        session.execute(text('CREATE TABLE {} LIKE {}'.format(new, table)))
+        session.execute(text('ALTER TABLE {} MODIFY value {} NOT NULL'.format(
+            new, TYPES[_value_type])))
+
+    while True:
+        # Get the key of the last row of the next batch
+        (condition, parameters) = _keyset(last)
+        with db.db_query(20221) as session:
+            row = session.execute(text('''\
+SELECT idx_datapoint, timestamp FROM {} WHERE {} \
+ORDER BY idx_datapoint, timestamp LIMIT 1 OFFSET {}\
+'''.format(table, condition, batch_size - 1)), parameters).fetchone()
+
+        # Copy the batch
+        if row is not None:
+            condition = '{} AND (idx_datapoint < :stop_idx OR (\
+idx_datapoint = :stop_idx AND timestamp <= :stop_ts))'.format(condition)
+            parameters.update(
+                {'stop_idx': row.idx_datapoint, 'stop_ts': row.timestamp})
+        with db.db_modify(20222, die=True) as session:
+            copied = session.execute(text('''\
+INSERT INTO {0} (idx_datapoint, timestamp, value) \
+SELECT idx_datapoint, timestamp, value FROM {1} WHERE {2}\
+'''.format(new, table, condition)), parameters).rowcount
+        result += copied
+        if progress is not None:
+            progress(result)
+
+        # The last batch was smaller than batch_size
+        if row is None:
+            break
+        last = (row.idx_datapoint, row.timestamp)
+
+    # Replace the original table. Both tables are renamed atomically.
+    with db.db_modify(20223, die=True) as session:
+        session.execute(text('RENAME TABLE {0} TO {1}, {2} TO {0}'.format(
+            table, old, new)))
+
+    # MySQL commits each DDL statement implicitly, so the original table is
+    # only dropped once the new one is verified. Partitioned tables cannot
+    # have foreign keys. The copied rows have already been checked, so the
+    # foreign key is added without checking them again.
+    with db.db_modify(20239, die=False) as session:
+        if bool(partition.partitions(session)) is False:
+            session.execute(text('SET foreign_key_checks = 0'))
+            try:
+                session.execute(text('''\
+ALTER TABLE {} ADD FOREIGN KEY (idx_datapoint) \
+REFERENCES pt_datapoint (idx_datapoint)'''.format(table)))
+            finally:
+                session.execute(text('SET foreign_key_checks = 1'))
+    verified = False
+    with db.db_query(20240) as session:
+        verified = bool(
+            bool(partition.partitions(session)) is True or
+            _foreign_key(session, table) is True)
+    if verified is False:
+        log_message = _resume(table, old)
+        log.log2die(20241, log_message)
+    with db.db_modify(20242, die=True) as session:
+        session.execute(text('DROP TABLE {}'.format(old)))
+
+    # Log
+    log_message = ('''\
+Converted {} rows of table {} to values of type {} in {:.2f}s\
+'''.format(result, table, TYPES[_value_type], time.time() - ts_start))
+    log.log2info(20224, log_message)
+    return result
+
+
+def rollups(_value_type):
+    """Convert the storage type of pt_data_rollup values in place.
+
+    Args:
+        _value_type: Required value type. One of the TYPES keys
+
+    Returns:
+        result: True if the values were converted
+
+    """
+    # Initialize key variables
+    table = DataRollup.__tablename__
+    result = False
+
+    # Nothing to do. Stop if the database cannot be read.
+    with db.db_modify(20243, die=True) as session:
+        current = value_type(session, table=table, column='value_sum')
+    if current == _value_type:
+        return result
+
+    # Convert
+    with db.db_modify(20244, die=True) as session:
+        session.execute(text('''\
+ALTER TABLE {0} MODIFY value_min {1} NOT NULL, MODIFY value_max {1} NOT NULL, \
+MODIFY value_sum {2} NOT NULL, MODIFY value_last {1} NOT NULL\
+'''.format(table, TYPES[_value_type], SUM_TYPES[_value_type])))
+    result = True
+    return result
+
+
+def _exists(connection, table):
+    """Determine whether a table exists.
+
+    Args:
+        connection: SQLAlchemy engine or session
+        table: Name of the table
+
+    Returns:
+        result: True if the table exists
+
+    """
+    # Find the table
+    row = connection.execute(text('''\
+SELECT TABLE_NAME FROM information_schema.TABLES \
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table'''), {
+        'table': table}).fetchone()
+    result = row is not None
+    return result
+
+
+def _foreign_key(connection, table):
+    """Determine whether a table has the foreign key to pt_datapoint.
+
+    Args:
+        connection: SQLAlchemy engine or session
+        table: Name of the table
+
+    Returns:
+        result: True if the foreign key exists
+
+    """
+    # Find the foreign key
+    row = connection.execute(text('''\
+SELECT CONSTRAINT_NAME FROM information_schema.KEY_COLUMN_USAGE \
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table \
+AND COLUMN_NAME = :column AND REFERENCED_TABLE_NAME = :referenced'''), {
+        'table': table, 'column': 'idx_datapoint',
+        'referenced': DataPoint.__tablename__}).fetchone()
+    result = row is not None
+    return result
+
+
+def _resume(table, old):
+    """Create the message explaining how to complete an interrupted conversion.
+
+    Args:
+        table: Name of the converted table
+        old: Name of the table with the original values
+
+    Returns:
+        result: Message
+
+    """
+    # Create message
+    result = ('''\
+Table {1} with the original values of table {0} remains from an interrupted \
+conversion. Table {0} already has the converted values. If table {0} isn't \
+partitioned, add its foreign key with "ALTER TABLE {0} ADD FOREIGN KEY \
+(idx_datapoint) REFERENCES pt_datapoint (idx_datapoint)". Then drop table {1} \
+to complete the conversion, or rename it to {0} to restore the original \
+values.'''.format(table, old))
+    return result
+
+
+def _keyset(last):
+    """Create the condition selecting rows after a primary key.
+
+    Args:
+        last: Tuple of (idx_datapoint, timestamp). All rows are selected if
+            None
+
+    Returns:
+        result: Tuple of (SQL condition, dict of parameters)
+
+    """
+    # Initialize key variables
+    if last is None:
+        result = ('1 = 1', {})
+        return result
+
+    # Rows with a larger key
+    condition = '''\
+(idx_datapoint > :start_idx OR \
+(idx_datapoint = :start_idx AND timestamp > :start_ts))'''
+    result = (condition, {'start_idx': last[0], 'start_ts': last[1]})
+    return result
@@ -1,13 +1,137 @@
 #!/usr/bin/env python3
 """Inserts various database values required during ingest."""
 
+# Standard libraries
+import random
+import time
+
 # PIP libraries
-from sqlalchemy import and_
+from sqlalchemy import and_, tuple_
+from sqlalchemy.dialects.mysql import insert
 
 # Import project libraries
+from pattoo_shared import data as data_
 from pattoo.db import db
-from pattoo.db.models import DataPoint, Glue, Pair, Agent
+from pattoo.db.models import (
+    DataPoint, Glue, Pair, Agent, Chart, ChartDataPoint)
+from pattoo.db.table import pair, glue
 from pattoo.constants import ChecksumLookup
+from pattoo.cache import LRU
+
+
+class ChecksumIndex():
+    """Process-wide index of ChecksumLookup objects keyed by agent_id.
+
+    The checksums of an agent are read from the database once. Afterwards only
+    DataPoint rows modified since the most recent DataPoint.ts_modified value
+    seen are read, and only when the agent has unknown checksums or its entry
+    is older than 'ttl' seconds. Looking up the checksums of known datapoints
+    therefore doesn't query the database until the entry is 'ttl' seconds old.
+
+    Other processes, such as the other ingester workers, may update the
+    DataPoint rows of an agent in the meantime. The cached last_timestamp
+    values can then be older than those in the database. This only causes
+    data that already exists to be written again, which is ignored.
+
+    """
+
+    def __init__(self, maxsize=10000, ttl=600):
+        """Initialize the class.
+
+        Args:
+            maxsize: Maximum number of agents to track
+            ttl: Maximum number of seconds between refreshes of an agent's
+                checksums
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._agents = LRU(maxsize=maxsize)
+        self._ttl = ttl
+
+    def checksums(self, agent_id, checksums=None):
+        """Get all the checksum values for a specific agent_id.
+
+        Args:
+            agent_id: PattooDBrecord object agent_id
+            checksums: List of checksums that will be looked up. The agent's
+                entries are refreshed if any are unknown.
+
+        Returns:
+            result: Dict of ChecksumLookup objects keyed by DataPoint.checksum.
+                The dict is cached and may be updated by the caller.
+
+        """
+        # Initialize key variables
+        now = time.time()
+        entry = self._agents.get(agent_id)
+
+        # Read all the agent's checksums the first time
+        if entry is None:
+            (result, ts_modified) = _checksums(agent_id)
+            self._agents.put(
+                agent_id, _ChecksumEntry(result, ts_modified, now))
+            return result
+
+        # Refresh if required
+        result = entry.table
+        stale = bool(now - entry.refreshed > self._ttl)
+        unknown = bool(
+            [_ for _ in (checksums or []) if _ not in result])
+        if stale is True or unknown is True:
+            (updates, ts_modified) = _checksums(
+                agent_id, ts_modified=entry.ts_modified)
+            for checksum, lookup in updates.items():
+                # Our cached last_timestamp could be more current if we
+                # inserted data before the database update was visible
+                if checksum in result:
+                    lookup = lookup._replace(last_timestamp=max(
+                        lookup.last_timestamp,
+                        result[checksum].last_timestamp))
+                result[checksum] = lookup
+            if ts_modified is not None:
+                entry.ts_modified = ts_modified
+            entry.refreshed = now
+        return result
+
+    def clear(self, agent_id=None):
+        """Remove cached checksums.
+
+        Args:
+            agent_id: Agent ID to remove. Remove all agents if None
+
+        Returns:
+            None
+
+        """
+        # Clear
+        if agent_id is None:
+            self._agents.clear()
+        else:
+            self._agents.pop(agent_id)
+
+
+class _ChecksumEntry():
+    """Checksum table of an agent tracked by ChecksumIndex."""
+
+    def __init__(self, table, ts_modified, refreshed):
+        """Initialize the class.
+
+        Args:
+            table: Dict of ChecksumLookup objects keyed by DataPoint.checksum
+            ts_modified: Most recent DataPoint.ts_modified value in the table
+            refreshed: Time of the most recent refresh
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.table = table
+        self.ts_modified = ts_modified
+        self.refreshed = refreshed
 
 
 def agent_checksums(agent_id):
@@ -19,10 +143,36 @@ def agent_checksums(agent_id):
     Returns:
         result: Dict of idx_datapoint values keyed by DataPoint.checksum
 
+    """
+    # Return
+    (result, _) = _checksums(agent_id)
+    return result
+
+
+def _checksums(agent_id, ts_modified=None):
+    """Get the checksum values for a specific agent_id.
+
+    Args:
+        agent_id: PattooDBrecord object agent_id
+        ts_modified: Only get DataPoint rows modified at, or after, this time
+
+    Returns:
+        result: Tuple of (dict, ts_modified) where dict contains
+            ChecksumLookup objects keyed by DataPoint.checksum and ts_modified
+            is the most recent DataPoint.ts_modified value found
+
     """
     # Result
     result = {}
     rows = []
+    latest = ts_modified
+
+    # Filter
+    _filter = and_(
+        Agent.agent_id == agent_id.encode(),
+        DataPoint.idx_agent == Agent.idx_agent)
+    if ts_modified is not None:
+        _filter = and_(_filter, DataPoint.ts_modified >= ts_modified)
 
     # Get the data from the database
     with db.db_query(20013) as session:
@@ -30,10 +180,8 @@ def agent_checksums(agent_id):
             DataPoint.checksum,
             DataPoint.last_timestamp,
             DataPoint.polling_interval,
-            DataPoint.idx_datapoint).filter(and_(
-                Agent.agent_id == agent_id.encode(),
-                DataPoint.idx_agent == Agent.idx_agent
-            ))
+            DataPoint.idx_datapoint,
+            DataPoint.ts_modified).filter(_filter)
 
     # Return
     for row in rows:
@@ -41,4 +189,135 @@ def agent_checksums(agent_id):
             idx_datapoint=row.idx_datapoint,
             polling_interval=row.polling_interval,
             last_timestamp=row.last_timestamp)
+        if row.ts_modified is not None:
+            if latest is None or row.ts_modified > latest:
+                latest = row.ts_modified
+    return (result, latest)
+
+
+def idx_datapoints(pattoo_db_records, key_value_pairs):
+    """Get DataPoint.idx_datapoint values for many PattooDBrecord objects.
+
+    This is the set based equivalent of datapoint.idx_datapoint. The Agent,
+    DataPoint, Chart, ChartDataPoint and Glue rows required by the
+    PattooDBrecord objects are created using multi-row statements in a single
+    transaction. Charts are only created for new datapoints. Pair rows are
+    shared by all datapoints and are created beforehand by
+    pair.idx_pair_map.
+
+    Args:
+        pattoo_db_records: List of PattooDBrecord objects
+        key_value_pairs: Dict of the (key, value) tuple lists of the
+            PattooDBrecord objects keyed by checksum
+
+    Returns:
+        result: Dict of DataPoint.idx_datapoint values keyed by checksum
+
+    """
+    # Initialize key variables
+    result = {}
+    records = {}
+    agents = {}
+    pairs = {}
+
+    # Use the first PattooDBrecord of each checksum
+    for pdbr in pattoo_db_records:
+        if pdbr.pattoo_checksum not in records:
+            records[pdbr.pattoo_checksum] = pdbr
+    if bool(records) is False:
+        return result
+
+    # Get the unique agents and key-value pairs
+    for checksum, pdbr in records.items():
+        agents[(
+            pdbr.pattoo_agent_id.encode(),
+            pdbr.pattoo_agent_polled_target.encode()
+        )] = pdbr.pattoo_agent_program.encode()
+        pairs[checksum] = key_value_pairs[checksum]
+    checksums = [_.encode() for _ in records.keys()]
+
+    # Get the Pair.idx_pair values. Most will be cached.
+    idx_pairs = pair.idx_pair_map(
+        [_pair for _pairs in pairs.values() for _pair in _pairs])
+
+    with db.db_modify(20188, die=True) as session:
+        # Find existing datapoints
+        rows = session.execute(
+            DataPoint.__table__.select().with_only_columns([
+                DataPoint.idx_datapoint, DataPoint.checksum]).where(
+                    DataPoint.checksum.in_(checksums)))
+        existing = {row.checksum: row.idx_datapoint for row in rows}
+        new = [_ for _ in checksums if _ not in existing]
+
+        if bool(new) is True:
+            # Create the agents
+            session.execute(
+                insert(Agent.__table__).prefix_with('IGNORE'),
+                [{'agent_id': agent_id,
+                  'agent_polled_target': agent_target,
+                  'agent_program': agent_program}
+                 for (agent_id, agent_target), agent_program in sorted(
+                     agents.items())])
+            rows = session.execute(
+                Agent.__table__.select().with_only_columns([
+                    Agent.idx_agent, Agent.agent_id,
+                    Agent.agent_polled_target]).where(
+                        tuple_(Agent.agent_id, Agent.agent_polled_target).in_(
+                            list(agents.keys()))))
+            idx_agents = {
+                (row.agent_id, row.agent_polled_target): row.idx_agent
+                for row in rows}
+
+            # Create the datapoints
+            _rows = []
+            for checksum in new:
+                pdbr = records[checksum.decode()]
+                _rows.append({
+                    'checksum': checksum,
+                    'data_type': pdbr.pattoo_data_type,
+                    'polling_interval': int(
+                        pdbr.pattoo_agent_polling_interval),
+                    'idx_agent': idx_agents[(
+                        pdbr.pattoo_agent_id.encode(),
+                        pdbr.pattoo_agent_polled_target.encode())]})
+            session.execute(
+                insert(DataPoint.__table__).prefix_with('IGNORE'), _rows)
+            rows = session.execute(
+                DataPoint.__table__.select().with_only_columns([
+                    DataPoint.idx_datapoint, DataPoint.checksum]).where(
+                        DataPoint.checksum.in_(new)))
+            created = {row.checksum: row.idx_datapoint for row in rows}
+
+            # Create a chart for each new datapoint
+            chart_checksums = {
+                data_.hashstring('{}{}'.format(
+                    random.random(), checksum)).encode(): idx_datapoint
+                for checksum, idx_datapoint in created.items()}
+            session.execute(
+                insert(Chart.__table__),
+                [{'name': b'', 'checksum': chart_checksum, 'enabled': 1}
+                 for chart_checksum in chart_checksums.keys()])
+            rows = session.execute(
+                Chart.__table__.select().with_only_columns([
+                    Chart.idx_chart, Chart.checksum]).where(
+                        Chart.checksum.in_(list(chart_checksums.keys()))))
+            session.execute(
+                insert(ChartDataPoint.__table__),
+                [{'idx_chart': row.idx_chart,
+                  'idx_datapoint': chart_checksums[row.checksum],
+                  'enabled': 1} for row in rows])
+            existing.update(created)
+
+        # Create the Glue entries
+        glues = []
+        for checksum, _pairs in pairs.items():
+            idx_datapoint = existing.get(checksum.encode())
+            if bool(idx_datapoint) is True:
+                glues.append(
+                    (idx_datapoint, [idx_pairs[_pair] for _pair in _pairs]))
+        glue.insert_rows_bulk(glues, session=session)
+
+    # Return
+    for checksum, idx_datapoint in existing.items():
+        result[checksum.decode()] = idx_datapoint
     return result
@@ -1,6 +1,9 @@
 """pattoo ORM Table classes.
 
-Used to define the tables used in the database.
+Used to define the tables used in the database. The column type of data
+values is read from the db_value_type of the server configuration when this
+module is imported, so importing it fails if the configuration cannot be
+read.
 
 """
 
@@ -8,12 +11,13 @@ Used to define the tables used in the database.
 from sqlalchemy import UniqueConstraint, PrimaryKeyConstraint, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.dialects.mysql import BIGINT, DATETIME, INTEGER
-from sqlalchemy.dialects.mysql import NUMERIC, VARBINARY
+from sqlalchemy.dialects.mysql import NUMERIC, VARBINARY, DOUBLE
 from sqlalchemy import Column
 from sqlalchemy import ForeignKey
 from sqlalchemy.orm import backref, relationship
 
 from pattoo.db import POOL
+from pattoo.configuration import ConfigPattoo as Config
 from pattoo_shared.constants import MAX_KEYPAIR_LENGTH
 
 ###############################################################################
@@ -29,6 +33,15 @@ BASE.metadata.bind = POOL
 BASE.query = POOL.query_property()
 ###############################################################################
 
+# Storage type of Data.value and DataRollup values. DOUBLE values are
+# smaller and faster to read.
+if Config().db_value_type() == 'double':
+    VALUE_TYPE = DOUBLE(asdecimal=False)
+    SUM_TYPE = DOUBLE(asdecimal=False)
+else:
+    VALUE_TYPE = NUMERIC(40, 10)
+    SUM_TYPE = NUMERIC(50, 10)
+
 
 class User(BASE):
     """Class defining the pt_user table of the database."""
@@ -525,7 +538,7 @@ class Data(BASE):
 
     timestamp = Column(BIGINT(unsigned=True), nullable=False, default='1')
 
-    value = Column(NUMERIC(40, 10), nullable=False, default='1')
+    value = Column(VALUE_TYPE, nullable=False, default='1')
 
     # Use cascade='delete,all' to propagate the deletion of a
     # DataPoint onto its Data
@@ -533,3 +546,47 @@ class Data(BASE):
         DataPoint,
         backref=backref(
             'data_checksum', uselist=True, cascade='delete,all'))
+
+
+class DataRollup(BASE):
+    """Class defining the pt_data_rollup table of the database.
+
+    Each row summarizes the pt_data values of a datapoint for the 'resolution'
+    milliseconds starting at 'timestamp'.
+
+    """
+
+    __tablename__ = 'pt_data_rollup'
+    __table_args__ = (
+        PrimaryKeyConstraint('idx_datapoint', 'resolution', 'timestamp'),
+        {'mysql_engine': 'InnoDB'}
+    )
+
+    idx_datapoint = Column(
+        BIGINT(unsigned=True),
+        ForeignKey('pt_datapoint.idx_datapoint'),
+        index=True, nullable=False, server_default='1')
+
+    resolution = Column(INTEGER(unsigned=True), nullable=False, default='1')
+
+    timestamp = Column(BIGINT(unsigned=True), nullable=False, default='1')
+
+    value_min = Column(VALUE_TYPE, nullable=False, default='0')
+
+    value_max = Column(VALUE_TYPE, nullable=False, default='0')
+
+    value_sum = Column(SUM_TYPE, nullable=False, default='0')
+
+    value_count = Column(BIGINT(unsigned=True), nullable=False, default='0')
+
+    value_last = Column(VALUE_TYPE, nullable=False, default='0')
+
+    last_timestamp = Column(
+        BIGINT(unsigned=True), nullable=False, default='0')
+
+    # Use cascade='delete,all' to propagate the deletion of a
+    # DataPoint onto its DataRollup
+    datapoint = relationship(
+        DataPoint,
+        backref=backref(
+            'data_rollup', uselist=True, cascade='delete,all'))
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Manage the time based RANGE partitions of the pt_data table.
+
+Partitions cover a fixed number of days, are named after the UTC date on
+which they start and hold rows with timestamps less than the start of the
+next partition. The 'p0' partition holds the data that existed when the
+table was partitioned and the 'pmax' partition catches rows beyond the
+last partition. Partitioned tables cannot have foreign keys, so the
+pt_data foreign key is dropped when the table is partitioned.
+
+"""
+
+# Standard libraries
+import time
+from datetime import datetime, timezone
+
+# PIP libraries
+from sqlalchemy import text
+
+# Import project libraries
+from pattoo_shared import log
+from pattoo.db import db
+from pattoo.db.models import Data
+
+# Milliseconds per day
+_DAY = 86400000
+
+# Number of future partitions to create in advance
+AHEAD = 3
+
+# Name of the partition holding rows beyond the last partition
+_MAXVALUE = 'pmax'
+
+
+def name(timestamp):
+    """Get the name of the partition that starts at a timestamp.
+
+    Args:
+        timestamp: Timestamp in milliseconds
+
+    Returns:
+        result: Partition name
+
+    """
+    result = 'p{}'.format(datetime.fromtimestamp(
+        timestamp // 1000, tz=timezone.utc).strftime('%Y%m%d'))
+    return result
+
+
+def future(last, days, now, ahead=AHEAD):
+    """Get the partitions to create.
+
+    Args:
+        last: Upper bound of the last partition in milliseconds
+        days: Number of days per partition
+        now: Current time in milliseconds
+        ahead: Number of partitions required after the current one
+
+    Returns:
+        result: List of (name, upper bound) tuples
+
+    """
+    # Initialize key variables
+    result = []
+    interval = days * _DAY
+    target = (now // interval + 1 + ahead) * interval
+
+    # Partitions start where the previous one stops
+    start = last
+    while start < target:
+        stop = (start // interval + 1) * interval
+        result.append((name(start), stop))
+        start = stop
+    return result
+
+
+def expired(partitions, cutoff):
+    """Get the partitions that only hold rows older than a timestamp.
+
+    Args:
+        partitions: List of (name, upper bound) tuples. The upper bound of
+            the 'pmax' partition is None
+        cutoff: Timestamp in milliseconds
+
+    Returns:
+        result: List of partition names
+
+    """
+    result = [
+        _name for (_name, less_than) in partitions
+        if less_than is not None and less_than <= cutoff]
+    return result
+
+
+def install(connection, days, now=None):
+    """Partition the pt_data table if it isn't already.
+
+    Args:
+        connection: SQLAlchemy engine or session
+        days: Number of days per partition
+        now: Current time in milliseconds. Uses the system time if None
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    table = Data.__tablename__
+    interval = days * _DAY
+    if now is None:
+        now = int(time.time() * 1000)
+    start = (now // interval) * interval
+
+    # Nothing to do
+    if bool(partitions(connection)) is True:
+        return
+
+    # Drop the foreign keys
+    rows = connection.execute(text('''\
+SELECT CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS \
+WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = :table'''), {
+        'table': table}).fetchall()
+    for row in rows:
+        connection.execute(text('ALTER TABLE {} DROP FOREIGN KEY {}'.format(
+            table, row[0])))
+
+    # Partition
+    connection.execute(text(
+        'ALTER TABLE {} PARTITION BY RANGE (timestamp) ({})'.format(
+            table, _clause([('p0', start)] + future(start, days, now)))))
+
+
+def partitions(connection):
+    """Get the partitions of the pt_data table.
+
+    Args:
+        connection: SQLAlchemy engine or session
+
+    Returns:
+        result: List of (name, upper bound) tuples in partition order. The
+            upper bound of the 'pmax' partition is None. Empty if the table
+            isn't partitioned
+
+    """
+    # Get the partitions
+    rows = connection.execute(text('''\
+SELECT PARTITION_NAME, PARTITION_DESCRIPTION \
+FROM information_schema.PARTITIONS \
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table \
+AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION'''), {
+        'table': Data.__tablename__}).fetchall()
+
+    # Return
+    result = [
+        (row[0], None if row[0] == _MAXVALUE else int(row[1]))
+        for row in rows]
+    return result
+
+
+def maintain(days, retention=0, now=None):
+    """Create future partitions and drop expired ones.
+
+    Args:
+        days: Number of days per partition
+        retention: Number of days data is kept. Partitions are only dropped
+            if the value is greater than 0
+        now: Current time in milliseconds. Uses the system time if None
+
+    Returns:
+        result: Tuple of the number of partitions created and dropped
+
+    """
+    # Initialize key variables
+    table = Data.__tablename__
+    created = []
+    dropped = []
+    if now is None:
+        now = int(time.time() * 1000)
+
+    with db.db_modify(20215, die=False) as session:
+        # Ignore tables that aren't partitioned
+        _partitions = partitions(session)
+        bounds = [
+            less_than for (_, less_than) in _partitions
+            if less_than is not None]
+        if bool(bounds) is False:
+            log_message = ('''\
+Table {} is not partitioned. Partitions cannot be maintained.\
+'''.format(table))
+            log.log2warning(20216, log_message)
+            return (0, 0)
+
+        # Create partitions by splitting the 'pmax' partition. This is quick
+        # as 'pmax' is normally empty.
+        created = future(max(bounds), days, now)
+        if bool(created) is True:
+            session.execute(text(
+                'ALTER TABLE {} REORGANIZE PARTITION {} INTO ({})'.format(
+                    table, _MAXVALUE, _clause(created))))
+
+        # Drop expired partitions. This is much quicker than deleting rows.
+        if bool(retention) is True:
+            dropped = expired(_partitions, now - retention * _DAY)
+            if bool(dropped) is True:
+                session.execute(text('ALTER TABLE {} DROP PARTITION {}'.format(
+                    table, ', '.join(dropped))))
+
+    # Log
+    if bool(created) is True or bool(dropped) is True:
+        log_message = ('''\
+Created {} and dropped {} partitions of table {}.\
+'''.format(len(created), len(dropped), table))
+        log.log2info(20217, log_message)
+    result = (len(created), len(dropped))
+    return result
+
+
+def _clause(_partitions):
+    """Create the partition definitions of an ALTER TABLE statement.
+
+    Args:
+        _partitions: List of (name, upper bound) tuples
+
+    Returns:
+        result: Partition definitions ending with the 'pmax' partition
+
+    """
+    definitions = [
+        'PARTITION {} VALUES LESS THAN ({})'.format(_name, int(less_than))
+        for (_name, less_than) in _partitions]
+    definitions.append(
+        'PARTITION {} VALUES LESS THAN MAXVALUE'.format(_MAXVALUE))
+    result = ', '.join(definitions)
+    return result
@@ -47,3 +47,4 @@ class Agent(SQLAlchemyObjectType, AgentAttribute):
 
         model = AgentModel
         interfaces = (graphene.relay.Node,)
+        connection_class = utils.CountableConnection
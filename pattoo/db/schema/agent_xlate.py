@@ -43,3 +43,4 @@ class AgentXlate(SQLAlchemyObjectType, AgentXlateAttribute):
 
         model = AgentXlateModel
         interfaces = (graphene.relay.Node,)
+        connection_class = utils.CountableConnection
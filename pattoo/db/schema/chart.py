@@ -42,6 +42,7 @@ class Chart(SQLAlchemyObjectType, ChartAttribute):
 
         model = ChartModel
         interfaces = (graphene.relay.Node,)
+        connection_class = utils.CountableConnection
 
 
 class CreateChartInput(graphene.InputObjectType, ChartAttribute):
@@ -40,6 +40,7 @@ class ChartDataPoint(SQLAlchemyObjectType, ChartDataPointAttribute):
 
         model = ChartDataPointModel
         interfaces = (graphene.relay.Node,)
+        connection_class = utils.CountableConnection
 
 
 class CreateChartDataPointInput(
@@ -6,6 +6,7 @@ from graphene_sqlalchemy import SQLAlchemyObjectType
 
 # pattoo imports
 from pattoo.db.models import Data as DataModel
+from pattoo.db.schema import utils
 
 
 class DataAttribute():
@@ -34,3 +35,4 @@ class Data(SQLAlchemyObjectType, DataAttribute):
 
         model = DataModel
         interfaces = (graphene.relay.Node,)
+        connection_class = utils.CountableConnection
@@ -50,3 +50,4 @@ class DataPoint(SQLAlchemyObjectType, DataPointAttribute):
 
         model = DataPointModel
         interfaces = (graphene.relay.Node,)
+        connection_class = utils.CountableConnection
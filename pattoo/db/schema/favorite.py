@@ -43,6 +43,7 @@ class Favorite(SQLAlchemyObjectType, FavoriteAttribute):
 
         model = FavoriteModel
         interfaces = (graphene.relay.Node,)
+        connection_class = utils.CountableConnection
 
 
 class CreateFavoriteInput(graphene.InputObjectType, FavoriteAttribute):
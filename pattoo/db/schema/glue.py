@@ -6,6 +6,7 @@ from graphene_sqlalchemy import SQLAlchemyObjectType
 
 # pattoo imports
 from pattoo.db.models import Glue as GlueModel
+from pattoo.db.schema import utils
 
 
 class GlueAttribute():
@@ -31,3 +32,4 @@ class Glue(SQLAlchemyObjectType, GlueAttribute):
 
         model = GlueModel
         interfaces = (graphene.relay.Node,)
+        connection_class = utils.CountableConnection
@@ -37,3 +37,4 @@ class Language(SQLAlchemyObjectType, LanguageAttribute):
 
         model = LanguageModel
         interfaces = (graphene.relay.Node,)
+        connection_class = utils.CountableConnection
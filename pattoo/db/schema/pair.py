@@ -37,3 +37,4 @@ class Pair(SQLAlchemyObjectType, PairAttribute):
 
         model = PairModel
         interfaces = (graphene.relay.Node,)
+        connection_class = utils.CountableConnection
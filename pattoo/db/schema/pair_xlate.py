@@ -52,3 +52,4 @@ class PairXlate(SQLAlchemyObjectType, PairXlateAttribute):
 
         model = PairXlateModel
         interfaces = (graphene.relay.Node,)
+        connection_class = utils.CountableConnection
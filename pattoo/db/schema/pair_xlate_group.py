@@ -36,3 +36,4 @@ class PairXlateGroup(SQLAlchemyObjectType, PairXlateGroupAttribute):
 
         model = PairXlateGroupModel
         interfaces = (graphene.relay.Node,)
+        connection_class = utils.CountableConnection
@@ -50,6 +50,7 @@ class User(SQLAlchemyObjectType, UserAttribute):
 
         model = UserModel
         interfaces = (graphene.relay.Node,)
+        connection_class = utils.CountableConnection
 
 
 class CreateUserInput(graphene.InputObjectType, UserAttribute):
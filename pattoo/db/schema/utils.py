@@ -1,9 +1,35 @@
 """pattoo ORM Schema utility functions."""
 
+import graphene
 from graphql_relay.node.node import from_global_id
+from sqlalchemy.orm.query import Query
 from pattoo_shared.constants import DATA_INT, DATA_STRING, DATA_FLOAT
 
 
+class CountableConnection(graphene.relay.Connection):
+    """Connection with an optional count of all results.
+
+    Counting large tables is slow, so the count is only made when the
+    'totalCount' field is requested.
+
+    """
+
+    class Meta:
+        """Define the metadata."""
+
+        abstract = True
+
+    total_count = graphene.Int(
+        description='Number of results of all pages.')
+
+    def resolve_total_count(self, _):
+        """Count the results of all pages."""
+        # Connections of queries don't load all the results
+        if isinstance(self.iterable, Query) is True:
+            return self.iterable.order_by(None).count()
+        return len(self.iterable)
+
+
 def resolve_first_name(obj, _):
     """Convert 'first_name' from bytes to string."""
     return obj.first_name.decode()
@@ -16,14 +16,17 @@ Based on the pages at:
     https://github.com/graphql-python/graphene-sqlalchemy/issues/27#issuecomment-361978832
 
 """
+# Standard imports
+import json
+
 # PIP3 imports
 import graphene
 from graphene import relay
 from graphene.utils.str_converters import to_snake_case
 from graphene.relay.connection import PageInfo
 from graphene_sqlalchemy import SQLAlchemyConnectionField
-from graphql_relay.connection.arrayconnection import connection_from_list_slice
-from sqlalchemy import desc, asc
+from graphql_relay.utils import base64, unbase64
+from sqlalchemy import desc, asc, and_, or_, inspect, false
 
 # Import schemas
 from pattoo.db.schema.agent import Agent
@@ -39,6 +42,10 @@ from pattoo.db.schema.pair import Pair
 from pattoo.db.schema.pair_xlate_group import PairXlateGroup
 from pattoo.db.schema.pair_xlate import PairXlate
 from pattoo.db.schema import user as user_
+from pattoo.configuration import ConfigPattoo as Config
+
+# Prefix of cursors
+_CURSOR_PREFIX = 'keyset:'
 
 
 ###############################################################################
@@ -91,22 +98,68 @@ class InstrumentedQuery(SQLAlchemyConnectionField):
 
     def connection_resolver(
             self, resolver, connection, model, root, info, **args):
+        """Resolve a page of results with keyset pagination.
+
+        Pages are read with a WHERE clause on the sort columns of the cursor
+        and a LIMIT of the page size, so the results of other pages aren't
+        read or counted. Cursors contain the primary key of a result.
+
+        """
+        # Initialize key variables
         query = resolver(
             root, info, **args) or self.get_query(model, info, **args)
-        count = query.count()
-        connection = connection_from_list_slice(
-            query,
-            args,
-            slice_start=0,
-            list_length=count,
-            list_slice_length=count,
-            connection_type=connection,
-            pageinfo_type=PageInfo,
-            edge_type=connection.Edge,
-        )
-        connection.iterable = query
-        connection.length = count
-        return connection
+        orders = _orders(model, args.get('sort_by'))
+        page_size = Config().graphql_page_size()
+        first = _size(args.get('first'), 'first', page_size)
+        last = _size(args.get('last'), 'last', page_size)
+        if first is None and last is None and page_size is not None:
+            first = page_size
+
+        # Only read results between the cursors
+        page = query.order_by(None)
+        for cursor, forward in [
+                (args.get('after'), True), (args.get('before'), False)]:
+            if bool(cursor) is True:
+                page = page.filter(_keyset(
+                    orders, _position(query, model, orders, cursor),
+                    forward))
+
+        # Read the last results backwards if only 'last' is provided
+        if first is None and last is not None:
+            rows = page.order_by(*_criteria(orders, reverse=True)).limit(
+                last + 1).all()
+            has_previous_page = len(rows) > last
+            rows = rows[:last][::-1]
+            has_next_page = bool(args.get('before'))
+        elif first is None:
+            # Page sizes aren't limited by the configuration
+            rows = page.order_by(*_criteria(orders)).all()
+            has_next_page = bool(args.get('before'))
+            has_previous_page = bool(args.get('after'))
+        else:
+            rows = page.order_by(*_criteria(orders)).limit(first + 1).all()
+            has_next_page = len(rows) > first
+            rows = rows[:first]
+            has_previous_page = bool(args.get('after'))
+            if last is not None and len(rows) > last:
+                rows = rows[len(rows) - last:]
+                has_previous_page = True
+
+        # Create the connection
+        edges = [
+            connection.Edge(node=row, cursor=_cursor(model, row))
+            for row in rows]
+        result = connection(
+            edges=edges,
+            page_info=PageInfo(
+                start_cursor=edges[0].cursor if bool(edges) else None,
+                end_cursor=edges[-1].cursor if bool(edges) else None,
+                has_previous_page=has_previous_page,
+                has_next_page=has_next_page))
+
+        # Results of all pages are only counted if totalCount is requested
+        result.iterable = query
+        return result
 
     @staticmethod
     def get_order_by_criterion(model, name, direction='asc'):
@@ -114,6 +167,235 @@ class InstrumentedQuery(SQLAlchemyConnectionField):
         return order_functions[
             direction.lower()](getattr(model, to_snake_case(name)))
 
+
+def _size(value, name, page_size):
+    """Get the number of results of a page.
+
+    Args:
+        value: Value of the 'first' or 'last' argument
+        name: Name of the argument
+        page_size: Maximum number of results per page. Unlimited if None
+
+    Returns:
+        result: Number of results. None if value is None
+
+    """
+    # Nothing to do
+    if value is None:
+        return None
+
+    # Page sizes are capped
+    if value < 0:
+        raise ValueError(
+            'Argument "{}" must be a non-negative integer'.format(name))
+    result = value if page_size is None else min(value, page_size)
+    return result
+
+
+def _orders(model, sort_by=None):
+    """Get the columns by which to sort results.
+
+    The primary key is added so that every result has a unique position
+    for cursors to refer to.
+
+    Args:
+        model: SQLAlchemy model
+        sort_by: List of 'name' or 'name direction' sort_by arguments
+
+    Returns:
+        result: List of (column, ascending) tuples
+
+    """
+    # Initialize key variables
+    result = []
+
+    # Columns of the sort_by argument
+    for item in sort_by or []:
+        (name, *direction) = item.split(' ')
+        ascending = (direction or ['asc'])[0].lower() != 'desc'
+        result.append((getattr(model, to_snake_case(name)), ascending))
+
+    # Primary key
+    names = [column.key for column, _ in result]
+    for name in _primary_key(model):
+        if name not in names:
+            result.append((getattr(model, name), True))
+    return result
+
+
+def _criteria(orders, reverse=False):
+    """Get ORDER BY criteria.
+
+    Args:
+        orders: List of (column, ascending) tuples
+        reverse: Reverse the direction of each column if True
+
+    Returns:
+        result: List of criteria
+
+    """
+    result = [
+        asc(column) if ascending is not reverse else desc(column)
+        for column, ascending in orders]
+    return result
+
+
+def _keyset(orders, values, forward=True):
+    """Get the condition for results after or before a position.
+
+    NULL values sort before all other values, as they do in MySQL.
+
+    Args:
+        orders: List of (column, ascending) tuples
+        values: Values of the columns at the position
+        forward: Get results after the position if True, otherwise before
+
+    Returns:
+        result: SQLAlchemy condition
+
+    """
+    # Compare columns in order, as long as the preceding columns are equal
+    clauses = []
+    for index, (column, ascending) in enumerate(orders):
+        comparison = _comparison(
+            column, values[index], ascending is forward)
+        if comparison is None:
+            continue
+        clauses.append(and_(
+            *[_equal(orders[_][0], values[_]) for _ in range(index)],
+            comparison))
+    result = or_(*clauses) if bool(clauses) is True else false()
+    return result
+
+
+def _comparison(column, value, greater):
+    """Get the condition for column values greater or less than a value.
+
+    Args:
+        column: SQLAlchemy column
+        value: Value
+        greater: Get greater values if True, otherwise lesser ones
+
+    Returns:
+        result: SQLAlchemy condition. None if no value can match
+
+    """
+    # NULL values are less than all others
+    if value is None:
+        result = column.isnot(None) if greater is True else None
+    elif greater is True:
+        result = column > value
+    elif bool(column.nullable) is False:
+        result = column < value
+    else:
+        result = or_(column < value, column.is_(None))
+    return result
+
+
+def _equal(column, value):
+    """Get the condition for column values equal to a value.
+
+    Args:
+        column: SQLAlchemy column
+        value: Value
+
+    Returns:
+        result: SQLAlchemy condition
+
+    """
+    result = column.is_(None) if value is None else column == value
+    return result
+
+
+def _position(query, model, orders, cursor):
+    """Get the values of the sort columns of the result of a cursor.
+
+    Args:
+        query: SQLAlchemy query of the results
+        model: SQLAlchemy model
+        orders: List of (column, ascending) tuples
+        cursor: Cursor
+
+    Returns:
+        result: List of values in the order of orders
+
+    """
+    # Results are sorted by primary key by default, which the cursor contains
+    key = dict(zip(_primary_key(model), _key(model, cursor)))
+    if all(column.key in key for column, _ in orders) is True:
+        result = [key[column.key] for column, _ in orders]
+        return result
+
+    # Read the values of other columns
+    row = query.session.query(*[column for column, _ in orders]).filter(
+        and_(*[getattr(model, name) == value for name, value in key.items()])
+    ).first()
+    if row is None:
+        raise ValueError('Cursor "{}" no longer exists'.format(cursor))
+    result = list(row)
+    return result
+
+
+def _cursor(model, row):
+    """Create the cursor of a result.
+
+    Args:
+        model: SQLAlchemy model
+        row: Result
+
+    Returns:
+        result: Cursor
+
+    """
+    result = base64('{}{}'.format(_CURSOR_PREFIX, json.dumps(
+        [getattr(row, _) for _ in _primary_key(model)])))
+    return result
+
+
+def _key(model, cursor):
+    """Get the primary key of a cursor.
+
+    Args:
+        model: SQLAlchemy model
+        cursor: Cursor
+
+    Returns:
+        result: List of primary key values
+
+    """
+    # Decode
+    try:
+        value = unbase64(cursor)
+        if value.startswith(_CURSOR_PREFIX) is False:
+            raise ValueError
+        result = json.loads(value[len(_CURSOR_PREFIX):])
+    except ValueError:
+        raise ValueError('Invalid cursor "{}"'.format(cursor))
+
+    # Verify
+    if (isinstance(result, list) is False or
+            len(result) != len(_primary_key(model)) or
+            all(isinstance(_, int) for _ in result) is False):
+        raise ValueError('Invalid cursor "{}"'.format(cursor))
+    return result
+
+
+def _primary_key(model):
+    """Get the attribute names of the primary key of a model.
+
+    Args:
+        model: SQLAlchemy model
+
+    Returns:
+        result: List of names
+
+    """
+    mapper = inspect(model)
+    result = [
+        mapper.get_property_by_column(_).key for _ in mapper.primary_key]
+    return result
+
+
 ###############################################################################
 # Map database table columns to igraphql attributes
 ###############################################################################
@@ -5,31 +5,38 @@
 from operator import attrgetter
 
 # PIP libraries
-from sqlalchemy import and_
+from sqlalchemy import and_, case, func, tuple_
+from sqlalchemy.dialects.mysql import insert
 
 # Import project libraries
 from pattoo.db import db
 from pattoo.db.models import Data, DataPoint
+from pattoo.db.table import rollup
 
 
-def insert_rows(items):
+def insert_rows(items, rollups=False):
     """Insert timeseries data.
 
     Args:
         items: List of IDXTimestampValue objects
+        rollups: Merge the data into the DataRollup table in the same
+            transaction if True
 
     Returns:
-        result: DataPoint.checksum value
+        result: List of DataPoint.idx_datapoint values whose last_timestamp
+            was updated. Disabled DataPoints aren't updated. The
+            last_timestamp is never moved back in time.
 
     """
     # Initialize key variables
     _rows = []
     last_timestamps = {}
     polling_intervals = {}
+    result = []
 
     # Fail safe checks
     if bool(items) is False:
-        return
+        return result
 
     # Update the data
     for item in sorted(items, key=attrgetter('timestamp')):
@@ -52,17 +59,181 @@ def insert_rows(items):
     # Update the last_timestamp
     for idx_datapoint, timestamp in last_timestamps.items():
         with db.db_modify(20047, die=False) as session:
-            session.query(DataPoint).filter(
+            count = session.query(DataPoint).filter(
                 and_(DataPoint.idx_datapoint == idx_datapoint,
                      DataPoint.enabled == 1)).update(
-                         {'last_timestamp': timestamp,
+                         {'last_timestamp': func.greatest(
+                             DataPoint.last_timestamp, timestamp),
                           'polling_interval': int(
                             polling_intervals[idx_datapoint])}
                      )
+            if bool(count) is True:
+                result.append(idx_datapoint)
 
     # Update after updating the last timestamp. Helps to prevent
     # 'Duplicate entry' errors in the event you need to re-run the ingester
     # after a previous crash.
     if bool(_rows) is True:
         with db.db_modify(20012, die=True) as session:
-            session.add_all(_rows)
+            # Skip rows that already exist. Agents can post data again and
+            # the cached last_timestamp values used to filter it out may be
+            # older than those in the database.
+            keys = sorted(set((_.idx_datapoint, _.timestamp) for _ in _rows))
+            existing = set(
+                (row.idx_datapoint, row.timestamp) for row in session.query(
+                    Data.idx_datapoint, Data.timestamp).filter(
+                        tuple_(Data.idx_datapoint, Data.timestamp).in_(
+                            keys)).with_for_update())
+            new = {}
+            for row in _rows:
+                if (row.idx_datapoint, row.timestamp) not in existing:
+                    new[(row.idx_datapoint, row.timestamp)] = row
+            session.add_all(list(new.values()))
+
+            # Only merge the new rows into the rollups
+            if rollups is True:
+                rollup.update_rows(
+                    [_ for _ in items if (
+                        _.idx_datapoint, _.timestamp) in new],
+                    session=session)
+    return result
+
+
+def insert_rows_bulk(items, chunk_size=1000, rollups=False):
+    """Insert timeseries data using set based SQL statements.
+
+    Rows are written to the Data table with multi-row
+    'INSERT ... ON DUPLICATE KEY UPDATE' statements of at most 'chunk_size'
+    rows each. All DataPoint.last_timestamp values are then updated with a
+    single 'UPDATE ... CASE' statement in the same transaction.
+
+    Args:
+        items: List of IDXTimestampValue objects
+        chunk_size: Maximum number of rows per INSERT statement
+        rollups: Merge the rows that didn't already exist into the
+            DataRollup table in the same transaction if True
+
+    Returns:
+        result: List of DataPoint.idx_datapoint values whose last_timestamp
+            was updated. Disabled DataPoints aren't updated. The
+            last_timestamp is never moved back in time.
+
+    """
+    # Initialize key variables
+    _rows = []
+    last_timestamps = {}
+    polling_intervals = {}
+    result = []
+    chunk_size = max(1, int(chunk_size))
+
+    # Fail safe checks
+    if bool(items) is False:
+        return result
+
+    # Create the rows to insert
+    for item in sorted(items, key=attrgetter('timestamp')):
+        _rows.append({
+            'idx_datapoint': item.idx_datapoint,
+            'timestamp': item.timestamp,
+            'value': round(item.value, 10)})
+
+        # Get the most recent timestamp for each idx_datapoint
+        if item.idx_datapoint in last_timestamps:
+            last_timestamps[item.idx_datapoint] = max(
+                item.timestamp, last_timestamps[item.idx_datapoint])
+        else:
+            last_timestamps[item.idx_datapoint] = item.timestamp
+        polling_intervals[item.idx_datapoint] = int(item.polling_interval)
+
+    # Create the INSERT statement. Duplicates, as could occur when re-running
+    # the ingester after a crash, overwrite the existing value.
+    statement = insert(Data.__table__)
+    statement = statement.on_duplicate_key_update(
+        value=statement.inserted.value)
+
+    # Create the UPDATE statement for the DataPoint table
+    idx_datapoints = sorted(last_timestamps.keys())
+    _filter = and_(
+        DataPoint.idx_datapoint.in_(idx_datapoints),
+        DataPoint.enabled == 1)
+    update = DataPoint.__table__.update().where(_filter).values(
+            last_timestamp=func.greatest(
+                DataPoint.last_timestamp, case(
+                    last_timestamps, value=DataPoint.idx_datapoint)),
+            polling_interval=case(
+                polling_intervals, value=DataPoint.idx_datapoint))
+
+    # Insert the data and update the DataPoint table in one transaction
+    with db.db_modify(20185, die=True) as session:
+        # Find the rows that already exist. They must not be merged into the
+        # rollups again.
+        if rollups is True:
+            existing = set()
+            keys = sorted(set(
+                (_['idx_datapoint'], _['timestamp']) for _ in _rows))
+            for index in range(0, len(keys), chunk_size):
+                found = session.query(
+                    Data.idx_datapoint, Data.timestamp).filter(
+                        tuple_(Data.idx_datapoint, Data.timestamp).in_(
+                            keys[index:index + chunk_size])).with_for_update()
+                existing.update(
+                    (row.idx_datapoint, row.timestamp) for row in found)
+            new = {
+                (_.idx_datapoint, _.timestamp): _ for _ in items if (
+                    _.idx_datapoint, _.timestamp) not in existing}
+            rollup.update_rows(
+                list(new.values()), chunk_size=chunk_size, session=session)
+
+        for index in range(0, len(_rows), chunk_size):
+            session.execute(statement, _rows[index:index + chunk_size])
+
+        # Lock the DataPoint rows to be updated to report them accurately
+        rows = session.query(
+            DataPoint.idx_datapoint).filter(_filter).with_for_update()
+        result = [row.idx_datapoint for row in rows]
+        session.execute(update)
+    return result
+
+
+def delete_rows(idx_datapoint, ts_stop, chunk_size=10000):
+    """Delete timeseries data older than a timestamp.
+
+    Rows are deleted in primary key order in separate transactions of at
+    most 'chunk_size' rows each. This keeps locks short so that ingestion
+    can continue while large volumes of data are purged.
+
+    Args:
+        idx_datapoint: DataPoint index
+        ts_stop: Rows with older timestamps are deleted
+        chunk_size: Maximum number of rows per DELETE statement
+
+    Returns:
+        result: Number of rows deleted
+
+    """
+    # Initialize key variables
+    result = 0
+    chunk_size = max(1, int(chunk_size))
+
+    while True:
+        # Get the timestamp of the last row of the next chunk
+        with db.db_query(20207) as session:
+            rows = session.query(Data.timestamp).filter(and_(
+                Data.idx_datapoint == idx_datapoint,
+                Data.timestamp < ts_stop)).order_by(
+                    Data.timestamp).offset(chunk_size - 1).limit(1).all()
+        if bool(rows) is True:
+            condition = Data.timestamp <= rows[0].timestamp
+        else:
+            condition = Data.timestamp < ts_stop
+
+        # Delete
+        with db.db_modify(20208, die=True) as session:
+            result += session.query(Data).filter(and_(
+                Data.idx_datapoint == idx_datapoint, condition)).delete(
+                    synchronize_session=False)
+
+        # The last chunk was smaller than chunk_size
+        if bool(rows) is False:
+            break
+    return result
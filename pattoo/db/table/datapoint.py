@@ -2,6 +2,9 @@
 """Inserts various database values required during ingest."""
 
 import random
+import threading
+from itertools import groupby, islice
+from operator import attrgetter
 
 # PIP3 imports
 import numpy as np
@@ -18,18 +21,29 @@ from pattoo_shared.constants import (
 from pattoo.db import db
 from pattoo.db.models import DataPoint as _DataPoint
 from pattoo.db.models import Data
-from pattoo.db.table import agent, chart, chart_datapoint
+from pattoo.db.table import agent, chart, chart_datapoint, rollup
 from pattoo.constants import DbRowChart, DbRowChartDataPoint
+from pattoo.configuration import ConfigPattoo as Config
+from pattoo.cache import TTL
+from pattoo.versions import versions
+from pattoo import counters
+
+# Metadata of recently used DataPoints keyed by idx_datapoint. Created when
+# first required.
+_METADATA = None
+_METADATA_LOCK = threading.Lock()
 
 
 class DataPoint():
     """Get data relevant to a DataPoint entry in the database."""
 
-    def __init__(self, _idx_datapoint):
+    def __init__(self, _idx_datapoint, cached=False):
         """Instantiate the class.
 
         Args:
             idx_datapoint: DataPoint index
+            cached: Use metadata cached within the last metadata_cache_ttl
+                seconds instead of querying the database if True
 
         Returns:
             None
@@ -39,6 +53,13 @@ class DataPoint():
         found = False
         self._idx_datapoint = int(_idx_datapoint)
 
+        # Use cached metadata
+        if cached is True:
+            result = _cached(self._idx_datapoint)
+            if result is not None:
+                self._result = result
+                return
+
         # Initialize keys for use by methods
         self._result = {}
         keys = [
@@ -61,13 +82,11 @@ class DataPoint():
         # Massage data
         if found is True:
             # Assign values
-            self._result['idx_agent'] = row.idx_agent
-            self._result['checksum'] = row.checksum.decode()
-            self._result['data_type'] = row.data_type
-            self._result['exists'] = True
-            self._result['last_timestamp'] = row.last_timestamp
-            self._result['polling_interval'] = row.polling_interval
-            self._result['enabled'] = row.enabled
+            self._result = _row_metadata(row)
+
+            # Cache metadata for other requests
+            if cached is True:
+                _metadata().put(self._idx_datapoint, self._result)
 
     def enabled(self):
         """Get enabled status.
@@ -169,12 +188,18 @@ class DataPoint():
         value = self._result['polling_interval']
         return value
 
-    def data(self, ts_start, ts_stop):
+    def data(self, ts_start, ts_stop, step=None, columnar=False):
         """Create list of dicts of counter values retrieved from database.
 
         Args:
             ts_start: Start time for query
             ts_stop: Stop time for query
+            step: Maximum number of milliseconds required between values.
+                If rollups are enabled, the coarsest rollup no coarser than
+                this is used instead of the raw data. Raw data is used if None
+                or if it is older than the first rollup bucket
+            columnar: Return a dict of 'timestamps' and 'values' lists
+                instead if True
 
         Returns:
             result: List of key-value pair dicts
@@ -182,119 +207,568 @@ class DataPoint():
         """
         # Initialize key variables
         data_type = self.data_type()
+        counter = data_type in [DATA_COUNT64, DATA_COUNT]
         _pi = self.polling_interval()
-        places = 10
-        result = []
+        chunk_size = Config().db_chunk_size()
+        result = _empty(columnar)
 
         # Return nothing if the DataPoint does not exist
         if self.exists() is False:
             return result
 
-        # Normalize timestamp to match the start of the nones array. If not,
+        # Use the coarsest rollup that satisfies the requested resolution
+        _resolution = None
+        if bool(step) is True and Config().db_rollups() is True:
+            _resolution = rollup.resolution(step, _pi)
+        if _resolution is not None:
+            if self._idx_datapoint in rollup.covered(
+                    [self._idx_datapoint], _resolution, ts_start):
+                _pi = _resolution
+            else:
+                _resolution = None
+
+        # Normalize timestamp to match the start of the values array. If not,
         # we could get the starting timestamp of the result to have a "None"
         # value
         ts_start = times.normalized_timestamp(_pi, timestamp=ts_start)
 
-        # Make sure we have entries for entire time range
-        timestamps = times.timestamps(ts_start, ts_stop, _pi)
-        nones = {_key: None for _key in timestamps}
-
-        # Get data from database
-        with db.db_query(20092) as session:
-            rows = session.query(Data.timestamp, Data.value).filter(and_(
-                Data.timestamp <= ts_stop, Data.timestamp >= ts_start,
-                Data.idx_datapoint == self._idx_datapoint)).order_by(
-                    Data.timestamp).all()
-
-        # Put values into a dict for ease of processing
-        for row in rows:
-            # Find the first timestamp in the sorted list that is greater than
-            # that found in the database
-            timestamp = times.normalized_timestamp(_pi, row.timestamp)
-            rounded_value = round(float(row.value), places)
-            nones[timestamp] = rounded_value
-
-        if data_type in [DATA_INT, DATA_FLOAT]:
-            # Process non-counter values
-            result = _response(nones)
-
-        elif data_type in [DATA_COUNT64, DATA_COUNT] and len(rows) > 1:
-            # Process counter values by calculating the difference between
-            # successive values
-            result = _counters(nones, _pi, places)
+        # Get data from database. Rows are processed as they are read from
+        # the server side cursor. Counters use the last value of each rollup
+        # bucket to calculate rates.
+        if _resolution is None:
+            with db.db_query(20092) as session:
+                rows = db.stream(
+                    session.query(Data.timestamp, Data.value).filter(and_(
+                        Data.timestamp <= ts_stop,
+                        Data.timestamp >= ts_start,
+                        Data.idx_datapoint == self._idx_datapoint)).order_by(
+                            Data.timestamp), chunk_size=chunk_size)
+                result = _series(
+                    rows, data_type, _pi, ts_start, ts_stop,
+                    columnar=columnar, chunk_size=chunk_size)
+        else:
+            rows = rollup.values(
+                [self._idx_datapoint], _resolution, ts_start, ts_stop,
+                last=counter, chunk_size=chunk_size)
+            result = _series(
+                rows, data_type, _pi, ts_start, ts_stop, columnar=columnar,
+                chunk_size=chunk_size)
+
+        # Return
+        return result
+
+
+class DataPoints():
+    """Get data relevant to multiple DataPoint entries in the database.
+
+    Metadata for all the DataPoints is read with a single query, and data
+    with a single query per storage table.
+
+    """
+
+    def __init__(self, idx_datapoints, cached=False):
+        """Instantiate the class.
+
+        Args:
+            idx_datapoints: List of DataPoint indexes
+            cached: Use metadata cached within the last metadata_cache_ttl
+                seconds instead of querying the database if True
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._idx_datapoints = sorted(set(int(_) for _ in idx_datapoints))
+        self._metadata = {}
+
+        # Use cached metadata
+        if cached is True:
+            for idx_datapoint in self._idx_datapoints:
+                result = _cached(idx_datapoint)
+                if result is not None:
+                    self._metadata[idx_datapoint] = result
+        missing = [
+            _ for _ in self._idx_datapoints if _ not in self._metadata]
+
+        # Get the metadata of the remaining DataPoints
+        if bool(missing) is True:
+            with db.db_query(20226) as session:
+                rows = session.query(_DataPoint).filter(
+                    _DataPoint.idx_datapoint.in_(missing))
+                for row in rows:
+                    result = _row_metadata(row)
+                    self._metadata[row.idx_datapoint] = result
+                    if cached is True:
+                        _metadata().put(row.idx_datapoint, result)
+
+    def last_timestamp(self):
+        """Get the most recent last_timestamp of the DataPoints.
 
+        Args:
+            None
+
+        Returns:
+            value: Timestamp. None if no DataPoints exist
+
+        """
+        # Initialize key variables
+        timestamps = [_['last_timestamp'] for _ in self._metadata.values()]
+        value = max(timestamps) if bool(timestamps) is True else None
+        return value
+
+    def polling_interval(self):
+        """Get the shortest polling_interval of the DataPoints.
+
+        Args:
+            None
+
+        Returns:
+            value: Polling interval. None if no DataPoints exist
+
+        """
+        # Initialize key variables
+        intervals = [_['polling_interval'] for _ in self._metadata.values()]
+        value = min(intervals) if bool(intervals) is True else None
+        return value
+
+    def data(self, ts_start, ts_stop=None, step=None, columnar=False):
+        """Create dict of lists of values retrieved from database.
+
+        Args:
+            ts_start: Start time for query
+            ts_stop: Stop time for query. The last_timestamp of each DataPoint
+                is used if None
+            step: Maximum number of milliseconds required between values.
+                If rollups are enabled, the coarsest rollup no coarser than
+                this is used instead of the raw data. Raw data is used if None
+                or if it is older than the first rollup bucket
+            columnar: Return dicts of 'timestamps' and 'values' lists instead
+                of lists if True
+
+        Returns:
+            result: Dict of lists of key-value pair dicts keyed by
+                idx_datapoint. Lists are empty for DataPoints that don't
+                exist
+
+        """
+        # Initialize key variables
+        result = {_: _empty(columnar) for _ in self._idx_datapoints}
+        rollups = bool(step) is True and Config().db_rollups() is True
+        chunk_size = Config().db_chunk_size()
+        plans = {}
+        groups = {}
+        resolutions = {}
+
+        # Get the rollup resolution of each DataPoint. Raw data is used if
+        # it is older than the first rollup bucket.
+        if rollups is True:
+            for idx_datapoint, row in self._metadata.items():
+                _resolution = rollup.resolution(
+                    step, row['polling_interval'])
+                if _resolution is not None:
+                    resolutions.setdefault(_resolution, []).append(
+                        idx_datapoint)
+            resolutions = {
+                idx_datapoint: _resolution
+                for _resolution, idx_datapoints in resolutions.items()
+                for idx_datapoint in rollup.covered(
+                    idx_datapoints, _resolution, ts_start)}
+
+        # Get the time range and source of each DataPoint's values
+        for idx_datapoint, row in self._metadata.items():
+            counter = row['data_type'] in [DATA_COUNT64, DATA_COUNT]
+            _pi = row['polling_interval']
+            _resolution = resolutions.get(idx_datapoint)
+            if _resolution is not None:
+                _pi = _resolution
+            plans[idx_datapoint] = (
+                _pi,
+                times.normalized_timestamp(_pi, timestamp=ts_start),
+                row['last_timestamp'] if ts_stop is None else ts_stop)
+
+            # Counters use the last value of each rollup bucket
+            key = (_resolution, counter if _resolution is not None else None)
+            groups.setdefault(key, []).append(idx_datapoint)
+
+        # Get data from database. Rows are processed as they are read from
+        # the server side cursor.
+        for (_resolution, counter), idx_datapoints in groups.items():
+            _start = min(plans[_][1] for _ in idx_datapoints)
+            _stop = max(plans[_][2] for _ in idx_datapoints)
+            if _resolution is None:
+                with db.db_query(20227) as session:
+                    rows = db.stream(
+                        session.query(
+                            Data.idx_datapoint, Data.timestamp,
+                            Data.value).filter(and_(
+                                Data.idx_datapoint.in_(idx_datapoints),
+                                Data.timestamp <= _stop,
+                                Data.timestamp >= _start)).order_by(
+                                    Data.idx_datapoint, Data.timestamp),
+                        chunk_size=chunk_size)
+                    result.update(self._series(
+                        rows, plans, columnar, chunk_size))
+            else:
+                rows = rollup.values(
+                    idx_datapoints, _resolution, _start, _stop, last=counter,
+                    chunk_size=chunk_size)
+                result.update(self._series(rows, plans, columnar, chunk_size))
+        return result
+
+    def _series(self, rows, plans, columnar, chunk_size):
+        """Create the series of each DataPoint from its own time range.
+
+        Args:
+            rows: Iterable of rows with idx_datapoint, timestamp and value
+                attributes sorted by idx_datapoint and timestamp
+            plans: Dict of (polling_interval, ts_start, ts_stop) tuples keyed
+                by idx_datapoint
+            columnar: Create dicts of 'timestamps' and 'values' lists if True
+            chunk_size: Number of rows processed at a time
+
+        Returns:
+            result: Dict of series keyed by idx_datapoint
+
+        """
+        # Initialize key variables
+        result = {}
+
+        # Rows are grouped as they are read
+        for idx_datapoint, _rows in groupby(
+                rows, key=attrgetter('idx_datapoint')):
+            (_pi, _start, _stop) = plans[idx_datapoint]
+            _rows = (_ for _ in _rows if _start <= _.timestamp <= _stop)
+            result[idx_datapoint] = _series(
+                _rows, self._metadata[idx_datapoint]['data_type'],
+                _pi, _start, _stop, columnar=columnar, chunk_size=chunk_size)
         return result
 
 
-def _counters(nones, polling_interval, places):
-    """Create list of dicts of counter values retrieved from database.
+def _row_metadata(row):
+    """Get the metadata of a DataPoint.
 
     Args:
-        nones: Dict of values keyed by timestamp
-        polling_interval: Polling interval
-        places: Number of places to round values
+        row: DataPoint database row
+
+    Returns:
+        result: Dict of metadata used by the DataPoint class
+
+    """
+    # Return
+    result = {
+        'idx_agent': row.idx_agent,
+        'checksum': row.checksum.decode(),
+        'data_type': row.data_type,
+        'exists': True,
+        'last_timestamp': row.last_timestamp,
+        'polling_interval': row.polling_interval,
+        'enabled': row.enabled}
+    return result
+
+
+def invalidate(idx_datapoints=None):
+    """Remove cached DataPoint metadata.
+
+    Args:
+        idx_datapoints: List of DataPoint indexes. Remove all if None
+
+    Returns:
+        None
+
+    """
+    # Nothing has been cached by this process
+    if _METADATA is None:
+        return
+
+    # Remove
+    if idx_datapoints is None:
+        _METADATA.clear()
+    else:
+        for idx_datapoint in idx_datapoints:
+            _METADATA.pop(idx_datapoint)
+
+
+def _cached(idx_datapoint):
+    """Get cached DataPoint metadata.
+
+    Args:
+        idx_datapoint: DataPoint index
+
+    Returns:
+        result: Dict of metadata. None if not cached, or if the ingester has
+            published a more recent last_timestamp
+
+    """
+    # Get metadata
+    result = _metadata().get(idx_datapoint)
+    if result is None:
+        return result
+
+    # Data has been ingested since the metadata was cached
+    if versions().get(idx_datapoint) > result['last_timestamp']:
+        _metadata().pop(idx_datapoint)
+        result = None
+    return result
+
+
+def _metadata():
+    """Get the process-wide cache of DataPoint metadata.
+
+    Args:
+        None
+
+    Returns:
+        result: _MetadataCache object
+
+    """
+    # Initialize key variables
+    global _METADATA
+
+    # Create the cache once
+    with _METADATA_LOCK:
+        if _METADATA is None:
+            _METADATA = _MetadataCache(
+                maxsize=10000, ttl=Config().metadata_cache_ttl())
+    result = _METADATA
+    return result
+
+
+class _MetadataCache(TTL):
+    """Thread safe TTL cache of DataPoint metadata.
+
+    Web API requests are handled by multiple threads.
+
+    """
+
+    def get(self, key, default=None):
+        """Get a cached value.
+
+        Args:
+            key: Key
+            default: Value to return if key is not cached or has expired
+
+        Returns:
+            result: Cached value
+
+        """
+        with _METADATA_LOCK:
+            result = TTL.get(self, key, default=default)
+        return result
+
+    def put(self, key, value):
+        """Cache a value.
+
+        Args:
+            key: Key
+            value: Value
+
+        Returns:
+            None
+
+        """
+        with _METADATA_LOCK:
+            TTL.put(self, key, value)
+
+    def pop(self, key, default=None):
+        """Remove a cached value.
+
+        Args:
+            key: Key
+            default: Value to return if key is not cached
+
+        Returns:
+            result: Value removed from the cache
+
+        """
+        with _METADATA_LOCK:
+            result = TTL.pop(self, key, default=default)
+        return result
+
+    def clear(self):
+        """Remove all cached values.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        with _METADATA_LOCK:
+            TTL.clear(self)
+
+
+def _series(
+        rows, data_type, polling_interval, ts_start, ts_stop, columnar=False,
+        chunk_size=10000):
+    """Create list of dicts of values for a time range.
+
+    Args:
+        rows: Iterable of rows with timestamp and value attributes sorted by
+            timestamp
+        data_type: DataPoint data type
+        polling_interval: Interval between values
+        ts_start: Normalized start time
+        ts_stop: Stop time
+        columnar: Return a dict of 'timestamps' and 'values' lists instead
+            if True
+        chunk_size: Number of rows processed at a time
 
     Returns:
         result: List of key-value pair dicts
 
     """
     # Initialize key variables
-    final = {}
-
-    # Create list of timestamps and values
-    timestamps = []
-    values = []
-    for timestamp, value in sorted(nones.items()):
-        timestamps.append(timestamp)
-        values.append(value)
-
-    # Remove first timestamp value as it isn't necessary
-    # after deltas are created
-    timestamps = timestamps[1:]
-
-    # Create an array for ease of readability.
-    # Convert to None values to nans to make deltas without errors
-    values_array = np.array(values).astype(np.float)
-
-    '''
-    Sometimes we'll get unsigned counter values in the database that roll over
-    to zero. This result in a negative delta.
-
-    We convert the result to abs(result). Python3 integers have no size limit
-    so you can't use logic like this to fix it:
-
-    (value.current + integer.type.max - value.previous)
-
-    '''
-    deltas = np.abs(np.diff(values_array))
-    for key, delta in enumerate(deltas):
-        # Null values means absent data and therefore no change
-        if np.isnan(delta):
-            tps = None
-        else:
-            # Calculate the value as a transaction per second value
-            tps = round((delta / polling_interval) * 1000, places)
-        final[timestamps[key]] = tps
+    places = 10
+    result = _empty(columnar)
+
+    # Make sure we have entries for entire time range
+    timestamps = np.arange(
+        ts_start,
+        times.normalized_timestamp(polling_interval, ts_stop) +
+        polling_interval, polling_interval, dtype=np.int64)
+
+    # Place the values in the slots of their normalized timestamps
+    values = _values(
+        rows, ts_start, polling_interval, timestamps.size, places,
+        chunk_size=chunk_size)
+
+    if data_type in [DATA_INT, DATA_FLOAT]:
+        # Process non-counter values
+        result = _output(timestamps, values, columnar)
+
+    elif data_type in [DATA_COUNT64, DATA_COUNT] and np.count_nonzero(
+            ~np.isnan(values)) > 1:
+        # Process counter values by calculating the rate of change between
+        # successive values
+        result = _output(
+            timestamps[1:], counters.rates(
+                values, polling_interval, data_type=data_type,
+                places=places), columnar)
+
+    return result
+
+
+def _empty(columnar):
+    """Create the result of a time range without data.
+
+    Args:
+        columnar: Create a dict of 'timestamps' and 'values' lists if True
+
+    Returns:
+        result: Empty list or dict of empty lists
+
+    """
+    result = _output(np.array([]), np.array([]), columnar)
+    return result
+
+
+def _output(timestamps, values, columnar):
+    """Create the result of a time range from arrays.
+
+    Args:
+        timestamps: numpy array of timestamps
+        values: numpy array of values. NaN where there is no data
+        columnar: Create a dict of 'timestamps' and 'values' lists if True
+
+    Returns:
+        result: List of key-value pair dicts, or dict of lists
+
+    """
+    if columnar is True:
+        result = _columns(timestamps, values)
+    else:
+        result = _serialize(timestamps, values)
+    return result
+
 
-    # Return the result
-    result = _response(final)
+def _values(rows, ts_start, polling_interval, size, places, chunk_size=10000):
+    """Create an array of values for each polling interval of a time range.
+
+    Rows are converted 'chunk_size' rows at a time so that only the result
+    array and a single chunk of rows are held in memory.
+
+    Args:
+        rows: Iterable of Data.timestamp, Data.value rows sorted by timestamp
+        ts_start: Normalized timestamp of the first polling interval
+        polling_interval: Polling interval
+        size: Number of polling intervals in the time range
+        places: Number of places to round values
+        chunk_size: Number of rows converted at a time
+
+    Returns:
+        result: numpy array of values. NaN where there is no data
+
+    """
+    # Initialize key variables
+    result = np.full(size, np.nan)
+    _rows = iter(rows)
+
+    while True:
+        chunk = list(islice(_rows, max(1, chunk_size)))
+        if bool(chunk) is False:
+            break
+
+        # Convert rows to arrays
+        _timestamps = np.fromiter(
+            (_.timestamp for _ in chunk), dtype=np.int64, count=len(chunk))
+        _values = np.fromiter(
+            (round(float(_.value), places) for _ in chunk),
+            dtype=np.float64, count=len(chunk))
+
+        # Get the slot of each value. Use the last value when several rows
+        # have the same normalized timestamp. Later chunks have later
+        # timestamps.
+        slots = _timestamps // polling_interval - ts_start // polling_interval
+        slots, index = np.unique(slots[::-1], return_index=True)
+        result[slots] = _values[::-1][index]
     return result
 
 
-def _response(nones):
-    """Create list of dicts.
+def _serialize(timestamps, values):
+    """Create list of dicts from arrays of timestamps and values.
 
     Args:
-        nones: Dict of values keyed by timestamp
+        timestamps: numpy array of timestamps
+        values: numpy array of values. NaN where there is no data
 
     Returns:
         result: List of key-value pair dicts
 
     """
+    # Convert NaN values to None
+    _values = values.astype(object)
+    _values[np.isnan(values)] = None
+
     # Return a list of dicts
-    result = []
-    for timestamp, value in sorted(nones.items()):
-        result.append({'timestamp': timestamp, 'value': value})
+    result = [
+        {'timestamp': timestamp, 'value': value}
+        for timestamp, value in zip(timestamps.tolist(), _values.tolist())]
+    return result
+
+
+def _columns(timestamps, values):
+    """Create dict of lists from arrays of timestamps and values.
+
+    This avoids creating a dict per value for large time ranges.
+
+    Args:
+        timestamps: numpy array of timestamps
+        values: numpy array of values. NaN where there is no data
+
+    Returns:
+        result: Dict of 'timestamps' and 'values' lists
+
+    """
+    # Convert NaN values to None
+    _values = values.astype(object)
+    _values[np.isnan(values)] = None
+
+    # Return
+    result = {
+        'timestamps': timestamps.astype(np.int64).tolist(),
+        'values': _values.tolist()}
     return result
 
 
@@ -2,11 +2,12 @@
 """Verifies the existence of various database data required for ingest."""
 
 # PIP libraries
-from sqlalchemy import and_
+from sqlalchemy import and_, tuple_
+from sqlalchemy.dialects.mysql import insert
 
 # Import project libraries
 from pattoo.db import db
-from pattoo.db.models import Pair, DataPoint, Glue
+from pattoo.db.models import Glue
 
 
 def glue_exists(_idx_datapoint, idx_pair):
@@ -28,9 +29,7 @@ def glue_exists(_idx_datapoint, idx_pair):
     with db.db_query(20008) as session:
         rows = session.query(Glue.idx_pair).filter(and_(
             Glue.idx_datapoint == _idx_datapoint,
-            Glue.idx_pair == idx_pair,
-            Pair.idx_pair == Glue.idx_pair,
-            DataPoint.idx_datapoint == Glue.idx_datapoint
+            Glue.idx_pair == idx_pair
             ))
 
     # Return
@@ -51,24 +50,70 @@ def insert_rows(idx_datapoint, _idx_pairs):
         None
 
     """
-    # Initialize key variables
-    rows = []
-
     # Create a list for processing if not available
     if isinstance(_idx_pairs, list) is False:
         _idx_pairs = [_idx_pairs]
 
-    # Iterate over _idx_pairs
-    for idx_pair in _idx_pairs:
-        pair_exists = glue_exists(idx_datapoint, idx_pair)
-        if bool(pair_exists) is False:
-            # Insert and get the new idx_datasource value
-            row = Glue(idx_pair=idx_pair, idx_datapoint=idx_datapoint)
-            rows.append(row)
+    # Insert
+    insert_rows_bulk([(idx_datapoint, _idx_pairs)])
+
+
+def insert_rows_bulk(items, session=None):
+    """Create db Glue table entries for many datapoints at once.
+
+    Existing entries are found with a single query against the Glue table
+    primary key. The missing ones are created with one multi-row INSERT.
+
+    Args:
+        items: List of (DataPoint.idx_datapoint, [Pair.idx_pair]) tuples
+        session: Database session of an ongoing transaction to use. A new
+            transaction is used if None.
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    uniques = set()
+
+    # Get the unique Glue table primary keys
+    for idx_datapoint, _idx_pairs in items:
+        for idx_pair in _idx_pairs:
+            uniques.add((idx_pair, idx_datapoint))
+    if bool(uniques) is False:
+        return
 
-    if bool(rows) is True:
+    # Insert
+    if session is None:
         with db.db_modify(20002, die=True) as session:
-            session.add_all(rows)
+            _insert_rows(session, uniques)
+    else:
+        _insert_rows(session, uniques)
+
+
+def _insert_rows(session, uniques):
+    """Create missing db Glue table entries.
+
+    Args:
+        session: Database session
+        uniques: Set of (Pair.idx_pair, DataPoint.idx_datapoint) tuples
+
+    Returns:
+        None
+
+    """
+    # Find the existing primary keys
+    rows = session.query(Glue.idx_pair, Glue.idx_datapoint).filter(
+        tuple_(Glue.idx_pair, Glue.idx_datapoint).in_(sorted(uniques)))
+    uniques = uniques - set(
+        (row.idx_pair, row.idx_datapoint) for row in rows)
+
+    # Insert the missing ones
+    if bool(uniques) is True:
+        session.execute(
+            insert(Glue.__table__).prefix_with('IGNORE'),
+            [{'idx_pair': idx_pair, 'idx_datapoint': idx_datapoint}
+             for idx_pair, idx_datapoint in sorted(uniques)])
 
 
 def idx_pairs(_idx_datapoints):
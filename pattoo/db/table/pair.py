@@ -3,10 +3,18 @@
 
 # PIP libraries
 from sqlalchemy import and_, tuple_
+from sqlalchemy.dialects.mysql import insert
 
 # Import project libraries
 from pattoo.db import db
 from pattoo.db.models import Pair
+from pattoo.cache import LRU
+
+# Maximum number of key-value pairs per query
+_CHUNK_SIZE = 1000
+
+# Pair.idx_pair values of known key-value pairs
+_KNOWN = LRU(maxsize=100000)
 
 
 def pair_exists(key, value):
@@ -49,7 +57,6 @@ def insert_rows(items):
 
     """
     # Initialize key variables
-    _rows = []
     uniques = {}
     all_kvs = []
 
@@ -68,18 +75,7 @@ def insert_rows(items):
         uniques[_kv] = None
 
     # Insert the key-value pairs into the database
-    for (key, value), _ in uniques.items():
-        # Skip pre-existing pairs
-        if bool(pair_exists(key, value)) is True:
-            continue
-
-        # Add values to list for future insertion
-        _row = Pair(key=key.encode(), value=value.encode())
-        _rows.append(_row)
-
-    if bool(_rows) is True:
-        with db.db_modify(20007, die=True) as session:
-            session.add_all(_rows)
+    _ = idx_pair_map(list(uniques.keys()))
 
 
 def idx_pairs(_items):
@@ -107,3 +103,80 @@ def idx_pairs(_items):
     for row in rows:
         result.append(row.idx_pair)
     return sorted(result)
+
+
+def idx_pair_map(items):
+    """Get Pair.idx_pair values for key-value pairs, creating missing rows.
+
+    Known key-value pairs are read from an in-process cache. The remainder
+    are found with one query per chunk of key-value pairs, and the missing
+    ones are then created with a single multi-row INSERT statement.
+
+    Args:
+        items: List of (key, value) tuples
+
+    Returns:
+        result: Dict of Pair.idx_pair values keyed by (key, value)
+
+    """
+    # Initialize key variables
+    result = {}
+    missing = []
+
+    # Get cached values
+    for item in sorted(set(items)):
+        idx_pair = _KNOWN.get(item)
+        if idx_pair is None:
+            missing.append(item)
+        else:
+            result[item] = idx_pair
+
+    # Process the remainder in chunks
+    for index in range(0, len(missing), _CHUNK_SIZE):
+        chunk = [(key.encode(), value.encode())
+                 for key, value in missing[index:index + _CHUNK_SIZE]]
+        found = _idx_pair_map(chunk)
+
+        # Insert and get the absent key-value pairs
+        absent = [_ for _ in chunk if _ not in found]
+        if bool(absent) is True:
+            with db.db_modify(20189, die=True) as session:
+                session.execute(
+                    insert(Pair.__table__).prefix_with('IGNORE'),
+                    [{'key': key, 'value': value} for key, value in absent])
+            found.update(_idx_pair_map(absent))
+
+        # Update the result
+        for (key, value), idx_pair in found.items():
+            item = (key.decode(), value.decode())
+            result[item] = idx_pair
+            _KNOWN.put(item, idx_pair)
+
+    # Return
+    return result
+
+
+def _idx_pair_map(items):
+    """Get the Pair.idx_pair values of existing key-value pairs.
+
+    Args:
+        items: List of encoded (key, value) tuples
+
+    Returns:
+        result: Dict of Pair.idx_pair values keyed by encoded (key, value)
+
+    """
+    # Initialize key variables
+    result = {}
+    rows = []
+
+    # Get the data from the database
+    with db.db_query(20190) as session:
+        rows = session.query(
+            Pair.idx_pair, Pair.key, Pair.value).filter(
+                tuple_(Pair.key, Pair.value).in_(items))
+
+    # Return
+    for row in rows:
+        result[(row.key, row.value)] = row.idx_pair
+    return result
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Maintain and query the pt_data_rollup table.
+
+The table summarizes the values of each datapoint over buckets of fixed
+duration so that long range queries read a few rows per bucket instead of
+every row in the pt_data table.
+
+"""
+
+# Standard libraries
+from operator import attrgetter
+
+# PIP libraries
+from sqlalchemy import and_, case, func, literal_column
+from sqlalchemy.dialects.mysql import insert
+
+# Import project libraries
+from pattoo.db import db
+from pattoo.db.models import Data, DataRollup
+
+# Bucket durations in milliseconds: 5 minutes, 1 hour and 1 day
+RESOLUTIONS = (300000, 3600000, 86400000)
+
+
+def aggregate(items, resolutions=RESOLUTIONS):
+    """Summarize timeseries data per datapoint, resolution and bucket.
+
+    Args:
+        items: List of IDXTimestampValue objects
+        resolutions: Bucket durations in milliseconds
+
+    Returns:
+        result: List of dicts of DataRollup column values
+
+    """
+    # Initialize key variables
+    buckets = {}
+
+    # Summarize
+    for item in sorted(items, key=attrgetter('timestamp')):
+        value = round(item.value, 10)
+        for resolution in resolutions:
+            timestamp = (item.timestamp // resolution) * resolution
+            key = (item.idx_datapoint, resolution, timestamp)
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = {
+                    'idx_datapoint': item.idx_datapoint,
+                    'resolution': resolution,
+                    'timestamp': timestamp,
+                    'value_min': value,
+                    'value_max': value,
+                    'value_sum': value,
+                    'value_count': 1,
+                    'value_last': value,
+                    'last_timestamp': item.timestamp}
+                continue
+
+            # Items are sorted, so this is the most recent value
+            bucket['value_min'] = min(bucket['value_min'], value)
+            bucket['value_max'] = max(bucket['value_max'], value)
+            bucket['value_sum'] += value
+            bucket['value_count'] += 1
+            bucket['value_last'] = value
+            bucket['last_timestamp'] = item.timestamp
+
+    # Return
+    result = [buckets[_] for _ in sorted(buckets)]
+    return result
+
+
+def update_rows(items, chunk_size=1000, session=None):
+    """Merge timeseries data into the DataRollup table.
+
+    Existing buckets are updated with multi-row
+    'INSERT ... ON DUPLICATE KEY UPDATE' statements of at most 'chunk_size'
+    rows each. Items must not have been merged before, or they will be
+    counted twice.
+
+    Args:
+        items: List of IDXTimestampValue objects
+        chunk_size: Maximum number of rows per INSERT statement
+        session: Database session of an ongoing transaction to use. A new
+            transaction is used if None.
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    chunk_size = max(1, int(chunk_size))
+    table = DataRollup.__table__
+
+    # Fail safe checks
+    _rows = aggregate(items)
+    if bool(_rows) is False:
+        return
+
+    # Create the INSERT statement. MySQL applies the updates in order, so
+    # value_last must be updated before last_timestamp. SQLAlchemy renders
+    # any inserted column as the value of the column being updated, so the
+    # inserted last_timestamp is referenced explicitly.
+    statement = insert(table)
+    inserted = statement.inserted
+    statement = statement.on_duplicate_key_update([
+        ('value_min', func.least(table.c.value_min, inserted.value_min)),
+        ('value_max', func.greatest(table.c.value_max, inserted.value_max)),
+        ('value_sum', table.c.value_sum + inserted.value_sum),
+        ('value_count', table.c.value_count + inserted.value_count),
+        ('value_last', case(
+            [(literal_column('VALUES(last_timestamp)') >=
+              table.c.last_timestamp, inserted.value_last)],
+            else_=table.c.value_last)),
+        ('last_timestamp', func.greatest(
+            table.c.last_timestamp, inserted.last_timestamp))
+    ])
+
+    # Update
+    if session is None:
+        with db.db_modify(20205, die=True) as session:
+            for index in range(0, len(_rows), chunk_size):
+                session.execute(statement, _rows[index:index + chunk_size])
+    else:
+        for index in range(0, len(_rows), chunk_size):
+            session.execute(statement, _rows[index:index + chunk_size])
+
+
+def resolution(step, polling_interval):
+    """Get the coarsest rollup resolution that satisfies a query.
+
+    Args:
+        step: Maximum number of milliseconds between the points required
+        polling_interval: Polling interval of the datapoint
+
+    Returns:
+        result: Resolution in milliseconds. None if the raw data must be used
+
+    """
+    # Initialize key variables
+    result = None
+
+    # Rollups are pointless if they are no coarser than the raw data
+    if bool(step) is False or bool(polling_interval) is False:
+        return result
+    for _resolution in RESOLUTIONS:
+        if polling_interval < _resolution <= step:
+            result = _resolution
+    return result
+
+
+def covered(idx_datapoints, _resolution, ts_start):
+    """Get the datapoints whose rollups contain all data since a timestamp.
+
+    Only data ingested while rollups are enabled is summarized. Data older
+    than the first rollup bucket of a datapoint must be read from the Data
+    table.
+
+    Args:
+        idx_datapoints: List of DataPoint indexes
+        _resolution: Resolution in milliseconds
+        ts_start: Start time for query
+
+    Returns:
+        result: Set of DataPoint indexes
+
+    """
+    # Initialize key variables
+    firsts = {}
+    oldest = {}
+
+    # Get the start of the first rollup bucket of each datapoint
+    with db.db_query(20235) as session:
+        rows = session.query(
+            DataRollup.idx_datapoint,
+            func.min(DataRollup.timestamp).label('timestamp')).filter(and_(
+                DataRollup.idx_datapoint.in_(idx_datapoints),
+                DataRollup.resolution == _resolution)).group_by(
+                    DataRollup.idx_datapoint)
+        for row in rows:
+            firsts[row.idx_datapoint] = row.timestamp
+
+    # Get the oldest data of each datapoint in the time range
+    with db.db_query(20236) as session:
+        rows = session.query(
+            Data.idx_datapoint,
+            func.min(Data.timestamp).label('timestamp')).filter(and_(
+                Data.idx_datapoint.in_(idx_datapoints),
+                Data.timestamp >= ts_start)).group_by(Data.idx_datapoint)
+        for row in rows:
+            oldest[row.idx_datapoint] = row.timestamp
+
+    # Return
+    result = set(
+        _ for _ in idx_datapoints if _ not in oldest or (
+            _ in firsts and oldest[_] >= firsts[_]))
+    return result
+
+
+def values(
+        idx_datapoints, _resolution, ts_start, ts_stop, last=False,
+        chunk_size=None):
+    """Get rollup values for datapoints.
+
+    Rows are read with a server side cursor as they are consumed.
+
+    Args:
+        idx_datapoints: List of DataPoint indexes
+        _resolution: Resolution in milliseconds
+        ts_start: Start time for query
+        ts_stop: Stop time for query
+        last: Return the last value of each bucket instead of the average.
+            Used for counters.
+        chunk_size: Number of rows fetched at a time. The db_chunk_size
+            configuration value is used if None
+
+    Returns:
+        None
+
+    Yields:
+        (idx_datapoint, timestamp, value) rows sorted by idx_datapoint and
+        timestamp
+
+    """
+    # Initialize key variables
+    if last is True:
+        value = DataRollup.value_last
+    else:
+        value = DataRollup.value_sum / DataRollup.value_count
+
+    # Get data from database
+    with db.db_query(20206) as session:
+        query = session.query(
+            DataRollup.idx_datapoint, DataRollup.timestamp,
+            value.label('value')).filter(and_(
+                DataRollup.idx_datapoint.in_(idx_datapoints),
+                DataRollup.resolution == _resolution,
+                DataRollup.timestamp <= ts_stop,
+                DataRollup.timestamp >= ts_start)).order_by(
+                    DataRollup.idx_datapoint, DataRollup.timestamp)
+        yield from db.stream(query, chunk_size=chunk_size)
+
+
+def delete_rows(idx_datapoint, ts_stop, chunk_size=10000):
+    """Delete rollups of buckets that start before a timestamp.
+
+    Rows are deleted in primary key order in separate transactions of at
+    most 'chunk_size' rows each.
+
+    Args:
+        idx_datapoint: DataPoint index
+        ts_stop: Rows with older timestamps are deleted
+        chunk_size: Maximum number of rows per DELETE statement
+
+    Returns:
+        result: Number of rows deleted
+
+    """
+    # Initialize key variables
+    result = 0
+    chunk_size = max(1, int(chunk_size))
+
+    for _resolution in RESOLUTIONS:
+        # Each resolution is a separate range of the primary key
+        _filter = and_(
+            DataRollup.idx_datapoint == idx_datapoint,
+            DataRollup.resolution == _resolution)
+
+        while True:
+            # Get the timestamp of the last row of the next chunk
+            with db.db_query(20209) as session:
+                rows = session.query(DataRollup.timestamp).filter(and_(
+                    _filter, DataRollup.timestamp < ts_stop)).order_by(
+                        DataRollup.timestamp).offset(
+                            chunk_size - 1).limit(1).all()
+            if bool(rows) is True:
+                condition = DataRollup.timestamp <= rows[0].timestamp
+            else:
+                condition = DataRollup.timestamp < ts_stop
+
+            # Delete
+            with db.db_modify(20210, die=True) as session:
+                result += session.query(DataRollup).filter(and_(
+                    _filter, condition)).delete(synchronize_session=False)
+
+            # The last chunk was smaller than chunk_size
+            if bool(rows) is False:
+                break
+    return result
@@ -0,0 +1,208 @@
+"""Functions for reducing the number of points in a time series.
+
+The functions process the list of {'timestamp': timestamp, 'value': value}
+dicts returned by pattoo.db.table.datapoint.DataPoint.data. A value of None
+indicates that there was no data for the timestamp.
+
+"""
+
+# PIP3 imports
+import numpy as np
+
+# Methods supported by downsample()
+METHODS = ['lttb', 'minmax', 'mean']
+
+
+def downsample(points, count, method='lttb'):
+    """Reduce the number of points in a time series.
+
+    Args:
+        points: List of timestamp, value dicts sorted by timestamp
+        count: Maximum number of points to return
+        method: Downsampling method. One of the METHODS values. 'lttb' is
+            used if the method is not recognized
+
+    Returns:
+        result: List of timestamp, value dicts
+
+    """
+    # Return the data as is if there are few enough points
+    if bool(count) is False or count < 1 or len(points) <= count:
+        return points
+
+    # Downsample
+    if method == 'minmax':
+        result = minmax(points, count)
+    elif method == 'mean':
+        result = mean(points, count)
+    else:
+        result = lttb(points, count)
+    return result
+
+
+def lttb(points, threshold):
+    """Downsample using the Largest-Triangle-Three-Buckets algorithm.
+
+    This keeps the points that contribute most to the visual shape of the
+    series. Points without values are ignored. The first and last points are
+    always kept, so only the last point is returned if the threshold is 1.
+
+    Args:
+        points: List of timestamp, value dicts sorted by timestamp
+        threshold: Maximum number of points to return
+
+    Returns:
+        result: List of timestamp, value dicts
+
+    """
+    # Ignore points without values
+    if len(points) <= threshold:
+        return points
+    valid = [_ for _ in points if _['value'] is not None]
+    size = len(valid)
+    if size <= threshold:
+        return valid
+
+    # There are no buckets between the first and last points
+    if threshold < 3:
+        result = [valid[0], valid[-1]][max(0, 2 - threshold):]
+        return result
+
+    # Initialize key variables
+    (timestamps, values) = _arrays(valid)
+    timestamps = timestamps.astype(np.float64)
+    every = (size - 2) / (threshold - 2)
+    selected = [0]
+    anchor = 0
+
+    for bucket in range(threshold - 2):
+        # Get the average point of the next bucket
+        start = int(np.floor((bucket + 1) * every)) + 1
+        stop = min(int(np.floor((bucket + 2) * every)) + 1, size)
+        average_x = timestamps[start:stop].mean()
+        average_y = values[start:stop].mean()
+
+        # Select the point in this bucket that creates the largest triangle
+        # with the previously selected point and the average point
+        offset = int(np.floor(bucket * every)) + 1
+        limit = int(np.floor((bucket + 1) * every)) + 1
+        areas = np.abs(
+            (timestamps[anchor] - average_x) * (
+                values[offset:limit] - values[anchor]) -
+            (timestamps[anchor] - timestamps[offset:limit]) * (
+                average_y - values[anchor]))
+        anchor = offset + int(np.argmax(areas))
+        selected.append(anchor)
+
+    # Always keep the last point
+    selected.append(size - 1)
+    result = [valid[_] for _ in selected]
+    return result
+
+
+def minmax(points, count):
+    """Downsample keeping the minimum and maximum values of each bucket.
+
+    Args:
+        points: List of timestamp, value dicts sorted by timestamp
+        count: Maximum number of points to return. Two points are returned
+            per bucket. Only the maximum value is returned if count is 1
+
+    Returns:
+        result: List of timestamp, value dicts. Buckets without values are
+            represented by a single point with a value of None
+
+    """
+    # Initialize key variables
+    result = []
+    if len(points) <= count:
+        return points
+    (_, values) = _arrays(points)
+
+    # Process each bucket
+    for (start, stop) in _buckets(len(points), max(1, count // 2)):
+        _values = values[start:stop]
+        if np.isnan(_values).all():
+            result.append(points[start])
+            continue
+
+        # Keep the extremes in the order in which they occurred
+        low = start + int(np.nanargmin(_values))
+        high = start + int(np.nanargmax(_values))
+        extremes = sorted({low, high}) if count > 1 else [high]
+        for index in extremes:
+            result.append(points[index])
+    return result
+
+
+def mean(points, count):
+    """Downsample using the mean value of each bucket.
+
+    Args:
+        points: List of timestamp, value dicts sorted by timestamp
+        count: Maximum number of points to return
+
+    Returns:
+        result: List of timestamp, value dicts. The timestamp of each point is
+            that of the start of the bucket. Buckets without values have a
+            value of None
+
+    """
+    # Initialize key variables
+    if len(points) <= count:
+        return points
+    (timestamps, values) = _arrays(points)
+    starts = np.array([_[0] for _ in _buckets(len(points), count)])
+
+    # Calculate the mean of each bucket, ignoring missing values
+    missing = np.isnan(values)
+    totals = np.add.reduceat(np.where(missing, 0, values), starts)
+    counts = np.add.reduceat(~missing, starts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        averages = totals / counts
+
+    # Return a list of dicts
+    result = [
+        {'timestamp': timestamp,
+         'value': None if _count == 0 else average}
+        for timestamp, average, _count in zip(
+            timestamps[starts].tolist(), averages.tolist(), counts.tolist())]
+    return result
+
+
+def _buckets(size, count):
+    """Split a range of indexes into buckets of near equal size.
+
+    Args:
+        size: Number of indexes
+        count: Number of buckets
+
+    Returns:
+        result: List of (start, stop) tuples
+
+    """
+    edges = ((np.arange(count + 1) * size) // count).tolist()
+    result = [
+        (start, stop) for start, stop in zip(edges[:-1], edges[1:])
+        if stop > start]
+    return result
+
+
+def _arrays(points):
+    """Create numpy arrays from a list of timestamp, value dicts.
+
+    Args:
+        points: List of timestamp, value dicts
+
+    Returns:
+        result: Tuple of (timestamps, values) numpy arrays. None values are
+            converted to NaN
+
+    """
+    timestamps = np.fromiter(
+        (_['timestamp'] for _ in points), dtype=np.int64, count=len(points))
+    values = np.fromiter(
+        (np.nan if _['value'] is None else _['value'] for _ in points),
+        dtype=np.float64, count=len(points))
+    result = (timestamps, values)
+    return result
@@ -2,6 +2,7 @@
 """Pattoo classes that manage various data."""
 
 # Standard imports
+from operator import attrgetter
 import os
 import time
 
@@ -10,18 +11,23 @@ import time
 from pattoo_shared import log, files, converter
 from pattoo.configuration import ConfigIngester as Config
 from pattoo.constants import PATTOO_API_AGENT_NAME, PATTOO_INGESTER_NAME
+from pattoo import spool
 from .records import Records
 
+# Subdirectory of the cache directory for unreadable cache files
+QUARANTINE = 'quarantine'
+
 
 class Cache():
     """Process ingest cache data."""
 
-    def __init__(self, batch_size=500, age=0):
+    def __init__(self, batch_size=500, age=0, pool=None):
         """Initialize the class.
 
         Args:
             batch_size: Number of files to read
             age: Minimum age of files to be read per batch
+            pool: WorkerPool object to use for multiprocessing
 
         Returns:
             None
@@ -31,32 +37,59 @@ class Cache():
         config = Config()
         directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
         self._batch_id = int(time.time() * 1000)
+        self._pool = pool
+        self._budget = config.record_budget()
 
-        # Read data from cache. Stop if there is no data found.
-        self._data = files.read_json_files(
-            directory, die=False, age=age, count=batch_size)
+        # Find the files to read. They are only read when needed.
+        self._filepaths = filepaths(directory, age=age, count=batch_size)
 
-        # Save the number of files read
-        self.files = len(self._data)
+        # Save the number of files found
+        self.files = len(self._filepaths)
 
-    def records(self):
-        """Create PattooDBrecord objects from cache directory.
+    def stream(self, budget=None):
+        """Create PattooDBrecord objects from cache directory in chunks.
+
+        Files are read one at a time. Their PattooDBrecord objects are
+        grouped by agent_id and yielded once the number of buffered records
+        reaches the budget, so memory usage is bounded by the budget rather
+        than the number of files in the batch. Spool segments are never
+        split across chunks as they can only be deleted as a whole.
 
         Args:
-            None
+            budget: Number of records to buffer before yielding. Everything
+                is yielded at once if None
 
-        Returns:
-            result: List of list of PattooDBrecord objects grouped by agent_id
+        Yields:
+            result: Tuple of (records, filepaths) where records is a list of
+                lists of PattooDBrecord objects grouped by agent_id and
+                filepaths is the list of files they were read from
 
         """
-        # Initialize list of files that have been processed
+        # Initialize key variables
         _cache = {}
-        result = []
+        _filepaths = []
+        buffered = 0
 
         # Read data from files
-        for filepath, json_data in sorted(self._data):
-            # Get data from JSON file. Convert to rows of key-pairs
-            if bool(json_data) is True and isinstance(json_data, dict) is True:
+        for filepath in self._filepaths:
+            if filepath.endswith(spool.SUFFIX) is True:
+                # Spool segments contain many postings
+                items = spool.records(filepath)
+            else:
+                json_data = files.read_json_file(filepath, die=False)
+                if bool(json_data) is False:
+                    # Files are renamed into the directory once fully
+                    # written, so the file is corrupt. Move it out of the way
+                    # so that it isn't read again in every batch.
+                    quarantine(filepath)
+                    continue
+                items = [json_data]
+            _filepaths.append(filepath)
+
+            # Get data from JSON. Convert to rows of key-pairs
+            for json_data in items:
+                if isinstance(json_data, dict) is False:
+                    continue
                 pdbrs = converter.cache_to_keypairs(json_data)
                 if bool(pdbrs) is False:
                     log_message = ('''\
@@ -70,30 +103,54 @@ File {} has invalid data. It will not be processed'''.format(filepath))
                     _cache[pattoo_agent_id].extend(pdbrs)
                 else:
                     _cache[pattoo_agent_id] = pdbrs
+                buffered += len(pdbrs)
+
+            # Flush the buffer if it is full
+            if bool(budget) is True and buffered >= budget:
+                yield (_aggregate(_cache), _filepaths)
+                _cache = {}
+                _filepaths = []
+                buffered = 0
+
+        # Flush what remains
+        if bool(_filepaths) is True:
+            yield (_aggregate(_cache), _filepaths)
+
+    def records(self):
+        """Create PattooDBrecord objects from cache directory.
 
-        # Aggregate data
-        if bool(_cache) is True:
-            for _, item in sorted(_cache.items()):
-                result.append(item)
+        Args:
+            None
+
+        Returns:
+            result: List of list of PattooDBrecord objects grouped by agent_id
+
+        """
+        # Initialize key variables
+        result = []
 
-        # Return
+        # Read all the files in one pass
+        for _records, _ in self.stream():
+            result.extend(_records)
         return result
 
-    def purge(self):
+    def purge(self, _filepaths=None):
         """Purge cache files.
 
         Args:
-            None
+            _filepaths: List of files to delete. All the files found by the
+                class are deleted if None
 
         Returns:
             None
 
         """
         # Initialize key variables
-        filepaths = [filepath for filepath, _ in self._data]
+        if _filepaths is None:
+            _filepaths = self._filepaths
 
         # Delete cache files after processing
-        for filepath in filepaths:
+        for filepath in _filepaths:
             if os.path.exists(filepath):
                 try:
                     os.remove(filepath)
@@ -112,38 +169,201 @@ Error deleting cache file {}.'''.format(filepath))
             records: Number of records processed
 
         """
+        # Initialize key variables
+        records = 0
+
         # Process
-        _data = self.records()
-        if bool(_data) is True:
-            # Log
-            log_message = ('''\
+        for _data, _filepaths in self.stream(budget=self._budget):
+            if bool(_data) is True:
+                # Log
+                log_message = ('''\
 Processing ingest cache files. Batch ID: {}'''.format(self._batch_id))
-            log.log2debug(20004, log_message)
+                log.log2debug(20004, log_message)
 
-            # Add records to the database
-            _records = Records(_data)
-            _records.ingest()
-            self.purge()
+                # Add records to the database
+                _records = Records(_data, pool=self._pool)
+                _records.ingest()
 
-            # Log
-            log_message = ('''\
+                # Log
+                log_message = ('''\
 Finished processing ingest cache files. Batch ID: {}'''.format(self._batch_id))
-            log.log2debug(20117, log_message)
+                log.log2debug(20117, log_message)
 
-        # Determine the number of key pairs read
-        records = 0
-        for item in _data:
-            records += len(item)
+            # Delete files only after their data has been committed
+            self.purge(_filepaths)
+
+            # Determine the number of key pairs read
+            for item in _data:
+                records += len(item)
         return records
 
 
-def process_cache(batch_size=500, max_duration=3600, fileage=10, script=False):
+def filepaths(directory, age=0, count=None):
+    """Get the sorted list of JSON files and spool segments in a directory.
+
+    Args:
+        directory: Directory with JSON files and spool segments
+        age: Minimum age of files in seconds
+        count: Return first X number of sorted filepaths if not None
+
+    Returns:
+        result: Sorted list of filepaths. Sorting causes the files with the
+            older timestamp names to be processed first. This allows the
+            last_timestamp column to be incrementally processed.
+
+    """
+    # Initialize key variables
+    result = []
+    now = time.time()
+
+    # Set age
+    try:
+        age = float(age)
+    except:
+        age = 0
+
+    # Scan the directory only once
+    with os.scandir(directory) as iterator:
+        entries = sorted(
+            [_ for _ in iterator if _.name.endswith(
+                ('.json', spool.SUFFIX))],
+            key=lambda _: _.name)
+
+    # Avoid a stat() of every file when there is no age threshold
+    if age <= 0:
+        result = [_.path for _ in entries[:count]]
+        return result
+
+    # Filter by age
+    for entry in entries:
+        try:
+            fileage = now - entry.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        if fileage > age:
+            result.append(entry.path)
+
+            # Stop if necessary
+            if bool(count) is True and len(result) >= count:
+                break
+
+    return result
+
+
+def quarantine(filepath):
+    """Move an unreadable cache file to the quarantine directory.
+
+    The quarantine directory is a subdirectory of the cache directory. Its
+    files are kept for troubleshooting and are never ingested.
+
+    Args:
+        filepath: Cache file
+
+    Returns:
+        result: Quarantined filepath. None if the file couldn't be moved
+
+    """
+    # Initialize key variables
+    directory = os.path.join(os.path.dirname(filepath), QUARANTINE)
+    result = os.path.join(directory, os.path.basename(filepath))
+
+    # Move the file
+    try:
+        os.makedirs(directory, exist_ok=True)
+        os.replace(filepath, result)
+    except FileNotFoundError:
+        return None
+    except OSError:
+        # Delete the file if it can't be kept
+        log_message = (
+            'Error quarantining unreadable cache file {}. Deleting it.'.format(
+                filepath))
+        log.log2warning(20238, log_message)
+        try:
+            os.remove(filepath)
+        except OSError:
+            pass
+        return None
+
+    # Log
+    log_message = (
+        'Unreadable cache file {} moved to {}.'.format(filepath, result))
+    log.log2warning(20192, log_message)
+    return result
+
+
+def sweep(directory, age=3600):
+    """Delete stale temporary files in a directory.
+
+    The API writes cache files to temporary files that are renamed once
+    complete. Temporary files left behind by API processes that died while
+    writing them are never renamed.
+
+    Args:
+        directory: Directory with JSON files and spool segments
+        age: Minimum age of temporary files to delete in seconds
+
+    Returns:
+        result: Number of files deleted
+
+    """
+    # Initialize key variables
+    result = 0
+    now = time.time()
+
+    # Find the temporary files
+    with os.scandir(directory) as iterator:
+        entries = [_ for _ in iterator if _.name.endswith('.tmp')]
+
+    # Delete the old ones
+    for entry in entries:
+        try:
+            if now - entry.stat().st_mtime > age:
+                os.remove(entry.path)
+                result += 1
+        except FileNotFoundError:
+            continue
+
+    # Log
+    if bool(result) is True:
+        log_message = (
+            'Deleted {} stale temporary files from cache directory {}'.format(
+                result, directory))
+        log.log2info(20234, log_message)
+    return result
+
+
+def _aggregate(_cache):
+    """Create a list of PattooDBrecord lists sorted by agent_id.
+
+    Args:
+        _cache: Dict of PattooDBrecord lists keyed by agent_id
+
+    Returns:
+        result: List of list of PattooDBrecord objects. Each list is sorted
+            by timestamp as the files and spool segments of different API
+            processes could contain an agent's data in any order.
+
+    """
+    result = [
+        sorted(item, key=attrgetter('pattoo_timestamp'))
+        for _, item in sorted(_cache.items())]
+    return result
+
+
+def process_cache(
+        batch_size=500, max_duration=3600, fileage=0, script=False,
+        pool=None):
     """Ingest data.
 
     Args:
         batch_size: Number of files to process at a time
         max_duration: Maximum duration
-        fileage: Minimum age of files to be processed in seconds
+        fileage: Minimum age of files to be processed in seconds. Files are
+            renamed into the cache directory once fully written so there is
+            no need to wait for them by default
+        script: True if running as a script. A lockfile is used if True
+        pool: WorkerPool object to reuse for multiprocessing across batches
 
     Returns:
         success: True if successful
@@ -173,9 +393,13 @@ def process_cache(batch_size=500, max_duration=3600, fileage=10, script=False):
     log_message = 'Processing ingest cache.'
     log.log2info(20085, log_message)
 
+    # Publish spool segments left open by API processes that have stopped
+    # and delete their unfinished cache files
+    spool.recover(directory)
+    sweep(directory)
+
     # Get the number of files in the directory
-    files_found = len(
-        [_ for _ in os.listdir(directory) if _.endswith('.json')])
+    files_found = len(filepaths(directory))
 
     # Create lockfile only if running as a script.
     # The daemon has its own locking mechanism
@@ -208,7 +432,7 @@ This can be adjusted on the CLI.'''.format(max_duration))
             break
 
         # Read data from cache. Stop if there is no data found.
-        cache = Cache(batch_size=batch_size, age=fileage)
+        cache = Cache(batch_size=batch_size, age=fileage, pool=pool)
         count = cache.ingest()
 
         # Automatically stop if we are going on too long.(2 of 2)
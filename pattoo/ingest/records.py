@@ -5,8 +5,6 @@
 from multiprocessing import get_context, cpu_count
 
 import sys
-import time
-import random
 
 # PIP3 imports
 import tblib.pickling_support
@@ -18,9 +16,21 @@ from pattoo_shared.constants import DATA_NONE, DATA_STRING
 from pattoo_shared import log
 from pattoo.constants import IDXTimestampValue, ChecksumLookup
 from pattoo.ingest import get
+from pattoo import db
 from pattoo.db import misc
-from pattoo.db.table import pair, glue, data, datapoint
+from pattoo.db.table import pair, data, datapoint
+from pattoo import versions
 from pattoo.configuration import ConfigIngester as Config
+from pattoo.configuration import ConfigPattoo
+
+# Configuration read once per WorkerPool worker process
+_CONFIG = None
+
+# Checksums of agents processed by this process. Shared across batches
+_CHECKSUM_INDEX = None
+
+# True if the DataRollup table is maintained. Read once per process
+_ROLLUPS = None
 
 
 class ExceptionWrapper():
@@ -65,16 +75,104 @@ class ExceptionWrapper():
         raise self._error_exception.with_traceback(self._etraceback)
 
 
+class WorkerPool():
+    """Long-lived pool of ingester worker processes.
+
+    The pool is created on first use and reused for every batch until it is
+    closed. Workers are initialized once with _initializer and are replaced
+    after 'maxtasksperchild' tasks, or all together using the recycle method.
+
+    """
+
+    def __init__(self, processes=None, maxtasksperchild=None):
+        """Initialize the class.
+
+        Args:
+            processes: Number of worker processes. Defaults to cpu_count()
+            maxtasksperchild: Number of tasks a worker completes before it is
+                replaced by a new worker. Workers live as long as the pool if
+                None.
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._processes = processes if bool(processes) else cpu_count()
+        self._maxtasksperchild = maxtasksperchild
+        self._pool = None
+
+    def starmap(self, func, arguments):
+        """Apply func to each tuple in arguments using the worker processes.
+
+        Args:
+            func: Function to execute
+            arguments: List of argument tuples
+
+        Returns:
+            result: List of values returned by func
+
+        """
+        # Create the pool if necessary
+        if self._pool is None:
+            self._pool = get_context('spawn').Pool(
+                processes=self._processes,
+                initializer=_initializer,
+                maxtasksperchild=self._maxtasksperchild)
+
+        # Process. Recycle the workers if the pool itself fails.
+        try:
+            result = self._pool.starmap(func, arguments)
+        except:
+            self.recycle()
+            raise
+        return result
+
+    def recycle(self):
+        """Terminate all workers. New workers are created when next needed.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Log
+        if self._pool is not None:
+            log_message = 'Recycling ingester worker processes'
+            log.log2debug(20187, log_message)
+        self.close()
+
+    def close(self):
+        """Terminate all workers.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Terminate
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+
 class Records():
     """Process data using multiprocessing."""
 
-    def __init__(self, pattoo_db_records_lists):
+    def __init__(self, pattoo_db_records_lists, pool=None):
         """Initialize the class.
 
         Args:
             pattoo_db_records_lists: List of PattooDBrecord oject lists
                 grouped by source and sorted by timestamp. This data is
                 obtained from PattooShared.converter.extract
+            pool: WorkerPool object to use for multiprocessing. A temporary
+                pool is created and closed for each method call if None.
 
         Returns:
             None
@@ -87,7 +185,7 @@ class Records():
         self._arguments = [
             (_, ) for _ in pattoo_db_records_lists if bool(_) is True]
         self._multiprocess = config.multiprocessing()
-        self._pool_size = cpu_count()
+        self._pool = pool
 
     def multiprocess_pairs(self):
         """Update rows in the Pair database table if necessary.
@@ -104,22 +202,10 @@ class Records():
         """
         # Initialize key variables
         pattoo_db_records_lists_tuple = self._arguments
-        pool_size = self._pool_size
-
-        # Create a pool of sub process resources
-        with get_context('spawn').Pool(processes=pool_size) as pool:
 
-            # Create sub processes from the pool
-            per_process_key_value_pairs = pool.starmap(
-                _process_kvps_exception, pattoo_db_records_lists_tuple)
-
-        # Wait for all the processes to end and get results
-        pool.join()
-
-        # Test for exceptions
-        for result in per_process_key_value_pairs:
-            if isinstance(result, ExceptionWrapper):
-                result.re_raise()
+        # Create sub processes from the pool
+        per_process_key_value_pairs = self._starmap(
+            _process_kvps_exception, pattoo_db_records_lists_tuple)
 
         # Update the database with key value pairs
         pair.insert_rows(per_process_key_value_pairs)
@@ -139,27 +225,44 @@ class Records():
         """
         # Initialize key variables
         pattoo_db_records_lists_tuple = self._arguments
-        pool_size = self._pool_size
 
         # Troubleshooting log
         log_message = 'Processing {} agents from cache'.format(
             len(pattoo_db_records_lists_tuple))
         log.log2debug(20009, log_message)
 
-        # Create a pool of sub process resources
-        with get_context('spawn').Pool(processes=pool_size) as pool:
+        # Create sub processes from the pool
+        self._starmap(_process_data_exception, pattoo_db_records_lists_tuple)
+
+    def _starmap(self, func, arguments):
+        """Execute func in the worker pool and test results for exceptions.
+
+        Args:
+            func: Function to execute
+            arguments: List of argument tuples
 
-            # Create sub processes from the pool
-            results = pool.starmap(
-                _process_data_exception, pattoo_db_records_lists_tuple)
+        Returns:
+            results: List of values returned by func
 
-        # Wait for all the processes to end and get results
-        pool.join()
+        """
+        # Use a temporary pool if one wasn't provided
+        if self._pool is None:
+            pool = WorkerPool()
+            try:
+                results = pool.starmap(func, arguments)
+            finally:
+                pool.close()
+        else:
+            pool = self._pool
+            results = pool.starmap(func, arguments)
 
-        # Test for exceptions
+        # Test for exceptions. Workers may have been left in an unknown state
+        # so they are recycled.
         for result in results:
             if isinstance(result, ExceptionWrapper):
+                pool.recycle()
                 result.re_raise()
+        return results
 
     def singleprocess_pairs(self):
         """Update rows in the Pair database table if necessary.
@@ -222,6 +325,89 @@ class Records():
             self.singleprocess_data()
 
 
+def _initializer():
+    """Initialize a WorkerPool worker process.
+
+    Each worker creates a database engine of its own, so that no connections
+    are shared with the parent. The configuration is read once here and
+    reused by every task the worker processes.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    global _CONFIG
+    _CONFIG = Config()
+
+    # Create the database engine of the worker
+    db.reconnect()
+
+
+def _config():
+    """Get the ingester configuration.
+
+    Args:
+        None
+
+    Returns:
+        result: ConfigIngester object
+
+    """
+    # Use the configuration read by _initializer in WorkerPool workers
+    if _CONFIG is None:
+        result = Config()
+    else:
+        result = _CONFIG
+    return result
+
+
+def _checksum_index():
+    """Get the process-wide ChecksumIndex object.
+
+    Args:
+        None
+
+    Returns:
+        result: ChecksumIndex object
+
+    """
+    # Initialize key variables
+    global _CHECKSUM_INDEX
+
+    # Create the index once
+    if _CHECKSUM_INDEX is None:
+        config = _config()
+        _CHECKSUM_INDEX = misc.ChecksumIndex(
+            maxsize=config.checksum_cache_size(),
+            ttl=config.checksum_cache_ttl())
+    result = _CHECKSUM_INDEX
+    return result
+
+
+def _rollups():
+    """Determine whether the DataRollup table must be maintained.
+
+    Args:
+        None
+
+    Returns:
+        result: True if rollups are enabled
+
+    """
+    # Initialize key variables
+    global _ROLLUPS
+
+    # Read the configuration once
+    if _ROLLUPS is None:
+        _ROLLUPS = ConfigPattoo().db_rollups()
+    result = _ROLLUPS
+    return result
+
+
 def _process_kvps_exception(pattoo_db_records):
     """Get all the key-value pairs found.
 
@@ -238,20 +424,6 @@ def _process_kvps_exception(pattoo_db_records):
     # Initialize key variables
     result = []
 
-    '''
-    Sleep for a short random time. We have seen where on very fast systems
-    SQLAlchemy will hang the creation of multiprocessing subprocesses. The
-    typical behaviour is the creation of one fewer
-    pattoo.db._add_engine_pidguard() log messages than agents to process.
-    These messages correspond to the creation of a subprocess which immediately
-    invalidates a parent process's DB connection that will cause errors
-    if used, which provided the clue to the source of the problem.
-
-    Though SQLAlchemy isn't used by key_value_pairs. It's added as a
-    future precaution in case it does.
-    '''
-    time.sleep((random.random() / 10) + 0.1)
-
     # Execute
     try:
         result = get.key_value_pairs(pattoo_db_records)
@@ -280,19 +452,6 @@ def _process_data_exception(pattoo_db_records):
         None
 
     """
-    # Initialize
-
-    '''
-    Sleep for a short random time. We have seen where on very fast systems
-    SQLAlchemy will hang the creation of multiprocessing subprocesses. The
-    typical behaviour is the creation of one fewer
-    pattoo.db._add_engine_pidguard() log messages than agents to process.
-    These messages correspond to the creation of a subprocess which immediately
-    invalidates a parent process's DB connection that will cause errors
-    if used, which provided the clue to the source of the problem.
-    '''
-    time.sleep((random.random() / 10) + 0.1)
-
     # Execute
     try:
         process_db_records(pattoo_db_records)
@@ -330,17 +489,24 @@ def process_db_records(pattoo_db_records):
     """
     # Initialize key variables
     _data = {}
+    _last_timestamps = {}
 
     # Return if there is nothint to process
     if bool(pattoo_db_records) is False:
         return
 
-    # Get DataPoint.idx_datapoint and idx_pair values from db. This is used to
+    # Get DataPoint.idx_datapoint and idx_pair values. This is used to
     # speed up the process by reducing the need for future database access.
+    # The values are cached across batches and only refreshed from the
+    # database when necessary.
     agent_id = pattoo_db_records[0].pattoo_agent_id
-    checksum_table = misc.agent_checksums(agent_id)
+    checksums = [
+        _.pattoo_checksum for _ in pattoo_db_records
+        if _.pattoo_data_type not in [DATA_NONE, DATA_STRING]]
+    checksum_table = _checksum_index().checksums(agent_id, checksums)
 
-    # Process data
+    # Ignore non-numeric values
+    numerics = []
     for pdbr in pattoo_db_records:
         # We only want to insert non-string, non-None values
         if pdbr.pattoo_data_type in [DATA_NONE, DATA_STRING]:
@@ -351,30 +517,34 @@ def process_db_records(pattoo_db_records):
             float_value = float(pdbr.pattoo_value)
         except:
             continue
+        numerics.append((pdbr, float_value))
+
+    # Create all the database entries required by new checksums in a single
+    # transaction and update the lookup table
+    unknowns = [
+        pdbr for pdbr, _ in numerics
+        if pdbr.pattoo_checksum not in checksum_table]
+    if bool(unknowns) is True:
+        pollings = {
+            _.pattoo_checksum: int(_.pattoo_agent_polling_interval)
+            for _ in unknowns}
+        pairs = {
+            _.pattoo_checksum: get.key_value_pairs(_) for _ in unknowns}
+        for checksum, idx_datapoint in misc.idx_datapoints(
+                unknowns, pairs).items():
+            checksum_table[checksum] = ChecksumLookup(
+                idx_datapoint=idx_datapoint,
+                polling_interval=pollings[checksum],
+                last_timestamp=1)
 
+    # Process data
+    for pdbr, float_value in numerics:
         # Get the idx_datapoint value for the PattooDBrecord
         if pdbr.pattoo_checksum in checksum_table:
-            # Get last_timestamp for existing idx_datapoint entry
             idx_datapoint = checksum_table[
                 pdbr.pattoo_checksum].idx_datapoint
         else:
-            # Entry not in database. Update the database and get the
-            # required idx_datapoint
-            idx_datapoint = datapoint.idx_datapoint(pdbr)
-            if bool(idx_datapoint) is True:
-                # Update the lookup table
-                checksum_table[
-                    pdbr.pattoo_checksum] = ChecksumLookup(
-                        idx_datapoint=idx_datapoint,
-                        polling_interval=int(
-                            pdbr.pattoo_agent_polling_interval),
-                        last_timestamp=1)
-
-                # Update the Glue table
-                idx_pairs = get.pairs(pdbr)
-                glue.insert_rows(idx_datapoint, idx_pairs)
-            else:
-                continue
+            continue
 
         # Append item to items
         if pdbr.pattoo_timestamp > checksum_table[
@@ -396,10 +566,37 @@ def process_db_records(pattoo_db_records):
                     polling_interval=int(pdbr.pattoo_agent_polling_interval),
                     timestamp=pdbr.pattoo_timestamp,
                     value=float_value)
+            _last_timestamps[pdbr.pattoo_checksum] = max(
+                pdbr.pattoo_timestamp,
+                _last_timestamps.get(pdbr.pattoo_checksum, 0))
 
     # Update the data table
     if bool(_data) is True:
-        data.insert_rows(list(_data.values()))
+        config = _config()
+        if config.bulk_ingest() is True:
+            updated = data.insert_rows_bulk(
+                list(_data.values()), chunk_size=config.bulk_chunk_size(),
+                rollups=_rollups())
+        else:
+            updated = data.insert_rows(
+                list(_data.values()), rollups=_rollups())
+
+        # Keep the cached last_timestamp values current. Only DataPoints
+        # updated in the database are changed so that the cache matches it.
+        updated = set(updated)
+        for checksum, timestamp in _last_timestamps.items():
+            if checksum_table[checksum].idx_datapoint in updated:
+                checksum_table[checksum] = checksum_table[checksum]._replace(
+                    last_timestamp=timestamp)
+
+        # Publish the new last_timestamp values so that cached metadata and
+        # web API responses are refreshed
+        timestamps = {}
+        for item in _data.values():
+            timestamps[item.idx_datapoint] = max(
+                item.timestamp, timestamps.get(item.idx_datapoint, 0))
+        datapoint.invalidate(list(timestamps))
+        versions.versions().publish(timestamps)
 
     # Log message
     log_message = ('''\
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""Pattoo classes that purge expired data from the database."""
+
+# Standard imports
+import sys
+import time
+import threading
+
+# Import project libraries
+from pattoo_shared import log
+from pattoo.configuration import ConfigIngester as Config
+from pattoo.configuration import ConfigPattoo
+from pattoo.db import db, partition
+from pattoo.db.models import Agent, DataPoint
+from pattoo.db.table import data, rollup
+
+# Milliseconds per day
+_DAY = 86400000
+
+
+class Policy():
+    """Determine how long the data of each datapoint is kept."""
+
+    def __init__(self, retention):
+        """Initialize the class.
+
+        Args:
+            retention: Dict returned by ConfigIngester.retention
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._default = retention.get('default', 0)
+        self._data_types = retention.get('data_types', {})
+        self._agent_programs = retention.get('agent_programs', {})
+
+    def enabled(self):
+        """Determine whether any data expires.
+
+        Args:
+            None
+
+        Returns:
+            result: True if any data expires
+
+        """
+        result = bool(self._default) or any(
+            self._data_types.values()) or any(self._agent_programs.values())
+        return result
+
+    def longest(self):
+        """Get the number of days after which all data expires.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of days. 0 if some data never expires
+
+        """
+        # Initialize key variables
+        days = [self._default] + list(self._data_types.values()) + list(
+            self._agent_programs.values())
+
+        # Return
+        if all(days) is True:
+            result = max(days)
+        else:
+            result = 0
+        return result
+
+    def days(self, data_type, agent_program):
+        """Get the number of days the data of a datapoint is kept.
+
+        Agent program policies take precedence over data type policies,
+        which take precedence over the default.
+
+        Args:
+            data_type: DataPoint data type
+            agent_program: Program of the agent that created the datapoint
+
+        Returns:
+            result: Number of days. 0 if the data never expires
+
+        """
+        if agent_program in self._agent_programs:
+            result = self._agent_programs[agent_program]
+        elif data_type in self._data_types:
+            result = self._data_types[data_type]
+        else:
+            result = self._default
+        return result
+
+
+def purge(now=None):
+    """Delete expired Data and DataRollup rows.
+
+    Rollups have their own retention period, so summarized history can
+    outlive the raw data it was created from. If the Data table is
+    partitioned, future partitions are created and partitions in which all
+    data has expired are dropped before any rows are deleted.
+
+    Args:
+        now: Current time in milliseconds. Uses the system time if None
+
+    Returns:
+        result: Number of Data rows deleted
+
+    """
+    # Initialize key variables
+    config = Config()
+    policy = Policy(config.retention())
+    rollup_days = config.rollup_retention()
+    chunk_size = config.purge_chunk_size()
+    ts_start = time.time()
+    result = 0
+    rollups = 0
+    if now is None:
+        now = int(ts_start * 1000)
+
+    # Maintain partitions
+    partition_days = ConfigPattoo().db_partition_days()
+    if bool(partition_days) is True:
+        partition.maintain(
+            partition_days, retention=policy.longest(), now=now)
+
+    # Nothing expires
+    if policy.enabled() is False and bool(rollup_days) is False:
+        return result
+
+    # Get the datapoints
+    with db.db_query(20211) as session:
+        rows = session.query(
+            DataPoint.idx_datapoint, DataPoint.data_type,
+            Agent.agent_program).filter(
+                DataPoint.idx_agent == Agent.idx_agent).order_by(
+                    DataPoint.idx_datapoint).all()
+
+    # Purge
+    for row in rows:
+        days = policy.days(row.data_type, row.agent_program.decode())
+        if bool(days) is True:
+            result += data.delete_rows(
+                row.idx_datapoint, now - days * _DAY, chunk_size=chunk_size)
+        if bool(rollup_days) is True:
+            rollups += rollup.delete_rows(
+                row.idx_datapoint, now - rollup_days * _DAY,
+                chunk_size=chunk_size)
+
+    # Log
+    log_message = ('''\
+Purged {} expired data rows and {} expired rollup rows of {} datapoints in \
+{:.2f}s.'''.format(result, rollups, len(rows), time.time() - ts_start))
+    log.log2info(20212, log_message)
+    return result
+
+
+def purge_continuously(interval, stop=None):
+    """Purge expired data periodically.
+
+    Args:
+        interval: Number of seconds between purges
+        stop: threading.Event that stops the purges when set. Runs forever
+            if None
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    if stop is None:
+        stop = threading.Event()
+
+    # Purge immediately so that partitions exist for new data. Failures must
+    # not stop future purges.
+    while True:
+        try:
+            purge()
+        except:
+            _exception = sys.exc_info()
+            log_message = 'Failed to purge expired data'
+            log.log2exception(20213, _exception, message=log_message)
+        if stop.wait(interval) is True:
+            break
+
+
+def start(interval):
+    """Purge expired data periodically in a background thread.
+
+    Args:
+        interval: Number of seconds between purges
+
+    Returns:
+        result: threading.Event that stops the purges when set
+
+    """
+    # Start
+    result = threading.Event()
+    thread = threading.Thread(
+        target=purge_continuously, args=(interval, result), daemon=True)
+    thread.start()
+    return result
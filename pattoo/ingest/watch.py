@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""Pattoo classes that ingest cache data continuously as it arrives."""
+
+# Standard imports
+import os
+import sys
+import json
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+# Import project libraries
+from pattoo_shared import log
+from pattoo.configuration import ConfigIngester as Config
+from pattoo.constants import PATTOO_API_AGENT_NAME, PATTOO_INGESTERD_NAME
+from pattoo import spool
+from .files import Cache, filepaths, sweep
+
+
+# inotify constants from <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct('iIII')
+
+# Files of interest to the ingester
+_SUFFIXES = ('.json', spool.SUFFIX)
+
+
+class Watcher():
+    """Report new files in a directory using inotify where available."""
+
+    def __init__(self, directory, poll_interval=1):
+        """Initialize the class.
+
+        Args:
+            directory: Directory to watch
+            poll_interval: Seconds between scans if inotify is unavailable
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._directory = directory
+        self._poll_interval = poll_interval
+        self._fd = _inotify(directory)
+        self._seen = set()
+
+        # Get the files already present when polling
+        if self._fd is None:
+            self._seen = set(_names(directory))
+
+    @property
+    def inotify(self):
+        """Determine whether inotify is being used.
+
+        Args:
+            None
+
+        Returns:
+            result: True if inotify is used
+
+        """
+        result = self._fd is not None
+        return result
+
+    def changes(self, timeout=None):
+        """Wait for new files.
+
+        Args:
+            timeout: Maximum number of seconds to wait. Wait indefinitely
+                with inotify or for one poll_interval without it if None
+
+        Returns:
+            result: Number of new files found
+
+        """
+        if self._fd is None:
+            result = self._poll(timeout)
+        else:
+            result = self._read(timeout)
+        return result
+
+    def close(self):
+        """Stop watching the directory.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _read(self, timeout):
+        """Wait for inotify events.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            result: Number of new files found
+
+        """
+        # Initialize key variables
+        result = 0
+
+        # Wait for events
+        (readable, _, _) = select.select([self._fd], [], [], timeout)
+        if bool(readable) is False:
+            return result
+
+        # Count the files that have been completely written
+        try:
+            buffer = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return result
+        offset = 0
+        while offset + _EVENT.size <= len(buffer):
+            (_, mask, _, length) = _EVENT.unpack_from(buffer, offset)
+            offset += _EVENT.size
+            name = buffer[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            # Events were lost. Scan the directory instead.
+            if mask & _IN_Q_OVERFLOW:
+                log_message = ('''\
+Too many files arrived in {} to be tracked with inotify. Rescanning the \
+directory.'''.format(self._directory))
+                log.log2warning(20198, log_message)
+                result = len(_names(self._directory))
+                break
+
+            if name.decode(errors='ignore').endswith(_SUFFIXES):
+                result += 1
+        return result
+
+    def _poll(self, timeout):
+        """Scan the directory for new files.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            result: Number of new files found
+
+        """
+        # Wait
+        if timeout is None:
+            timeout = self._poll_interval
+        time.sleep(min(timeout, self._poll_interval))
+
+        # Scan
+        names = set(_names(self._directory))
+        result = len(names - self._seen)
+        self._seen = names
+        return result
+
+
+class Stats():
+    """Track the latency and throughput of continuous ingestion."""
+
+    def __init__(self):
+        """Initialize the class.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.reset()
+
+    def reset(self):
+        """Reset the counters.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        self._start = time.time()
+        self.batches = 0
+        self.files = 0
+        self.records = 0
+        self.busy = 0
+        self.latency_total = 0
+        self.latency_max = 0
+
+    def update(self, files_, records, latency, duration):
+        """Add the results of a batch.
+
+        Args:
+            files_: Number of files ingested
+            records: Number of records ingested
+            latency: Seconds between the first file of the batch arriving
+                and its data being committed
+            duration: Seconds taken to ingest the batch
+
+        Returns:
+            None
+
+        """
+        self.batches += 1
+        self.files += files_
+        self.records += records
+        self.busy += duration
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    def summary(self):
+        """Summarize the counters.
+
+        Args:
+            None
+
+        Returns:
+            result: Dict of statistics
+
+        """
+        # Initialize key variables
+        elapsed = max(time.time() - self._start, 1e-6)
+
+        # Summarize
+        result = {
+            'timestamp': int(time.time()),
+            'elapsed': round(elapsed, 3),
+            'batches': self.batches,
+            'files': self.files,
+            'records': self.records,
+            'records_per_second': round(self.records / elapsed, 3),
+            'utilization': round(self.busy / elapsed, 3),
+            'latency_average': round(
+                self.latency_total / max(1, self.batches), 3),
+            'latency_max': round(self.latency_max, 3)
+        }
+        return result
+
+
+def process_continuously(batch_size=500, latency=1, pool=None, stop=None):
+    """Ingest data as soon as it arrives in the cache directory.
+
+    Args:
+        batch_size: Maximum number of files to process at a time
+        latency: Maximum number of seconds to wait for a batch to fill up
+        pool: WorkerPool object to reuse for multiprocessing across batches
+        stop: Function that returns True when processing must stop. Runs
+            forever if None
+
+    Returns:
+        None
+
+    Method:
+        1) Wait for new files to be renamed into the cache directory
+        2) Ingest them once there are batch_size of them, or once the first
+           of them has been waiting for latency seconds
+        3) Repeat without waiting while batches are full
+
+    """
+    # Initialize key variables
+    config = Config()
+    directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+    stats_interval = config.stats_interval()
+    stats_file = '{}{}{}.stats.json'.format(
+        config.daemon_directory(), os.sep, PATTOO_INGESTERD_NAME)
+    stats = Stats()
+    watcher = Watcher(directory)
+    deadline = None
+    first_seen = None
+
+    # Log what we are doing
+    log_message = ('''\
+Continuously ingesting cache directory {} using {}.\
+'''.format(directory, 'inotify' if watcher.inotify is True else 'polling'))
+    log.log2info(20199, log_message)
+
+    # Process files already in the directory
+    spool.recover(directory)
+    sweep(directory)
+    pending = len(filepaths(directory))
+    stats_due = time.time() + stats_interval
+
+    while stop is None or bool(stop()) is False:
+        now = time.time()
+
+        # Start the clock for the batch
+        if bool(pending) is True and deadline is None:
+            first_seen = now
+            deadline = now + latency
+
+        # Ingest full or expired batches
+        if pending >= batch_size or (
+                deadline is not None and now >= deadline):
+            cache = Cache(batch_size=batch_size, pool=pool)
+            records = cache.ingest()
+            duration = time.time() - now
+            if bool(cache.files) is True:
+                stats.update(
+                    cache.files, records, time.time() - first_seen, duration)
+
+            # Start the next batch immediately if there is a backlog
+            if cache.files >= batch_size:
+                pending = max(1, pending - cache.files)
+                deadline = time.time()
+            else:
+                pending = 0
+                deadline = None
+            continue
+
+        # Report statistics
+        if now >= stats_due:
+            _report(stats, stats_file)
+            spool.recover(directory)
+            sweep(directory)
+            stats_due = now + stats_interval
+
+        # Wait for more files. Wake up regularly to check whether to stop.
+        timeout = min(stats_due - now, 1)
+        if deadline is not None:
+            timeout = min(timeout, deadline - now)
+        pending += watcher.changes(max(0, timeout))
+
+    # Clean up
+    watcher.close()
+
+
+def _report(stats, filepath):
+    """Log ingester statistics and save them to a file.
+
+    Args:
+        stats: Stats object
+        filepath: File in which to save the statistics
+
+    Returns:
+        None
+
+    """
+    # Log
+    summary = stats.summary()
+    log_message = ('''\
+Ingester statistics: {0[batches]} batches, {0[files]} files, \
+{0[records]} records, {0[records_per_second]:.2f} records / second, \
+{0[latency_average]:.3f}s average latency, {0[latency_max]:.3f}s maximum \
+latency.'''.format(summary))
+    log.log2info(20200, log_message)
+
+    # Save without exposing partially written files to readers
+    temp_path = '{}.tmp'.format(filepath)
+    try:
+        with open(temp_path, 'w') as _fp:
+            json.dump(summary, _fp)
+        os.rename(temp_path, filepath)
+    except:
+        _exception = sys.exc_info()
+        log_message = (
+            'Cannot save ingester statistics to {}'.format(filepath))
+        log.log2exception(20203, _exception, message=log_message)
+
+    # Start a new reporting period
+    stats.reset()
+
+
+def _names(directory):
+    """Get the names of the files of interest in a directory.
+
+    Args:
+        directory: Directory
+
+    Returns:
+        result: List of filenames
+
+    """
+    with os.scandir(directory) as iterator:
+        result = [_.name for _ in iterator if _.name.endswith(_SUFFIXES)]
+    return result
+
+
+def _inotify(directory):
+    """Create an inotify file descriptor watching a directory.
+
+    Args:
+        directory: Directory to watch
+
+    Returns:
+        result: File descriptor or None if inotify is unavailable
+
+    """
+    # Initialize key variables
+    result = None
+    mask = _IN_CLOSE_WRITE | _IN_MOVED_TO
+
+    # inotify is only available on Linux
+    if sys.platform.startswith('linux') is False:
+        return result
+
+    # Get libc
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        _init = libc.inotify_init1
+        _add_watch = libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return result
+
+    # Watch the directory
+    _add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    fd = _init(_IN_NONBLOCK | _IN_CLOEXEC)
+    if fd < 0:
+        return result
+    if _add_watch(fd, os.fsencode(directory), mask) < 0:
+        log_message = ('''\
+Cannot use inotify to watch {}: {}. Polling instead.\
+'''.format(directory, errno.errorcode.get(ctypes.get_errno(), 'unknown')))
+        log.log2info(20204, log_message)
+        os.close(fd)
+        return result
+    result = fd
+    return result
@@ -0,0 +1,341 @@
+"""Append-only segmented spool for agent data received by the API.
+
+Each API worker process appends the JSON data posted by agents to its own
+segment file. A record is a 4 byte little-endian unsigned length followed by
+that number of bytes of UTF-8 encoded JSON. Segments start with an 8 byte
+header made of the SEGMENT_MAGIC bytes and a 4 byte little-endian version.
+
+Segments are written with the OPEN_SUFFIX and renamed with the SUFFIX once
+they are full or old enough. Writers hold an exclusive flock on their open
+segment, so open segments that can be locked belong to processes that have
+died. The ingester only reads segments that have been closed this way, which makes it safe to delete them after their data has been
+committed to the database. Closed segment names start with the oldest
+timestamp of their records, like the JSON cache files, so that the ingester
+reads the segments of all API processes in timestamp order.
+
+"""
+
+# Standard imports
+import os
+import sys
+import atexit
+import fcntl
+import json
+import mmap
+import time
+import struct
+import threading
+
+# Import project libraries
+from pattoo_shared import log
+
+
+# Segment file format
+SEGMENT_MAGIC = b'PSPL'
+SEGMENT_VERSION = 1
+SUFFIX = '.seg'
+OPEN_SUFFIX = '{}.open'.format(SUFFIX)
+_HEADER = struct.Struct('<4sI')
+_LENGTH = struct.Struct('<I')
+
+# Writer for the current process
+_WRITER = None
+_WRITER_LOCK = threading.Lock()
+
+
+class Writer():
+    """Append records to rotating segment files for a single process."""
+
+    def __init__(self, directory, max_size=4194304, max_age=10):
+        """Initialize the class.
+
+        Args:
+            directory: Directory in which to create segments
+            max_size: Size in bytes at which a segment is closed
+            max_age: Age in seconds at which a segment is closed
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._directory = directory
+        self._max_size = max_size
+        self._max_age = max_age
+        self._pid = os.getpid()
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._fp = None
+        self._filepath = None
+        self._size = 0
+        self._started = 0
+        self._oldest = None
+        self._timer = None
+
+        # Publish the current segment when the process exits
+        atexit.register(self.close)
+
+    def append(self, _data, timestamp=None):
+        """Append a record to the current segment.
+
+        Args:
+            _data: JSON serializable data
+            timestamp: Timestamp of the data in milliseconds. The current
+                time is used if None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        payload = json.dumps(_data).encode()
+        record = _LENGTH.pack(len(payload)) + payload
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+
+        with self._lock:
+            # Close the segment if it is full or old
+            if self._fp is not None:
+                age = time.time() - self._started
+                if self._size >= self._max_size or age >= self._max_age:
+                    self._close()
+
+            # Start a new segment if required
+            if self._fp is None:
+                self._open()
+
+            # Write the whole record before returning
+            self._fp.write(record)
+            self._fp.flush()
+            self._size += len(record)
+            if self._oldest is None or int(timestamp) < self._oldest:
+                self._oldest = int(timestamp)
+
+    def close(self):
+        """Close the current segment making it available for ingestion.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            self._close()
+
+    def _open(self):
+        """Create a new segment.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Create a unique, time ordered filename
+        self._sequence += 1
+        self._started = time.time()
+        self._filepath = '{}{}{}_{}_{}{}'.format(
+            self._directory, os.sep, int(self._started * 1000),
+            self._pid, str(self._sequence).zfill(6), OPEN_SUFFIX)
+
+        # Write the header. The lock tells recover() the segment is in use.
+        self._fp = open(self._filepath, 'wb')
+        fcntl.flock(self._fp.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._fp.write(_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION))
+        self._size = _HEADER.size
+        self._oldest = None
+
+        # Make sure the segment is published even if no more data arrives
+        self._timer = threading.Timer(self._max_age, self.close)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _close(self):
+        """Close the current segment.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Nothing to do
+        if self._fp is None:
+            return
+
+        # Publish the segment before releasing the lock so that recover()
+        # can't publish it too
+        self._timer.cancel()
+        os.rename(self._filepath, _closed(self._filepath, self._oldest))
+        self._fp.close()
+        self._fp = None
+        self._filepath = None
+
+
+def writer(directory, max_size=4194304, max_age=10):
+    """Get the segment writer for the current process.
+
+    Args:
+        directory: Directory in which to create segments
+        max_size: Size in bytes at which a segment is closed
+        max_age: Age in seconds at which a segment is closed
+
+    Returns:
+        result: Writer object
+
+    """
+    # Initialize key variables
+    global _WRITER
+
+    # Create a new writer if the process has been forked
+    with _WRITER_LOCK:
+        if _WRITER is None or _WRITER._pid != os.getpid():
+            _WRITER = Writer(directory, max_size=max_size, max_age=max_age)
+        result = _WRITER
+    return result
+
+
+def records(filepath):
+    """Read the records in a closed segment.
+
+    Args:
+        filepath: Segment filepath
+
+    Yields:
+        result: Data of each record in the order it was written
+
+    """
+    # Read the file
+    with open(filepath, 'rb') as _fp:
+        size = os.fstat(_fp.fileno()).st_size
+        if size < _HEADER.size:
+            log_message = ('''\
+Spool segment {} has no header. Ignoring.'''.format(filepath))
+            log.log2warning(20193, log_message)
+            return
+
+        with mmap.mmap(_fp.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            # Verify the header
+            (magic, version) = _HEADER.unpack_from(buffer, 0)
+            if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION:
+                log_message = ('''\
+Spool segment {} has an invalid header. Ignoring.'''.format(filepath))
+                log.log2warning(20194, log_message)
+                return
+
+            # Process the records
+            offset = _HEADER.size
+            while offset + _LENGTH.size <= size:
+                (length,) = _LENGTH.unpack_from(buffer, offset)
+                offset += _LENGTH.size
+                if offset + length > size:
+                    break
+                try:
+                    result = json.loads(buffer[offset:offset + length])
+                except:
+                    _exception = sys.exc_info()
+                    log_message = ('''\
+Spool segment {} has an invalid record at offset {}. Ignoring the record.\
+'''.format(filepath, offset))
+                    log.log2exception(20195, _exception, message=log_message)
+                    result = None
+                offset += length
+                if result is not None:
+                    yield result
+
+            # Writers only publish complete segments. This is only possible
+            # if the writer died while appending a record.
+            if offset < size:
+                log_message = ('''\
+Spool segment {} has a truncated record at offset {}.\
+'''.format(filepath, offset))
+                log.log2warning(20196, log_message)
+
+
+def recover(directory):
+    """Close the open segments of API processes that are no longer running.
+
+    Args:
+        directory: Spool directory
+
+    Returns:
+        None
+
+    """
+    # Find open segments
+    with os.scandir(directory) as iterator:
+        filepaths = [_.path for _ in iterator if _.name.endswith(OPEN_SUFFIX)]
+
+    # Close the segments of dead processes. Their writers no longer hold a
+    # lock on them.
+    for filepath in filepaths:
+        try:
+            with open(filepath, 'rb') as _fp:
+                try:
+                    fcntl.flock(_fp.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+
+                # The writer could have published the segment before
+                # releasing the lock
+                if os.stat(filepath).st_ino != os.fstat(_fp.fileno()).st_ino:
+                    continue
+                os.rename(filepath, _closed(filepath, _oldest(filepath)))
+        except FileNotFoundError:
+            continue
+        log_message = ('''\
+Recovered spool segment {} of a process that is no longer running.\
+'''.format(filepath))
+        log.log2info(20197, log_message)
+
+
+def _closed(filepath, timestamp=None):
+    """Get the filepath of an open segment after it is closed.
+
+    Args:
+        filepath: Open segment filepath
+        timestamp: Oldest timestamp of the records in the segment. The time
+            the segment was opened is kept if None
+
+    Returns:
+        result: Closed segment filepath
+
+    """
+    # Initialize key variables
+    (directory, filename) = os.path.split(filepath[:-len(OPEN_SUFFIX)])
+
+    # Replace the time the segment was opened
+    if timestamp is not None:
+        filename = '{}_{}'.format(int(timestamp), filename.split('_', 1)[1])
+    result = '{}{}'.format(os.path.join(directory, filename), SUFFIX)
+    return result
+
+
+def _oldest(filepath):
+    """Get the oldest agent timestamp of the records in a segment.
+
+    Args:
+        filepath: Segment filepath
+
+    Returns:
+        result: Oldest timestamp. None if there are no timestamps
+
+    """
+    # Initialize key variables
+    result = None
+
+    # Read the records
+    for item in records(filepath):
+        if isinstance(item, dict) is False:
+            continue
+        try:
+            timestamp = int(item['pattoo_agent_timestamp'])
+        except:
+            continue
+        if result is None or timestamp < result:
+            result = timestamp
+    return result
@@ -21,10 +21,32 @@ def chart_timestamp_args(idx_datapoint, secondsago=None):
     """
     # Calculate stop. This takes into account the ingester cycle and subtracts
     # a few extra seconds to prevent zero values at the end.
-    datapoint = DataPoint(idx_datapoint)
+    datapoint = DataPoint(idx_datapoint, cached=True)
     polling_interval = datapoint.polling_interval()
     now = normalized_timestamp(polling_interval, int(time.time() * 1000))
 
+    # Calculate start
+    result = timestamp_args(secondsago, now=now)
+    return result
+
+
+def timestamp_args(secondsago=None, now=None):
+    """Create URI arguments for queries of multiple DataPoints.
+
+    Args:
+        secondsago: Number of seconds in the past to calculate the start
+            time. One week is used if not a valid integer
+        now: Timestamp from which to calculate the start time. Uses the
+            system time if None
+
+    Returns:
+        result: Starting time
+
+    """
+    # Initialize key variables
+    if now is None:
+        now = int(time.time() * 1000)
+
     # Calculate start
     if bool(secondsago) is True and isinstance(secondsago, int) is True:
         result = now - (abs(secondsago) * 1000)
@@ -0,0 +1,214 @@
+"""Most recent timestamps of DataPoints shared between processes.
+
+The ingester publishes the DataPoint.last_timestamp of each datapoint it
+updates to a memory mapped file. The web API reads it to discard cached
+metadata and responses as soon as new data is ingested, without querying
+the database. The file is an array of 8 byte little-endian signed integers
+indexed by idx_datapoint. Missing and unpublished entries are 0.
+
+"""
+
+# Standard imports
+import os
+import sys
+import fcntl
+import mmap
+import struct
+import threading
+
+# Import project libraries
+from pattoo_shared import log
+from pattoo.configuration import ConfigPattoo as Config
+
+
+# File format
+_VALUE = struct.Struct('<q')
+
+# Number of bytes by which the file grows
+_GROWTH = 1048576
+
+# Versions of the current process
+_VERSIONS = None
+_VERSIONS_LOCK = threading.Lock()
+
+
+class Versions():
+    """Memory mapped array of DataPoint timestamps."""
+
+    def __init__(self, filename):
+        """Initialize the class.
+
+        Args:
+            filename: Name of the file
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._filename = filename
+        self._fp = None
+        self._buffer = None
+        self._writable = False
+        self._lock = threading.Lock()
+
+    def get(self, idx_datapoint):
+        """Get the most recent timestamp of a DataPoint.
+
+        Args:
+            idx_datapoint: DataPoint index
+
+        Returns:
+            result: Timestamp. 0 if not published
+
+        """
+        # Initialize key variables
+        offset = int(idx_datapoint) * _VALUE.size
+        result = 0
+
+        with self._lock:
+            # The file grows when new DataPoints are published
+            if self._mapped(offset + _VALUE.size, create=False) is True:
+                (result,) = _VALUE.unpack_from(self._buffer, offset)
+        return result
+
+    def publish(self, timestamps):
+        """Publish the most recent timestamps of DataPoints.
+
+        Timestamps older than those already published are ignored. The file
+        is locked while values are compared and updated, as several processes
+        can publish to it at the same time.
+
+        Args:
+            timestamps: Dict of timestamps keyed by idx_datapoint
+
+        Returns:
+            None
+
+        """
+        # Nothing to do
+        if bool(timestamps) is False:
+            return
+
+        with self._lock:
+            size = (max(timestamps) + 1) * _VALUE.size
+            if self._mapped(size, create=True) is False:
+                return
+            fcntl.flock(self._fp.fileno(), fcntl.LOCK_EX)
+            try:
+                for idx_datapoint, timestamp in timestamps.items():
+                    offset = idx_datapoint * _VALUE.size
+                    (current,) = _VALUE.unpack_from(self._buffer, offset)
+                    if timestamp > current:
+                        _VALUE.pack_into(
+                            self._buffer, offset, int(timestamp))
+            finally:
+                fcntl.flock(self._fp.fileno(), fcntl.LOCK_UN)
+
+    def close(self):
+        """Close the file.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            self._close()
+
+    def _mapped(self, size, create=False):
+        """Map at least a minimum number of bytes of the file.
+
+        Args:
+            size: Minimum number of bytes
+            create: Create or grow the file if it is smaller than size
+
+        Returns:
+            result: True if successful
+
+        """
+        # Already mapped
+        if self._buffer is not None and len(self._buffer) >= size:
+            if create is False or self._writable is True:
+                return True
+
+        try:
+            # Open the file. Only processes that publish need write access.
+            if create is True and self._writable is False:
+                self._close()
+            if self._fp is None:
+                if create is False and os.path.isfile(
+                        self._filename) is False:
+                    return False
+                self._fp = open(self._filename, 'a+b' if create else 'rb')
+                self._writable = create
+
+            # Grow the file. Processes lock it so that it never shrinks.
+            if create is True:
+                fcntl.flock(self._fp.fileno(), fcntl.LOCK_EX)
+                try:
+                    if os.fstat(self._fp.fileno()).st_size < size:
+                        self._fp.truncate(
+                            (size // _GROWTH + 1) * _GROWTH)
+                finally:
+                    fcntl.flock(self._fp.fileno(), fcntl.LOCK_UN)
+
+            # Map the whole file
+            length = os.fstat(self._fp.fileno()).st_size
+            if length < size:
+                return False
+            if self._buffer is not None:
+                self._buffer.close()
+            self._buffer = mmap.mmap(
+                self._fp.fileno(), length, access=(
+                    mmap.ACCESS_WRITE if self._writable is True
+                    else mmap.ACCESS_READ))
+        except:
+            _exception = sys.exc_info()
+            log_message = ('''\
+Cannot map DataPoint versions file {}'''.format(self._filename))
+            log.log2exception(20230, _exception, message=log_message)
+            self._close()
+            return False
+        return True
+
+    def _close(self):
+        """Close the file without locking.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+        self._writable = False
+
+
+def versions():
+    """Get the Versions object of the current process.
+
+    Args:
+        None
+
+    Returns:
+        result: Versions object
+
+    """
+    # Initialize key variables
+    global _VERSIONS
+
+    # Create the object once
+    with _VERSIONS_LOCK:
+        if _VERSIONS is None:
+            _VERSIONS = Versions(Config().versions_file())
+    result = _VERSIONS
+    return result
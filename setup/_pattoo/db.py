@@ -12,7 +12,7 @@ from sqlalchemy import create_engine
 from pattoo_shared import log
 from pattoo_shared import data
 from pattoo.configuration import ConfigPattoo as Config
-from pattoo.db import URL
+from pattoo.db import URL, partition
 from pattoo.db.models import BASE
 from pattoo.db.table import (
    language, pair_xlate_group, pair_xlate, agent_xlate, user, chart, favorite)
@@ -449,6 +449,12 @@ authentication is correct.'''.format(config.db_name(), config.db_hostname()))
     print('Creating database tables.')
     BASE.metadata.create_all(engine)
 
+    # Partition the Data table by time
+    days = config.db_partition_days()
+    if bool(days) is True:
+        print('Partitioning the pt_data table.')
+        partition.install(engine, days)
+
 
 def install():
     """
@@ -93,6 +93,14 @@ class TestBasicFunctions(LiveServerTestCase):
         self.assertEqual(len(cache_data[0]), 2)
         result = cache_data[0][1]
 
+        # Test the filename. No temporary files must remain
+        filename = os.path.basename(cache_data[0][0])
+        self.assertEqual(
+            filename.split('_')[0], str(expected['pattoo_agent_timestamp']))
+        self.assertEqual(filename.split('_')[-1], '1.json')
+        self.assertFalse(
+            [_ for _ in os.listdir(cache_directory) if _.endswith('.tmp')])
+
         # Result and expected are not quite the same. 'expected' will have
         # lists of tuples where 'result' will have lists of lists
         for key, value in result.items():
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Test pattoo web API response cache configuration."""
+
+import os
+import unittest
+import sys
+
+# PIP3 imports
+from flask import Flask, jsonify
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                EXEC_DIR,
+                os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}api{0}web'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from tests.libraries.configuration import UnittestConfig
+from pattoo.configuration import ConfigPattoo
+from pattoo.api.web import caching
+
+
+class _Config(ConfigPattoo):
+    """ConfigPattoo with a configurable response cache type."""
+
+    def __init__(self, cache_type):
+        """Initialize the class.
+
+        Args:
+            cache_type: Response cache type
+
+        Returns:
+            None
+
+        """
+        ConfigPattoo.__init__(self)
+        self._cache_type = cache_type
+
+    def response_cache_type(self):
+        """Get response_cache_type.
+
+        Args:
+            None
+
+        Returns:
+            result: Response cache type
+
+        """
+        return self._cache_type
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_config(self):
+        """Testing method / function config."""
+        # Test the default
+        result = caching.config()
+        self.assertEqual(result, {
+            'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 300})
+
+        # Test shared caches
+        result = caching.config(_Config('filesystem'))
+        self.assertEqual(result['CACHE_TYPE'], 'FileSystemCache')
+        self.assertEqual(
+            result['CACHE_DIR'], ConfigPattoo().response_cache_directory())
+        result = caching.config(_Config('memcached'))
+        self.assertEqual(result['CACHE_TYPE'], 'MemcachedCache')
+        self.assertEqual(
+            result['CACHE_MEMCACHED_SERVERS'], ['localhost:11211'])
+        result = caching.config(_Config('redis'))
+        self.assertEqual(result['CACHE_TYPE'], 'RedisCache')
+        self.assertEqual(result['CACHE_REDIS_URL'], 'redis://localhost:6379/0')
+
+    def test_conditional(self):
+        """Testing method / function conditional."""
+        # Initialize key variables
+        app = Flask(__name__)
+        calls = []
+
+        @app.route('/view')
+        @caching.conditional(lambda: 'etag', lambda: 1573619400000)
+        def view():
+            """Count calls."""
+            calls.append(None)
+            return jsonify([1])
+
+        # Test
+        client = app.test_client()
+        response = client.get('/view')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['ETag'], '"etag"')
+        self.assertEqual(
+            response.headers['Last-Modified'], 'Wed, 13 Nov 2019 04:30:00 GMT')
+        self.assertEqual(len(calls), 1)
+
+        # The view must not be called for matching ETags
+        response = client.get('/view', headers={'If-None-Match': '"etag"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(len(calls), 1)
+        response = client.get('/view', headers={'If-None-Match': '"other"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(calls), 2)
+
+    def test_init_app(self):
+        """Testing method / function init_app."""
+        pass
+
+    def test_key(self):
+        """Testing method / function key."""
+        # Test
+        result = caching.key('/data/1', 'points=10', 1000, None)
+        self.assertTrue(result.startswith('pattoo/'))
+        self.assertLessEqual(len(result), 250)
+        self.assertEqual(
+            result, caching.key('/data/1', 'points=10', 1000, None))
+        self.assertNotEqual(
+            result, caching.key('/data/1', 'points=10', 2000, None))
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Test pattoo web API response serialization."""
+
+import os
+import unittest
+import sys
+import json
+
+# PIP3 imports
+from flask import Flask
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                EXEC_DIR,
+                os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}api{0}web'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from tests.libraries.configuration import UnittestConfig
+from pattoo.api.web import serialize
+
+# Application used to create request contexts
+_APP = Flask(__name__)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_negotiate(self):
+        """Testing method / function negotiate."""
+        # Rows are the default
+        for headers in [{}, {'Accept': '*/*'}, {'Accept': 'text/html'}]:
+            with _APP.test_request_context('/', headers=headers):
+                self.assertEqual(serialize.negotiate(), 'rows')
+
+        # Test the Accept header
+        headers = {'Accept': serialize.COLUMNS_MIMETYPE}
+        with _APP.test_request_context('/', headers=headers):
+            self.assertEqual(serialize.negotiate(), 'columns')
+
+        # The query string takes precedence
+        with _APP.test_request_context('/?format=rows', headers=headers):
+            self.assertEqual(serialize.negotiate(), 'rows')
+        with _APP.test_request_context('/?format=columns'):
+            self.assertEqual(serialize.negotiate(), 'columns')
+        with _APP.test_request_context('/?format=foo'):
+            self.assertEqual(serialize.negotiate(), 'rows')
+
+    def test_columns(self):
+        """Testing method / function columns."""
+        # Test
+        points = [
+            {'timestamp': 1000, 'value': 1.5},
+            {'timestamp': 2000, 'value': None}]
+        result = serialize.columns(points)
+        self.assertEqual(
+            result, {'timestamps': [1000, 2000], 'values': [1.5, None]})
+        self.assertEqual(
+            serialize.columns([]), {'timestamps': [], 'values': []})
+
+    def test_dumps(self):
+        """Testing method / function dumps."""
+        # Test
+        value = {'1': [{'timestamp': 1000, 'value': None}], '2': [1.5]}
+        result = serialize.dumps(value)
+        self.assertTrue(isinstance(result, bytes))
+        self.assertEqual(json.loads(result.decode()), value)
+
+    def test_response(self):
+        """Testing method / function response."""
+        # Test
+        with _APP.test_request_context('/'):
+            result = serialize.response([1])
+            self.assertEqual(result.mimetype, serialize.JSON_MIMETYPE)
+            self.assertEqual(json.loads(result.get_data()), [1])
+            self.assertTrue('Accept' in result.vary)
+            result = serialize.response({}, 'columns')
+            self.assertEqual(result.mimetype, serialize.COLUMNS_MIMETYPE)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -77,7 +77,15 @@ class TestBasicFunctions(unittest.TestCase):
             polling_interval=polling_interval,
             timestamp=timestamp,
             value=pattoo_value)]
-        data.insert_rows(_data)
+        result = data.insert_rows(_data)
+        self.assertEqual(result, [idx_datapoint])
+
+        # Duplicates and older rows must not cause errors or move the
+        # last_timestamp back in time
+        older = _data[0]._replace(timestamp=timestamp - polling_interval)
+        data.insert_rows(_data + [older])
+        _dp = datapoint.DataPoint(idx_datapoint)
+        self.assertEqual(_dp.last_timestamp(), timestamp)
 
         # Verify that the data is there
         with db.db_query(20015) as session:
@@ -88,6 +96,102 @@ class TestBasicFunctions(unittest.TestCase):
         for row in rows:
             self.assertEqual(row.value, pattoo_value)
 
+    def test_insert_rows_bulk(self):
+        """Testing method / function insert_rows_bulk."""
+        # Initialize key variables
+        checksum = lib_data.hashstring(str(random()))
+        agent_id = lib_data.hashstring(str(random()))
+        data_type = DATA_FLOAT
+        polling_interval = 10
+        pattoo_key = lib_data.hashstring(str(random()))
+        timestamp = int(time.time() * 1000)
+
+        insert = PattooDBrecord(
+            pattoo_checksum=checksum,
+            pattoo_key=pattoo_key,
+            pattoo_agent_id=agent_id,
+            pattoo_agent_polling_interval=polling_interval,
+            pattoo_timestamp=timestamp,
+            pattoo_data_type=data_type,
+            pattoo_value=0,
+            pattoo_agent_polled_target='pattoo_agent_polled_target',
+            pattoo_agent_program='pattoo_agent_program',
+            pattoo_agent_hostname='pattoo_agent_hostname',
+            pattoo_metadata=[]
+        )
+
+        # Create checksum entry in the DB, then update the data table using
+        # chunks smaller than the number of rows
+        idx_datapoint = datapoint.idx_datapoint(insert)
+        expected = {}
+        _data = []
+        for index in range(0, 5):
+            _timestamp = timestamp + (index * polling_interval)
+            expected[_timestamp] = index * 3
+            _data.append(IDXTimestampValue(
+                idx_datapoint=idx_datapoint,
+                polling_interval=polling_interval,
+                timestamp=_timestamp,
+                value=index * 3))
+        result = data.insert_rows_bulk(_data, chunk_size=2)
+        self.assertEqual(result, [idx_datapoint])
+
+        # Duplicates must not cause errors
+        data.insert_rows_bulk(_data[:1], chunk_size=2)
+
+        # Verify that the data is there
+        with db.db_query(20186) as session:
+            rows = session.query(
+                Data.timestamp, Data.value).filter(
+                    Data.idx_datapoint == idx_datapoint).all()
+        self.assertEqual(len(rows), len(expected))
+        for row in rows:
+            self.assertEqual(row.value, expected[row.timestamp])
+
+        # Verify the last_timestamp
+        _dp = datapoint.DataPoint(idx_datapoint)
+        self.assertEqual(_dp.last_timestamp(), max(expected.keys()))
+
+    def test_delete_rows(self):
+        """Testing method / function delete_rows."""
+        # Initialize key variables
+        polling_interval = 10
+        timestamp = int(time.time() * 1000)
+        insert = PattooDBrecord(
+            pattoo_checksum=lib_data.hashstring(str(random())),
+            pattoo_key=lib_data.hashstring(str(random())),
+            pattoo_agent_id=lib_data.hashstring(str(random())),
+            pattoo_agent_polling_interval=polling_interval,
+            pattoo_timestamp=timestamp,
+            pattoo_data_type=DATA_FLOAT,
+            pattoo_value=0,
+            pattoo_agent_polled_target='pattoo_agent_polled_target',
+            pattoo_agent_program='pattoo_agent_program',
+            pattoo_agent_hostname='pattoo_agent_hostname',
+            pattoo_metadata=[]
+        )
+        idx_datapoint = datapoint.idx_datapoint(insert)
+        _data = [
+            IDXTimestampValue(
+                idx_datapoint=idx_datapoint,
+                polling_interval=polling_interval,
+                timestamp=timestamp + (index * polling_interval),
+                value=index) for index in range(0, 10)]
+        data.insert_rows_bulk(_data)
+
+        # Delete the oldest rows using chunks smaller than the number of rows
+        ts_stop = timestamp + (7 * polling_interval)
+        result = data.delete_rows(idx_datapoint, ts_stop, chunk_size=3)
+        self.assertEqual(result, 7)
+
+        # Verify that only the newer data is there
+        with db.db_query(20214) as session:
+            rows = session.query(Data.timestamp).filter(
+                Data.idx_datapoint == idx_datapoint).all()
+        self.assertEqual(
+            sorted(_.timestamp for _ in rows),
+            [_.timestamp for _ in _data[7:]])
+
 
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
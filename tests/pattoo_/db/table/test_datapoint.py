@@ -6,6 +6,9 @@ import unittest
 import sys
 from random import random
 import time
+from collections import namedtuple
+
+import numpy as np
 
 # Try to create a working PYTHONPATH
 EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -26,10 +29,10 @@ else:
     sys.exit(2)
 
 from pattoo_shared import data, times
-from pattoo_shared.constants import DATA_FLOAT, PattooDBrecord
+from pattoo_shared.constants import DATA_FLOAT, DATA_COUNT, PattooDBrecord
 from pattoo.db.table import datapoint, agent
 from pattoo.db.table import data as lib_data
-from pattoo.db.table.datapoint import DataPoint
+from pattoo.db.table.datapoint import DataPoint, DataPoints
 from pattoo.db.models import DataPoint as _DataPoint
 from pattoo.db import db
 from pattoo.constants import IDXTimestampValue
@@ -121,22 +124,99 @@ class TestBasicFunctions(unittest.TestCase):
         self.assertTrue(bool(result))
         self.assertTrue(isinstance(result, int))
 
-    def test__counters(self):
-        """Testing method / function _counters."""
-        # Create a counter-like dict
+    def test__series_counters(self):
+        """Testing method / function _series with counter values."""
+        # Create counter-like rows
+        Row = namedtuple('Row', 'timestamp value')
         increment = 2
         inputs = {}
         for item in range(0, 20, increment):
             inputs[item] = item
+        rows = [Row(timestamp=_, value=inputs[_]) for _ in sorted(inputs)]
 
-        result = datapoint._counters(inputs, 1, 1)
+        # Test
+        result = datapoint._series(rows, DATA_COUNT, increment, 0, 18)
         self.assertEqual(len(inputs) - 1, len(result))
         for item in result:
             self.assertTrue(item['timestamp'] in inputs)
-            self.assertEqual(item['value'], increment * 1000)
+            self.assertEqual(item['value'], 1000)
 
-    def test__response(self):
-        """Testing method / function _response."""
+    def test__values(self):
+        """Testing method / function _values."""
+        # Initialize variables
+        Row = namedtuple('Row', 'timestamp value')
+        rows = [
+            Row(timestamp=1000, value=1), Row(timestamp=1500, value=2),
+            Row(timestamp=4999, value=3.123456789012)]
+
+        # Test. The last value of a polling interval must be used
+        result = datapoint._values(rows, 1000, 1000, 4, 10)
+        self.assertEqual(result[0], 2)
+        self.assertTrue(np.isnan(result[1]))
+        self.assertTrue(np.isnan(result[2]))
+        self.assertEqual(result[3], 3.123456789)
+
+        # Test with chunks smaller than the number of rows
+        result = datapoint._values(iter(rows), 1000, 1000, 4, 10, chunk_size=1)
+        self.assertEqual(result[0], 2)
+        self.assertEqual(result[3], 3.123456789)
+
+        # Test without rows
+        result = datapoint._values([], 1000, 1000, 2, 10)
+        self.assertTrue(np.isnan(result).all())
+
+    def test__serialize(self):
+        """Testing method / function _serialize."""
+        # Test
+        timestamps = np.array([1000, 2000], dtype=np.int64)
+        values = np.array([np.nan, 2.5])
+        result = datapoint._serialize(timestamps, values)
+        self.assertEqual(result, [
+            {'timestamp': 1000, 'value': None},
+            {'timestamp': 2000, 'value': 2.5}])
+        self.assertTrue(isinstance(result[0]['timestamp'], int))
+        self.assertTrue(isinstance(result[1]['value'], float))
+
+    def test__series(self):
+        """Testing method / function _series."""
+        # Initialize variables
+        Row = namedtuple('Row', 'timestamp value')
+        rows = [Row(timestamp=1000, value=1), Row(timestamp=3000, value=5)]
+
+        # Test non-counters
+        result = datapoint._series(rows, DATA_FLOAT, 1000, 1000, 3500)
+        self.assertEqual(result, [
+            {'timestamp': 1000, 'value': 1},
+            {'timestamp': 2000, 'value': None},
+            {'timestamp': 3000, 'value': 5}])
+
+        # Test counters
+        result = datapoint._series(rows, DATA_COUNT, 2000, 0, 3000)
+        self.assertEqual(result, [{'timestamp': 2000, 'value': 2}])
+        result = datapoint._series(rows[:1], DATA_COUNT, 1000, 1000, 3000)
+        self.assertEqual(result, [])
+
+        # Test columns
+        result = datapoint._series(
+            rows, DATA_FLOAT, 1000, 1000, 3500, columnar=True)
+        self.assertEqual(result, {
+            'timestamps': [1000, 2000, 3000], 'values': [1, None, 5]})
+        result = datapoint._series(
+            rows[:1], DATA_COUNT, 1000, 1000, 3000, columnar=True)
+        self.assertEqual(result, {'timestamps': [], 'values': []})
+
+    def test__columns(self):
+        """Testing method / function _columns."""
+        # Test
+        timestamps = np.array([1000, 2000], dtype=np.int64)
+        values = np.array([np.nan, 2.5])
+        result = datapoint._columns(timestamps, values)
+        self.assertEqual(
+            result, {'timestamps': [1000, 2000], 'values': [None, 2.5]})
+        self.assertTrue(isinstance(result['timestamps'][0], int))
+
+    def test__output(self):
+        """Testing method / function _output."""
         # Initialize variables
         inputs = {
             1: 1 * 3,
@@ -144,12 +224,22 @@ class TestBasicFunctions(unittest.TestCase):
             3: 3 * 3,
             4: 4 * 3
         }
-        result = datapoint._response(inputs)
+        timestamps = np.array(sorted(inputs), dtype=np.int64)
+        values = np.array([inputs[_] for _ in sorted(inputs)], dtype=float)
+
+        # Test
+        result = datapoint._output(timestamps, values, False)
         self.assertEqual(len(inputs), len(result))
         for item in result:
             timestamp = item['timestamp']
             self.assertEqual(item['value'], inputs[timestamp])
 
+        # Test columns
+        result = datapoint._output(timestamps, values, True)
+        self.assertEqual(result['timestamps'], sorted(inputs))
+        self.assertEqual(
+            result['values'], [inputs[_] for _ in sorted(inputs)])
+
 
 class TestDataPoint(unittest.TestCase):
     """Checks all functions and methods."""
@@ -159,6 +249,26 @@ class TestDataPoint(unittest.TestCase):
         # Tested by other methods
         pass
 
+    def test_cached(self):
+        """Testing the metadata cache used by __init__."""
+        # Initialize key variables
+        idx_datapoint = _idx_datapoint()
+        datapoint.invalidate()
+
+        # Cached metadata must be used until invalidated
+        obj = DataPoint(idx_datapoint, cached=True)
+        self.assertTrue(obj.exists())
+        with db.db_modify(20228) as session:
+            session.query(_DataPoint).filter(
+                _DataPoint.idx_datapoint == idx_datapoint).update(
+                    {'last_timestamp': 1000})
+        obj = DataPoint(idx_datapoint, cached=True)
+        self.assertNotEqual(obj.last_timestamp(), 1000)
+        self.assertEqual(DataPoint(idx_datapoint).last_timestamp(), 1000)
+        datapoint.invalidate([idx_datapoint])
+        obj = DataPoint(idx_datapoint, cached=True)
+        self.assertEqual(obj.last_timestamp(), 1000)
+
     def test_enabled(self):
         """Testing method / function enabled."""
         # Create a new row in the database and test
@@ -293,6 +403,76 @@ class TestDataPoint(unittest.TestCase):
         self.assertEqual(result, expected)
 
 
+class TestDataPoints(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_last_timestamp(self):
+        """Testing method / function last_timestamp."""
+        # Initialize key variables
+        idx_datapoints = [_idx_datapoint(), _idx_datapoint()]
+        expected = max(
+            DataPoint(_).last_timestamp() for _ in idx_datapoints)
+
+        # Test
+        obj = DataPoints(idx_datapoints)
+        self.assertEqual(obj.last_timestamp(), expected)
+        obj = DataPoints([])
+        self.assertIsNone(obj.last_timestamp())
+
+    def test_data(self):
+        """Testing method / function data."""
+        # Initialize key variables
+        _data = []
+        idx_datapoints = []
+        polling_interval = 300 * 1000
+        ts_start = int(time.time() * 1000)
+        ts_stop = ts_start + (polling_interval * 9)
+
+        # Create two DataPoints with different values
+        for multiplier in [1, 2]:
+            checksum = data.hashstring(str(random()))
+            for count in range(0, 10):
+                insert = PattooDBrecord(
+                    pattoo_checksum=checksum,
+                    pattoo_key=data.hashstring(str(random())),
+                    pattoo_agent_id=data.hashstring(str(random())),
+                    pattoo_agent_polling_interval=polling_interval,
+                    pattoo_timestamp=ts_start + (polling_interval * count),
+                    pattoo_data_type=DATA_FLOAT,
+                    pattoo_value=count * multiplier,
+                    pattoo_agent_polled_target='pattoo_agent_polled_target',
+                    pattoo_agent_program='pattoo_agent_program',
+                    pattoo_agent_hostname='pattoo_agent_hostname',
+                    pattoo_metadata=[]
+                )
+                idx_datapoint = datapoint.idx_datapoint(insert)
+                _data.append(IDXTimestampValue(
+                    idx_datapoint=idx_datapoint,
+                    polling_interval=polling_interval,
+                    timestamp=insert.pattoo_timestamp,
+                    value=insert.pattoo_value))
+            idx_datapoints.append(idx_datapoint)
+
+        # Insert rows of new data
+        lib_data.insert_rows(_data)
+
+        # Test. Results must match those of the individual DataPoints.
+        missing = max(idx_datapoints) + 1000000
+        obj = DataPoints(idx_datapoints + [missing])
+        result = obj.data(ts_start, ts_stop)
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result[missing], [])
+        for idx_datapoint in idx_datapoints:
+            self.assertEqual(
+                result[idx_datapoint],
+                DataPoint(idx_datapoint).data(ts_start, ts_stop))
+            self.assertEqual(len(result[idx_datapoint]), 10)
+
+
 def _idx_datapoint():
     """Create a new DataPoint db entry.
 
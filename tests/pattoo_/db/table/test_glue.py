@@ -96,6 +96,43 @@ class TestBasicFunctions(unittest.TestCase):
         self.assertTrue(bool(result))
         self.assertTrue(isinstance(result, int))
 
+    def test_insert_rows_bulk(self):
+        """Testing method / function insert_rows_bulk."""
+        # Initialize key variables
+        polling_interval = 1
+        keypairs = []
+        items = []
+        for _ in range(0, 4):
+            key = data.hashstring(str(random()))
+            value = data.hashstring(str(random()))
+            keypairs.append((key, value))
+
+        # Create a new Agent entry
+        agent_id = data.hashstring(str(random()))
+        agent_target = data.hashstring(str(random()))
+        agent_program = data.hashstring(str(random()))
+        agent.insert_row(agent_id, agent_target, agent_program)
+        idx_agent = agent.exists(agent_id, agent_target)
+
+        # Insert values in tables
+        pair.insert_rows(keypairs)
+        idx_pairs = [pair.pair_exists(key, value) for key, value in keypairs]
+        for _ in range(0, 3):
+            checksum = data.hashstring(str(random()))
+            datapoint.insert_row(
+                checksum, DATA_FLOAT, polling_interval, idx_agent)
+            items.append((datapoint.checksum_exists(checksum), idx_pairs))
+
+        # Pre-existing entries must be ignored
+        glue.insert_rows(items[0][0], idx_pairs[:2])
+
+        # Test
+        glue.insert_rows_bulk(items)
+        glue.insert_rows_bulk(items)
+        for idx_datapoint, _idx_pairs in items:
+            result = glue.idx_pairs(idx_datapoint)
+            self.assertEqual(result, sorted(_idx_pairs))
+
     def test_idx_pairs(self):
         """Testing method / function idx_pairs."""
         # Initialize key variables
@@ -89,6 +89,27 @@ class TestBasicFunctions(unittest.TestCase):
         for idx_pair in idx_pairs:
             self.assertTrue(idx_pair in result)
 
+    def test_idx_pair_map(self):
+        """Testing method / function idx_pair_map."""
+        # Initialize key variables
+        keypairs = []
+        for _ in range(0, 10):
+            key = data.hashstring(str(random()))
+            value = data.hashstring(str(random()))
+            keypairs.append((key, value))
+
+        # Insert some values in tables beforehand
+        pair.insert_rows(keypairs[:5])
+
+        # Test
+        result = pair.idx_pair_map(keypairs + keypairs[:2])
+        self.assertEqual(len(result), len(keypairs))
+        for key, value in keypairs:
+            self.assertEqual(result[(key, value)], pair.pair_exists(key, value))
+
+        # Cached values must be returned
+        self.assertEqual(pair.idx_pair_map(keypairs), result)
+
 
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Test pattoo rollup table."""
+
+import os
+import unittest
+import sys
+from random import random
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                EXEC_DIR,
+                os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}db{0}table'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from pattoo_shared import data as lib_data
+from pattoo_shared.constants import PattooDBrecord
+from pattoo.constants import IDXTimestampValue
+from pattoo_shared.constants import DATA_FLOAT
+from tests.libraries.configuration import UnittestConfig
+from pattoo.db.table import rollup, datapoint, data
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_aggregate(self):
+        """Testing method / function aggregate."""
+        # Initialize key variables
+        items = _items(1, [(300000, 4), (0, 2), (100000, 6), (200000, 1)])
+
+        # Test
+        result = rollup.aggregate(items, resolutions=[300000, 3600000])
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result[0], {
+            'idx_datapoint': 1,
+            'resolution': 300000,
+            'timestamp': 0,
+            'value_min': 1,
+            'value_max': 6,
+            'value_sum': 9,
+            'value_count': 3,
+            'value_last': 1,
+            'last_timestamp': 200000})
+        self.assertEqual(result[1]['timestamp'], 300000)
+        self.assertEqual(result[1]['value_count'], 1)
+        self.assertEqual(result[2]['resolution'], 3600000)
+        self.assertEqual(result[2]['value_count'], 4)
+        self.assertEqual(result[2]['value_last'], 4)
+
+        # Datapoints must not be mixed
+        items.extend(_items(2, [(0, 10)]))
+        result = rollup.aggregate(items, resolutions=[300000])
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result[-1]['idx_datapoint'], 2)
+        self.assertEqual(result[-1]['value_sum'], 10)
+
+        # Nothing to aggregate
+        self.assertEqual(rollup.aggregate([]), [])
+
+    def test_resolution(self):
+        """Testing method / function resolution."""
+        # Use the coarsest rollup no coarser than the step
+        self.assertEqual(rollup.resolution(86400000 * 2, 300000), 86400000)
+        self.assertEqual(rollup.resolution(3600000, 10000), 3600000)
+        self.assertEqual(rollup.resolution(3599999, 10000), 300000)
+
+        # Rollups must be coarser than the raw data
+        self.assertIsNone(rollup.resolution(300000, 300000))
+        self.assertIsNone(rollup.resolution(299999, 10000))
+        self.assertIsNone(rollup.resolution(None, 10000))
+
+    def test_update_rows(self):
+        """Testing method / function update_rows."""
+        # Initialize key variables
+        polling_interval = 60000
+        insert = PattooDBrecord(
+            pattoo_checksum=lib_data.hashstring(str(random())),
+            pattoo_key=lib_data.hashstring(str(random())),
+            pattoo_agent_id=lib_data.hashstring(str(random())),
+            pattoo_agent_polling_interval=polling_interval,
+            pattoo_timestamp=1,
+            pattoo_data_type=DATA_FLOAT,
+            pattoo_value=0,
+            pattoo_agent_polled_target='pattoo_agent_polled_target',
+            pattoo_agent_program='pattoo_agent_program',
+            pattoo_agent_hostname='pattoo_agent_hostname',
+            pattoo_metadata=[]
+        )
+        idx_datapoint = datapoint.idx_datapoint(insert)
+
+        # Merge data into the same bucket in two passes, with smaller chunks
+        # than the number of rows
+        rollup.update_rows(
+            _items(idx_datapoint, [(0, 5), (60000, 3)]), chunk_size=1)
+        rollup.update_rows(
+            _items(idx_datapoint, [(120000, 7), (180000, 1)]), chunk_size=1)
+
+        # Test
+        result = list(rollup.values([idx_datapoint], 300000, 0, 300000))
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].timestamp, 0)
+        self.assertEqual(float(result[0].value), 4)
+        result = list(rollup.values(
+            [idx_datapoint], 300000, 0, 300000, last=True))
+        self.assertEqual(float(result[0].value), 1)
+
+    def test_update_rows_data(self):
+        """Testing method / function update_rows when inserting data."""
+        # Initialize key variables
+        idx_datapoint = _idx_datapoint()
+        items = _items(idx_datapoint, [(0, 5), (60000, 3)])
+
+        # Rows that already exist must not be merged again
+        data.insert_rows_bulk(items, rollups=True)
+        data.insert_rows_bulk(
+            items + _items(idx_datapoint, [(120000, 7)]), rollups=True)
+
+        # Test
+        result = list(rollup.values([idx_datapoint], 300000, 0, 300000))
+        self.assertEqual(len(result), 1)
+        self.assertEqual(float(result[0].value), 5)
+
+    def test_covered(self):
+        """Testing method / function covered."""
+        # Initialize key variables
+        idx_datapoint = _idx_datapoint()
+
+        # Datapoints without data are covered
+        result = rollup.covered([idx_datapoint], 300000, 0)
+        self.assertEqual(result, {idx_datapoint})
+
+        # Data ingested before rollups were enabled is not covered
+        data.insert_rows(_items(idx_datapoint, [(0, 5)]))
+        data.insert_rows(
+            _items(idx_datapoint, [(600000, 3), (660000, 1)]), rollups=True)
+        result = rollup.covered([idx_datapoint], 300000, 0)
+        self.assertEqual(result, set())
+        result = rollup.covered([idx_datapoint], 300000, 600000)
+        self.assertEqual(result, {idx_datapoint})
+
+
+def _idx_datapoint():
+    """Create a DataPoint.
+
+    Args:
+        None
+
+    Returns:
+        result: DataPoint index
+
+    """
+    # Initialize key variables
+    insert = PattooDBrecord(
+        pattoo_checksum=lib_data.hashstring(str(random())),
+        pattoo_key=lib_data.hashstring(str(random())),
+        pattoo_agent_id=lib_data.hashstring(str(random())),
+        pattoo_agent_polling_interval=60000,
+        pattoo_timestamp=1,
+        pattoo_data_type=DATA_FLOAT,
+        pattoo_value=0,
+        pattoo_agent_polled_target='pattoo_agent_polled_target',
+        pattoo_agent_program='pattoo_agent_program',
+        pattoo_agent_hostname='pattoo_agent_hostname',
+        pattoo_metadata=[]
+    )
+    result = datapoint.idx_datapoint(insert)
+    return result
+
+
+def _items(idx_datapoint, timestamp_values):
+    """Create a list of IDXTimestampValue objects.
+
+    Args:
+        idx_datapoint: DataPoint index
+        timestamp_values: List of (timestamp, value) tuples
+
+    Returns:
+        result: List of IDXTimestampValue objects
+
+    """
+    result = [
+        IDXTimestampValue(
+            idx_datapoint=idx_datapoint,
+            polling_interval=60000,
+            timestamp=timestamp,
+            value=value) for timestamp, value in timestamp_values]
+    return result
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -28,11 +28,25 @@ else:
 from tests.libraries.configuration import UnittestConfig
 from pattoo_shared import data
 from pattoo.db.table import language
+from pattoo import db
 
 
 class TestBasicFunctions(unittest.TestCase):
     """Checks all functions and methods."""
 
+    def test_reconnect(self):
+        """Testing method / function reconnect."""
+        # Initialize key variables
+        previous = db.POOL.session_factory.kw['bind']
+
+        # Test. Sessions must use a new engine with the same URL.
+        db.reconnect()
+        result = db.POOL.session_factory.kw['bind']
+        self.assertIsNot(result, previous)
+        self.assertEqual(str(result.url), str(previous.url))
+        self.assertEqual(db.POOL().get_bind(), result)
+        db.POOL.remove()
+
     def test_main(self):
         """Testing method / function main."""
         #
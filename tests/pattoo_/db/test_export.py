@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Test pattoo export."""
+
+import os
+import unittest
+import sys
+import io
+import gzip
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+                EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}db'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from pattoo.constants import IDXTimestampValue
+from tests.libraries.configuration import UnittestConfig
+from pattoo.db import export
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_frames(self):
+        """Testing method / function frames."""
+        # Initialize key variables
+        rows = _rows(1, [(0, 5), (60000, 6.5), (120000, 7)])
+        rows.extend(_rows(2, [(0, -1)]))
+
+        # Test
+        result = list(export.frames(rows, chunk_size=2))
+        self.assertEqual(len(result), 4)
+        self.assertEqual(result[0], b'PTEX\x01\x00\x00\x00')
+
+        # Frames are split by DataPoint and chunk_size
+        self.assertEqual(
+            result[1][:12], b'\x01' + b'\x00' * 7 + b'\x02\x00\x00\x00')
+        self.assertEqual(len(result[1]), 12 + 2 * 16)
+        self.assertEqual(len(result[2]), 12 + 16)
+        self.assertEqual(len(result[3]), 12 + 16)
+
+        # Nothing to export
+        self.assertEqual(list(export.frames([])), [result[0]])
+
+    def test_encode(self):
+        """Testing method / function encode."""
+        # Initialize key variables
+        blocks = [b'PTEX', b'\x01\x00\x00\x00']
+
+        # Test
+        self.assertEqual(list(export.encode(blocks)), blocks)
+        result = b''.join(export.encode(blocks, compression='gzip'))
+        self.assertEqual(gzip.decompress(result), b''.join(blocks))
+
+    def test_read(self):
+        """Testing method / function read."""
+        # Initialize key variables
+        rows = _rows(1, [(0, 5), (60000, 6.5), (120000, 7)])
+        rows.extend(_rows(2, [(0, -1)]))
+
+        # Test round trip with and without compression
+        for compression in [None] + export.COMPRESSIONS:
+            content = b''.join(export.encode(
+                export.frames(rows, chunk_size=2), compression=compression))
+            result = list(export.read(
+                io.BytesIO(content), compression=compression))
+            self.assertEqual(len(result), 3)
+            self.assertEqual([_[0] for _ in result], [1, 1, 2])
+            self.assertEqual(result[0][1].tolist(), [0, 60000])
+            self.assertEqual(result[0][2].tolist(), [5, 6.5])
+            self.assertEqual(result[1][1].tolist(), [120000])
+            self.assertEqual(result[2][2].tolist(), [-1])
+
+        # Invalid exports
+        content = b''.join(export.frames(rows))
+        with self.assertRaises(ValueError):
+            list(export.read(io.BytesIO(b'PTEX\x02\x00\x00\x00')))
+        with self.assertRaises(ValueError):
+            list(export.read(io.BytesIO(content[:-1])))
+
+
+def _rows(idx_datapoint, timestamp_values):
+    """Create a list of IDXTimestampValue objects.
+
+    Args:
+        idx_datapoint: DataPoint index
+        timestamp_values: List of (timestamp, value) tuples
+
+    Returns:
+        result: List of IDXTimestampValue objects
+
+    """
+    result = [
+        IDXTimestampValue(
+            idx_datapoint=idx_datapoint,
+            polling_interval=60000,
+            timestamp=timestamp,
+            value=value) for timestamp, value in timestamp_values]
+    return result
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
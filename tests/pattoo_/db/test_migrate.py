@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Test pattoo migrate module."""
+
+import os
+import unittest
+import sys
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+                EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}db'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from tests.libraries.configuration import UnittestConfig
+from pattoo.db import db, migrate
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_value_type(self):
+        """Testing method / function value_type."""
+        # The unittest database uses the default type
+        with db.db_query(20225) as session:
+            result = migrate.value_type(session)
+        self.assertEqual(result, 'numeric')
+
+    def test_data(self):
+        """Testing method / function data."""
+        # Nothing must be copied if the type is already correct
+        self.assertEqual(migrate.data('numeric'), 0)
+
+    def test_rollups(self):
+        """Testing method / function rollups."""
+        # Nothing must be converted if the type is already correct
+        self.assertFalse(migrate.rollups('numeric'))
+
+    def test__exists(self):
+        """Testing method / function _exists."""
+        # Test
+        with db.db_query(20245) as session:
+            found = migrate._exists(session, 'pt_data')
+            missing = migrate._exists(session, 'pt_data_old')
+        self.assertTrue(found)
+        self.assertFalse(missing)
+
+    def test__foreign_key(self):
+        """Testing method / function _foreign_key."""
+        # Test
+        with db.db_query(20246) as session:
+            found = migrate._foreign_key(session, 'pt_data_rollup')
+            missing = migrate._foreign_key(session, 'pt_agent')
+        self.assertTrue(found)
+        self.assertFalse(missing)
+
+    def test__resume(self):
+        """Testing method / function _resume."""
+        # Test
+        result = migrate._resume('pt_data', 'pt_data_old')
+        self.assertTrue('ADD FOREIGN KEY' in result)
+        self.assertTrue('drop table pt_data_old' in result)
+
+    def test__keyset(self):
+        """Testing method / function _keyset."""
+        # All rows
+        self.assertEqual(migrate._keyset(None), ('1 = 1', {}))
+
+        # Rows after a key
+        (condition, parameters) = migrate._keyset((3, 1000))
+        self.assertTrue(':start_idx' in condition)
+        self.assertTrue(':start_ts' in condition)
+        self.assertEqual(parameters, {'start_idx': 3, 'start_ts': 1000})
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -27,12 +27,85 @@ from pattoo_shared import data
 from pattoo_shared.constants import DATA_FLOAT, PattooDBrecord
 from tests.libraries.configuration import UnittestConfig
 from pattoo.db.table import datapoint, glue, pair
-from pattoo.db import misc
+from pattoo.db import misc, db
+from pattoo.db.models import DataPoint
 from pattoo.ingest import get
 from pattoo.constants import ChecksumLookup
 from pattoo.db.table import agent
 
 
+class TestChecksumIndex(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_checksums(self):
+        """Testing method / function checksums."""
+        # Initialize key variables
+        polling_interval = 1
+        agent_id = data.hashstring(str(random()))
+        idx_agent = agent.idx_agent(agent_id, 'panda_bear', 'koala_bear')
+        index = misc.ChecksumIndex(maxsize=2)
+
+        # Unknown agents have no checksums
+        checksum = data.hashstring(str(random()))
+        result = index.checksums(agent_id, [checksum])
+        self.assertEqual(result, {})
+
+        # New checksums are found when they are looked up
+        datapoint.insert_row(
+            checksum, DATA_FLOAT, polling_interval, idx_agent)
+        idx_datapoint = datapoint.checksum_exists(checksum)
+        result = index.checksums(agent_id, [checksum])
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[checksum].idx_datapoint, idx_datapoint)
+
+        # Cached last_timestamp values are retained
+        result[checksum] = result[checksum]._replace(last_timestamp=5)
+        result = index.checksums(agent_id, [checksum])
+        self.assertEqual(result[checksum].last_timestamp, 5)
+
+        # Test clear
+        index.clear(agent_id)
+        result = index.checksums(agent_id)
+        self.assertEqual(result[checksum].last_timestamp, 1)
+
+    def test_ttl(self):
+        """Testing method / function checksums with expired entries."""
+        # Initialize key variables
+        polling_interval = 1
+        agent_id = data.hashstring(str(random()))
+        idx_agent = agent.idx_agent(agent_id, 'panda_bear', 'koala_bear')
+        checksum = data.hashstring(str(random()))
+        datapoint.insert_row(
+            checksum, DATA_FLOAT, polling_interval, idx_agent)
+        index = misc.ChecksumIndex(ttl=600)
+
+        # Cached values are used until the entry is older than the TTL
+        result = index.checksums(agent_id, [checksum])
+        self.assertEqual(result[checksum].polling_interval, polling_interval)
+        idx_datapoint = result[checksum].idx_datapoint
+        with db.db_modify(20233) as session:
+            session.query(DataPoint).filter(
+                DataPoint.idx_datapoint == idx_datapoint).update(
+                    {'polling_interval': 5})
+        result = index.checksums(agent_id, [checksum])
+        self.assertEqual(result[checksum].polling_interval, polling_interval)
+
+        # Test
+        index._ttl = 0
+        result = index.checksums(agent_id, [checksum])
+        self.assertEqual(result[checksum].polling_interval, 5)
+
+    def test_clear(self):
+        """Testing method / function clear."""
+        # Test
+        index = misc.ChecksumIndex()
+        index.clear()
+
+
 class TestBasicFunctions(unittest.TestCase):
     """Checks all functions and methods."""
 
@@ -145,6 +218,51 @@ class TestBasicFunctions(unittest.TestCase):
                 value.last_timestamp,
                 expected[key].last_timestamp)
 
+    def test_idx_datapoints(self):
+        """Testing method / function idx_datapoints."""
+        # Initialize key variables
+        records = []
+        agent_id = data.hashstring(str(random()))
+        polled_target = data.hashstring(str(random()))
+        program = 'koala_bear'
+
+        # Create records for two different datapoints
+        for data_index in range(0, 4):
+            checksum = data.hashstring(str(random()))
+            records.append(PattooDBrecord(
+                pattoo_checksum=checksum,
+                pattoo_key=data.hashstring(str(random())),
+                pattoo_agent_polling_interval=1,
+                pattoo_agent_id=agent_id,
+                pattoo_timestamp=int(time.time() * 1000),
+                pattoo_data_type=DATA_FLOAT,
+                pattoo_value=(data_index * 10),
+                pattoo_agent_polled_target=polled_target,
+                pattoo_agent_program=program,
+                pattoo_agent_hostname='grizzly_bear',
+                pattoo_metadata=[('metadata', str(data_index))]))
+
+        # Test
+        pairs = {
+            _.pattoo_checksum: get.key_value_pairs(_) for _ in records}
+        result = misc.idx_datapoints(records, pairs)
+        self.assertEqual(len(result), len(records))
+        idx_agent = agent.exists(agent_id, polled_target)
+        self.assertTrue(bool(idx_agent))
+        for record in records:
+            idx_datapoint = datapoint.checksum_exists(record.pattoo_checksum)
+            self.assertEqual(result[record.pattoo_checksum], idx_datapoint)
+            _dp = datapoint.DataPoint(idx_datapoint)
+            self.assertEqual(_dp.idx_agent(), idx_agent)
+
+            # Verify the Glue table
+            pairs = get.key_value_pairs(record)
+            self.assertEqual(
+                glue.idx_pairs(idx_datapoint), pair.idx_pairs(pairs))
+
+        # Repeated calls must return the same values
+        self.assertEqual(misc.idx_datapoints(records, pairs), result)
+
 
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Test pattoo partition module."""
+
+import os
+import unittest
+import sys
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+                EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}db'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from tests.libraries.configuration import UnittestConfig
+from pattoo.db import partition
+
+# 2020-01-01 00:00:00 UTC in milliseconds
+_EPOCH = 1577836800000
+_DAY = 86400000
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_name(self):
+        """Testing method / function name."""
+        # Test
+        self.assertEqual(partition.name(_EPOCH), 'p20200101')
+        self.assertEqual(partition.name(_EPOCH + _DAY - 1), 'p20200101')
+        self.assertEqual(partition.name(_EPOCH + _DAY), 'p20200102')
+
+    def test_future(self):
+        """Testing method / function future."""
+        # Partitions must cover the current one plus those ahead
+        now = _EPOCH + 1000
+        result = partition.future(_EPOCH, 1, now, ahead=2)
+        self.assertEqual(result, [
+            ('p20200101', _EPOCH + _DAY),
+            ('p20200102', _EPOCH + 2 * _DAY),
+            ('p20200103', _EPOCH + 3 * _DAY)])
+
+        # Nothing to create
+        self.assertEqual(
+            partition.future(_EPOCH + 3 * _DAY, 1, now, ahead=2), [])
+
+        # Weekly partitions
+        result = partition.future(_EPOCH, 7, now, ahead=0)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0][1] % (7 * _DAY), 0)
+
+    def test_expired(self):
+        """Testing method / function expired."""
+        # Initialize key variables
+        partitions = [
+            ('p0', _EPOCH),
+            ('p20200101', _EPOCH + _DAY),
+            ('p20200102', _EPOCH + 2 * _DAY),
+            ('pmax', None)]
+
+        # Test
+        self.assertEqual(
+            partition.expired(partitions, _EPOCH + _DAY), ['p0', 'p20200101'])
+        self.assertEqual(partition.expired(partitions, _EPOCH - 1), [])
+
+    def test__clause(self):
+        """Testing method / function _clause."""
+        # Test
+        result = partition._clause([('p0', 10), ('p1', 20)])
+        self.assertEqual(result, '''\
+PARTITION p0 VALUES LESS THAN (10), PARTITION p1 VALUES LESS THAN (20), \
+PARTITION pmax VALUES LESS THAN MAXVALUE''')
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -23,7 +23,10 @@ else:
     sys.exit(2)
 
 
+from sqlalchemy.dialects import mysql
 from tests.libraries.configuration import UnittestConfig
+from pattoo.db.models import Data, DataPoint, Glue
+from pattoo.db import schemas
 
 
 class TestBasicFunctions(unittest.TestCase):
@@ -33,6 +36,109 @@ class TestBasicFunctions(unittest.TestCase):
         """Dummy test."""
         pass
 
+    def test__size(self):
+        """Testing method / function _size."""
+        # Test
+        self.assertEqual(schemas._size(10, 'first', 100), 10)
+        self.assertEqual(schemas._size(1000, 'first', 100), 100)
+        self.assertEqual(schemas._size(0, 'first', 100), 0)
+        self.assertIsNone(schemas._size(None, 'first', 100))
+        self.assertEqual(schemas._size(1000, 'first', None), 1000)
+        with self.assertRaises(ValueError):
+            schemas._size(-1, 'last', 100)
+
+    def test__orders(self):
+        """Testing method / function _orders."""
+        # Sort by primary key by default
+        result = schemas._orders(Data)
+        self.assertEqual(
+            [(_.key, ascending) for _, ascending in result],
+            [('idx_datapoint', True), ('timestamp', True)])
+
+        # The primary key follows the sort_by columns
+        result = schemas._orders(Data, ['timestamp desc', 'value'])
+        self.assertEqual(
+            [(_.key, ascending) for _, ascending in result],
+            [('timestamp', False), ('value', True), ('idx_datapoint', True)])
+
+    def test__keyset(self):
+        """Testing method / function _keyset."""
+        # Initialize key variables
+        orders = schemas._orders(Data, ['timestamp desc'])
+
+        # Test
+        result = _sql(schemas._keyset(orders, [5, 1]))
+        self.assertEqual(result, (
+            'pt_data.timestamp < 5 OR '
+            'pt_data.timestamp = 5 AND pt_data.idx_datapoint > 1'))
+        result = _sql(schemas._keyset(orders, [5, 1], forward=False))
+        self.assertEqual(result, (
+            'pt_data.timestamp > 5 OR '
+            'pt_data.timestamp = 5 AND pt_data.idx_datapoint < 1'))
+
+        # NULL values sort before all other values
+        orders = schemas._orders(DataPoint, ['enabled'])
+        result = _sql(schemas._keyset(orders, [None, 1]))
+        self.assertEqual(result, (
+            'pt_datapoint.enabled IS NOT NULL OR '
+            'pt_datapoint.enabled IS NULL AND '
+            'pt_datapoint.idx_datapoint > 1'))
+        result = _sql(schemas._keyset(orders, [None, 1], forward=False))
+        self.assertEqual(result, (
+            'pt_datapoint.enabled IS NULL AND '
+            'pt_datapoint.idx_datapoint < 1'))
+        result = _sql(schemas._keyset(orders, [1, 1], forward=False))
+        self.assertEqual(result, (
+            'pt_datapoint.enabled < 1 OR pt_datapoint.enabled IS NULL OR '
+            'pt_datapoint.enabled = 1 AND pt_datapoint.idx_datapoint < 1'))
+
+    def test__criteria(self):
+        """Testing method / function _criteria."""
+        # Initialize key variables
+        orders = schemas._orders(Data, ['timestamp desc'])
+
+        # Test
+        result = [_sql(_) for _ in schemas._criteria(orders)]
+        self.assertEqual(
+            result, ['pt_data.timestamp DESC', 'pt_data.idx_datapoint ASC'])
+        result = [_sql(_) for _ in schemas._criteria(orders, reverse=True)]
+        self.assertEqual(
+            result, ['pt_data.timestamp ASC', 'pt_data.idx_datapoint DESC'])
+
+    def test__cursor(self):
+        """Testing method / function _cursor."""
+        # Initialize key variables
+        row = Glue(idx_pair=3, idx_datapoint=4)
+
+        # Test
+        cursor = schemas._cursor(Glue, row)
+        self.assertEqual(
+            schemas._key(Glue, cursor),
+            [getattr(row, _) for _ in schemas._primary_key(Glue)])
+
+        # Invalid cursors
+        for cursor in [
+                'bad', schemas.base64('keyset:[1]'),
+                schemas.base64('keyset:["1", 2]'),
+                schemas.base64('arrayconnection:1')]:
+            with self.assertRaises(ValueError):
+                schemas._key(Glue, cursor)
+
+
+def _sql(expression):
+    """Compile a SQLAlchemy expression.
+
+    Args:
+        expression: SQLAlchemy expression
+
+    Returns:
+        result: SQL string
+
+    """
+    result = str(expression.compile(
+        dialect=mysql.dialect(), compile_kwargs={'literal_binds': True}))
+    return result
+
 
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
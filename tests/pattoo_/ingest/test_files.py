@@ -6,6 +6,9 @@ import unittest
 import sys
 import json
 import socket
+import time
+import tempfile
+import shutil
 from random import random, uniform
 
 # Try to create a working PYTHONPATH
@@ -27,12 +30,13 @@ else:
 from pattoo_shared import converter, files, data, times
 from pattoo_shared.variables import (
     DataPoint, TargetDataPoints, AgentPolledData)
-from pattoo_shared.constants import DATA_INT
+from pattoo_shared.constants import DATA_INT, PattooDBrecord
 from pattoo_shared.configuration import ServerConfig
 from pattoo.constants import PATTOO_API_AGENT_NAME, PATTOO_INGESTER_NAME
 from pattoo.db.table import datapoint
 from pattoo.ingest.files import Cache
 from pattoo.ingest import files as files_test
+from pattoo import spool
 
 from tests.libraries.configuration import UnittestConfig
 
@@ -48,6 +52,102 @@ class TestCache(unittest.TestCase):
         """Testing method / function __init__."""
         pass
 
+    def test_stream(self):
+        """Testing method / function stream."""
+        # Initialize key variables
+        config = ServerConfig()
+        cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        expected = [
+            create_cache(cache_filename='cache_test_1.json'),
+            create_cache(cache_filename='cache_test_2.json')]
+        filepaths = [
+            '{}{}cache_test_{}.json'.format(cache_directory, os.sep, _)
+            for _ in [1, 2]]
+
+        # Records must be yielded one file at a time
+        cache = Cache()
+        result = list(cache.stream(budget=1))
+        self.assertEqual(len(result), 2)
+        for index, (all_records, _filepaths) in enumerate(result):
+            self.assertEqual(_filepaths, [filepaths[index]])
+            self.assertEqual(len(all_records), 1)
+            self.assertEqual(len(all_records[0]), 1)
+            self.assertEqual(
+                all_records[0][0].pattoo_key, expected[index]['pattoo_key'])
+
+        # Everything must be yielded at once without a budget
+        result = list(cache.stream())
+        self.assertEqual(len(result), 1)
+        all_records, _filepaths = result[0]
+        self.assertEqual(_filepaths, filepaths)
+        self.assertEqual(len(all_records), 2)
+
+        # Purge cache to make sure there are no extraneous files
+        cache.purge()
+
+    def test_stream_corrupt(self):
+        """Testing method / function stream with corrupt files."""
+        # Initialize key variables
+        config = ServerConfig()
+        cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        expected = create_cache(cache_filename='cache_test.json')
+
+        # Create a corrupt file that is read first
+        corrupt = '{}{}aaaa_corrupt.json'.format(cache_directory, os.sep)
+        with open(corrupt, 'w') as _fp:
+            _fp.write('{"pattoo_key": ')
+
+        # The corrupt file must be quarantined
+        cache = Cache(batch_size=1)
+        result = list(cache.stream())
+        self.assertEqual(result, [])
+        self.assertFalse(os.path.exists(corrupt))
+        quarantined = os.path.join(
+            cache_directory, files_test.QUARANTINE, 'aaaa_corrupt.json')
+        self.assertTrue(os.path.isfile(quarantined))
+
+        # Later files must still be read
+        cache = Cache(batch_size=1)
+        result = cache.records()
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0][0].pattoo_key, expected['pattoo_key'])
+
+        # Purge cache to make sure there are no extraneous files
+        cache.purge()
+        os.remove(quarantined)
+
+    def test_stream_segments(self):
+        """Testing method / function stream with spool segments."""
+        # Initialize key variables
+        config = ServerConfig()
+        cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        expected = [
+            create_cache(), create_cache(cache_filename='cache_2.json')]
+
+        # Move the cached postings into a single spool segment
+        writer = spool.Writer(cache_directory)
+        for filename in ['cache_test.json', 'cache_2.json']:
+            filepath = '{}{}{}'.format(cache_directory, os.sep, filename)
+            with open(filepath, 'r') as _fp:
+                writer.append(json.load(_fp))
+            os.remove(filepath)
+        writer.close()
+
+        # Test
+        cache = Cache()
+        result = list(cache.stream(budget=1))
+        self.assertEqual(len(result), 1)
+        all_records, _filepaths = result[0]
+        self.assertEqual(len(_filepaths), 1)
+        self.assertTrue(_filepaths[0].endswith(spool.SUFFIX))
+        self.assertEqual(
+            sorted([_[0].pattoo_key for _ in all_records]),
+            sorted([_['pattoo_key'] for _ in expected]))
+
+        # Purge cache to make sure there are no extraneous files
+        cache.purge()
+        self.assertFalse(os.path.exists(_filepaths[0]))
+
     def test_records(self):
         """Testing method / function records."""
         # Initialize key variables
@@ -200,6 +300,103 @@ class TestBasicFunctions(unittest.TestCase):
             key_pair['timestamp'], times.normalized_timestamp(_pi, timestamp))
         self.assertEqual(key_pair['value'], value)
 
+    def test_filepaths(self):
+        """Testing method / function filepaths."""
+        # Initialize key variables
+        config = ServerConfig()
+        cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        _ = create_cache(cache_filename='cache_test_2.json')
+        _ = create_cache(cache_filename='cache_test_1.json')
+
+        # Test
+        result = files_test.filepaths(cache_directory)
+        self.assertEqual(result, [
+            '{}{}cache_test_{}.json'.format(cache_directory, os.sep, _)
+            for _ in [1, 2]])
+        result = files_test.filepaths(cache_directory, count=1)
+        self.assertEqual(len(result), 1)
+        result = files_test.filepaths(cache_directory, age=3600)
+        self.assertEqual(result, [])
+
+        # Purge cache to make sure there are no extraneous files
+        Cache().purge()
+
+    def test_filepaths_segments(self):
+        """Testing method / function filepaths with spool segments."""
+        # Initialize key variables
+        directory = tempfile.mkdtemp()
+        first = spool.Writer(directory)
+        second = spool.Writer(directory)
+
+        # The segments of two API processes interleave. The first one is
+        # opened before the second but has the newest data.
+        first.append({'pattoo_agent_timestamp': 3000}, timestamp=3000)
+        time.sleep(0.01)
+        second.append({'pattoo_agent_timestamp': 1000}, timestamp=1000)
+        second.append({'pattoo_agent_timestamp': 2000}, timestamp=2000)
+        first.append({'pattoo_agent_timestamp': 4000}, timestamp=4000)
+        first.close()
+        second.close()
+
+        # Test
+        result = files_test.filepaths(directory)
+        self.assertEqual(len(result), 2)
+        timestamps = [
+            _['pattoo_agent_timestamp']
+            for filepath in result for _ in spool.records(filepath)]
+        self.assertEqual(timestamps, [1000, 2000, 3000, 4000])
+        shutil.rmtree(directory)
+
+    def test_sweep(self):
+        """Testing method / function sweep."""
+        # Initialize key variables
+        directory = tempfile.mkdtemp()
+        filepaths = [
+            os.path.join(directory, _) for _ in [
+                '.old.json.tmp', '.new.json.tmp', 'old.json']]
+        for filepath in filepaths:
+            with open(filepath, 'w') as _fp:
+                _fp.write('{}')
+        for filepath in [filepaths[0], filepaths[2]]:
+            os.utime(filepath, (time.time() - 7200, time.time() - 7200))
+
+        # Only old temporary files must be deleted
+        self.assertEqual(files_test.sweep(directory), 1)
+        self.assertEqual(
+            sorted(os.listdir(directory)), ['.new.json.tmp', 'old.json'])
+        self.assertEqual(files_test.sweep(directory, age=0), 1)
+        self.assertEqual(os.listdir(directory), ['old.json'])
+        shutil.rmtree(directory)
+
+    def test__aggregate(self):
+        """Testing method / function _aggregate."""
+        # Initialize key variables
+        records = [
+            PattooDBrecord(
+                pattoo_checksum='checksum',
+                pattoo_key='key',
+                pattoo_agent_id=agent_id,
+                pattoo_agent_polling_interval=1000,
+                pattoo_timestamp=timestamp,
+                pattoo_data_type=DATA_INT,
+                pattoo_value=timestamp,
+                pattoo_agent_polled_target='pattoo_agent_polled_target',
+                pattoo_agent_program='pattoo_agent_program',
+                pattoo_agent_hostname='pattoo_agent_hostname',
+                pattoo_metadata=[])
+            for agent_id, timestamp in [
+                ('b', 3000), ('b', 1000), ('a', 2000), ('b', 2000)]]
+        _cache = {
+            'b': [_ for _ in records if _.pattoo_agent_id == 'b'],
+            'a': [_ for _ in records if _.pattoo_agent_id == 'a']}
+
+        # Test
+        result = files_test._aggregate(_cache)
+        self.assertEqual(
+            [[(_.pattoo_agent_id, _.pattoo_timestamp) for _ in item]
+             for item in result],
+            [[('a', 2000)], [('b', 1000), ('b', 2000), ('b', 3000)]])
+
     def test__lock(self):
         """Testing method / function _lock."""
         # Initialize key variables
@@ -229,7 +426,7 @@ class TestBasicFunctions(unittest.TestCase):
         self.assertTrue(result)
 
 
-def create_cache():
+def create_cache(cache_filename='cache_test.json'):
     """Testing method / function records."""
     # Initialize key variables
     config = ServerConfig()
@@ -271,7 +468,7 @@ def create_cache():
     apd.add(ddv)
     cache_dict = converter.posting_data_points(
         converter.agentdata_to_post(apd))
-    cache_file = '{}{}cache_test.json'.format(cache_directory, os.sep)
+    cache_file = '{}{}{}'.format(cache_directory, os.sep, cache_filename)
     with open(cache_file, 'w') as _fp:
         json.dump(cache_dict, _fp)
 
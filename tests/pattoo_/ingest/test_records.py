@@ -44,6 +44,53 @@ class TestExceptionWrapper(unittest.TestCase):
         pass
 
 
+class TestWorkerPool(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_starmap(self):
+        """Testing method / function starmap."""
+        # Initialize key variables
+        items = make_records()
+        records = items['records']
+        expected = get.key_value_pairs(records)
+        pool = ingest_data.WorkerPool(processes=2, maxtasksperchild=1)
+
+        # The same pool must be reusable across batches
+        for _ in range(0, 3):
+            results = pool.starmap(
+                ingest_data._process_kvps_exception, [(records,), (records,)])
+            self.assertEqual(results, [expected, expected])
+        pool.close()
+
+    def test_recycle(self):
+        """Testing method / function recycle."""
+        # Initialize key variables
+        items = make_records()
+        records = items['records']
+        expected = get.key_value_pairs(records)
+        pool = ingest_data.WorkerPool(processes=1)
+
+        # The pool must be usable after recycling
+        pool.recycle()
+        results = pool.starmap(
+            ingest_data._process_kvps_exception, [(records,)])
+        pool.recycle()
+        results = pool.starmap(
+            ingest_data._process_kvps_exception, [(records,)])
+        self.assertEqual(results, [expected])
+        pool.close()
+
+    def test_close(self):
+        """Testing method / function close."""
+        # Closing an unused pool must not fail
+        pool = ingest_data.WorkerPool()
+        pool.close()
+
+
 class TestRecords(unittest.TestCase):
     """Checks all functions and methods."""
 
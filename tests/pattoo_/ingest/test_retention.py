@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Test pattoo data retention."""
+
+import os
+import unittest
+import sys
+import threading
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+                EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}ingest'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from pattoo_shared.constants import DATA_FLOAT, DATA_INT
+from pattoo.ingest import retention
+from tests.libraries.configuration import UnittestConfig
+
+
+class TestPolicy(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_enabled(self):
+        """Testing method / function enabled."""
+        # Test
+        policy = retention.Policy(
+            {'default': 0, 'data_types': {}, 'agent_programs': {}})
+        self.assertFalse(policy.enabled())
+        policy = retention.Policy(
+            {'default': 0, 'data_types': {DATA_INT: 0},
+             'agent_programs': {'program': 5}})
+        self.assertTrue(policy.enabled())
+        policy = retention.Policy({'default': 7})
+        self.assertTrue(policy.enabled())
+
+    def test_longest(self):
+        """Testing method / function longest."""
+        # Test
+        policy = retention.Policy(
+            {'default': 365, 'data_types': {DATA_INT: 30},
+             'agent_programs': {'program': 500}})
+        self.assertEqual(policy.longest(), 500)
+
+        # Some data never expires
+        policy = retention.Policy(
+            {'default': 365, 'data_types': {DATA_INT: 0},
+             'agent_programs': {}})
+        self.assertEqual(policy.longest(), 0)
+        policy = retention.Policy(
+            {'default': 0, 'data_types': {DATA_INT: 30},
+             'agent_programs': {}})
+        self.assertEqual(policy.longest(), 0)
+
+    def test_days(self):
+        """Testing method / function days."""
+        # Initialize key variables
+        policy = retention.Policy(
+            {'default': 365, 'data_types': {DATA_INT: 30, DATA_FLOAT: 0},
+             'agent_programs': {'program': 5}})
+
+        # Agent programs take precedence over data types
+        self.assertEqual(policy.days(DATA_INT, 'program'), 5)
+        self.assertEqual(policy.days(DATA_INT, 'other'), 30)
+        self.assertEqual(policy.days(DATA_FLOAT, 'other'), 0)
+        self.assertEqual(policy.days(None, 'other'), 365)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_purge(self):
+        """Testing method / function purge."""
+        # Nothing expires with the default configuration
+        self.assertEqual(retention.purge(), 0)
+
+    def test_purge_continuously(self):
+        """Testing method / function purge_continuously."""
+        # Must return after one purge once stopped
+        stop = threading.Event()
+        stop.set()
+        retention.purge_continuously(3600, stop=stop)
+
+    def test_start(self):
+        """Testing method / function start."""
+        # Test
+        stop = retention.start(3600)
+        self.assertFalse(stop.is_set())
+        stop.set()
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Test pattoo continuous ingestion."""
+
+import os
+import unittest
+import sys
+import time
+import tempfile
+import shutil
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+                EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}ingest'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from pattoo.ingest import watch
+from tests.libraries.configuration import UnittestConfig
+
+
+class TestWatcher(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def setUp(self):
+        """Create a temporary directory."""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Delete the temporary directory."""
+        shutil.rmtree(self.directory)
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_changes(self):
+        """Testing method / function changes."""
+        # Test
+        watcher = watch.Watcher(self.directory, poll_interval=0.01)
+        self.assertEqual(watcher.changes(0.01), 0)
+
+        # Only completely written files of interest must be counted
+        _create(self.directory, 'a.json')
+        _create(self.directory, 'b.txt')
+        self.assertEqual(watcher.changes(1), 1)
+        self.assertEqual(watcher.changes(0.01), 0)
+        watcher.close()
+
+    def test_changes_polling(self):
+        """Testing method / function changes without inotify."""
+        # Files present at startup must not be counted
+        _create(self.directory, 'a.json')
+        watcher = watch.Watcher(self.directory, poll_interval=0.01)
+        watcher.close()
+        watcher._seen = set(watch._names(self.directory))
+        self.assertFalse(watcher.inotify)
+        self.assertEqual(watcher.changes(0.01), 0)
+
+        # Test
+        _create(self.directory, 'b.json')
+        _create(self.directory, 'c.seg')
+        self.assertEqual(watcher.changes(0.01), 2)
+        self.assertEqual(watcher.changes(0.01), 0)
+
+
+class TestStats(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_update(self):
+        """Testing method / function update."""
+        # Test
+        stats = watch.Stats()
+        stats.update(2, 10, 0.5, 0.1)
+        stats.update(1, 5, 1.5, 0.2)
+        self.assertEqual(stats.batches, 2)
+        self.assertEqual(stats.files, 3)
+        self.assertEqual(stats.records, 15)
+        self.assertEqual(stats.latency_max, 1.5)
+
+    def test_summary(self):
+        """Testing method / function summary."""
+        # Test
+        stats = watch.Stats()
+        stats.update(2, 10, 0.5, 0.1)
+        stats.update(1, 5, 1.5, 0.2)
+        result = stats.summary()
+        self.assertEqual(result['records'], 15)
+        self.assertEqual(result['latency_average'], 1)
+        self.assertEqual(result['latency_max'], 1.5)
+        self.assertTrue(result['records_per_second'] > 0)
+
+    def test_reset(self):
+        """Testing method / function reset."""
+        # Test
+        stats = watch.Stats()
+        stats.update(2, 10, 0.5, 0.1)
+        stats.reset()
+        self.assertEqual(stats.summary()['records'], 0)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_process_continuously(self):
+        """Testing method / function process_continuously."""
+        # Nothing should happen without files
+        stop = time.time() + 0.5
+        watch.process_continuously(stop=lambda: time.time() > stop)
+
+
+def _create(directory, filename):
+    """Create a file in a directory.
+
+    Args:
+        directory: Directory
+        filename: Name of file
+
+    Returns:
+        None
+
+    """
+    with open(os.path.join(directory, filename), 'w') as _fp:
+        _fp.write('{}')
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Test the pattoo cache module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from tests.libraries.configuration import UnittestConfig
+from pattoo.cache import LRU, TTL
+
+
+class TestLRU(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test___contains__(self):
+        """Testing method / function __contains__."""
+        # Test
+        cache = LRU(maxsize=2)
+        cache.put('a', 1)
+        self.assertTrue('a' in cache)
+        self.assertFalse('b' in cache)
+
+    def test___len__(self):
+        """Testing method / function __len__."""
+        # Test
+        cache = LRU(maxsize=2)
+        self.assertEqual(len(cache), 0)
+        for value in range(0, 5):
+            cache.put(value, value)
+        self.assertEqual(len(cache), 2)
+
+    def test_get(self):
+        """Testing method / function get."""
+        # Test
+        cache = LRU(maxsize=2)
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('b', default=3), 3)
+
+    def test_put(self):
+        """Testing method / function put."""
+        # Least recently used entries must be evicted
+        cache = LRU(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        _ = cache.get('a')
+        cache.put('c', 3)
+        self.assertTrue('a' in cache)
+        self.assertFalse('b' in cache)
+        self.assertTrue('c' in cache)
+
+        # Updates must replace values
+        cache.put('a', 4)
+        self.assertEqual(cache.get('a'), 4)
+        self.assertEqual(len(cache), 2)
+
+    def test_pop(self):
+        """Testing method / function pop."""
+        # Test
+        cache = LRU()
+        cache.put('a', 1)
+        self.assertEqual(cache.pop('a'), 1)
+        self.assertFalse('a' in cache)
+        self.assertIsNone(cache.pop('a'))
+
+    def test_clear(self):
+        """Testing method / function clear."""
+        # Test
+        cache = LRU()
+        cache.put('a', 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+class TestTTL(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test___contains__(self):
+        """Testing method / function __contains__."""
+        # Test
+        cache = TTL(ttl=60)
+        cache.put('a', 1)
+        self.assertTrue('a' in cache)
+        self.assertFalse('b' in cache)
+
+        # Expired entries must not be found
+        cache = TTL(ttl=0)
+        cache.put('a', 1)
+        self.assertFalse('a' in cache)
+
+    def test_get(self):
+        """Testing method / function get."""
+        # Test
+        cache = TTL(ttl=60)
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('b', default=3), 3)
+
+        # Expired entries must be removed
+        cache = TTL(ttl=0)
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a', default=3), 3)
+        self.assertEqual(len(cache), 0)
+
+    def test_put(self):
+        """Testing method / function put."""
+        # Least recently used entries must be evicted
+        cache = TTL(maxsize=2, ttl=60)
+        for value in range(0, 3):
+            cache.put(value, value)
+        self.assertFalse(0 in cache)
+        self.assertEqual(cache.get(2), 2)
+
+    def test_pop(self):
+        """Testing method / function pop."""
+        # Test
+        cache = TTL(ttl=60)
+        cache.put('a', 1)
+        self.assertEqual(cache.pop('a'), 1)
+        self.assertFalse('a' in cache)
+        self.assertIsNone(cache.pop('a'))
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -21,6 +21,7 @@ else:
 
 from tests.libraries.configuration import UnittestConfig
 from pattoo.configuration import ConfigPattoo, ConfigAgent, ConfigIngester
+from pattoo import configuration
 
 
 class TestConfiguration(unittest.TestCase):
@@ -55,6 +56,104 @@ class TestConfiguration(unittest.TestCase):
         result = self.config.db_max_overflow()
         self.assertEqual(result, expected)
 
+    def test_db_rollups(self):
+        """Testing method db_rollups."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.db_rollups()
+        self.assertEqual(result, expected)
+
+    def test_db_chunk_size(self):
+        """Testing method db_chunk_size."""
+        # Initialize key values
+        expected = 10000
+
+        # Test
+        result = self.config.db_chunk_size()
+        self.assertEqual(result, expected)
+
+    def test_db_partition_days(self):
+        """Testing method db_partition_days."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.db_partition_days()
+        self.assertEqual(result, expected)
+
+    def test_metadata_cache_ttl(self):
+        """Testing method metadata_cache_ttl."""
+        # Initialize key values
+        expected = 10
+
+        # Test
+        result = self.config.metadata_cache_ttl()
+        self.assertEqual(result, expected)
+
+    def test_graphql_page_size(self):
+        """Testing method graphql_page_size."""
+        # Initialize key values
+        expected = 1000
+
+        # Test
+        result = self.config.graphql_page_size()
+        self.assertEqual(result, expected)
+
+        # Results are only unlimited if configured explicitly
+        config = ConfigPattoo()
+        config._server_yaml_configuration = {
+            'pattoo_apid': {'graphql_page_size': 0}}
+        self.assertIsNone(config.graphql_page_size())
+
+    def test_versions_file(self):
+        """Testing method versions_file."""
+        # Initialize key values
+        expected = '{1}{0}pattoo_datapoint_versions.bin'.format(
+            os.sep, self.config.daemon_directory())
+
+        # Test
+        result = self.config.versions_file()
+        self.assertEqual(result, expected)
+
+    def test_response_cache_type(self):
+        """Testing method response_cache_type."""
+        # Test
+        result = self.config.response_cache_type()
+        self.assertEqual(result, 'simple')
+
+    def test_response_cache_directory(self):
+        """Testing method response_cache_directory."""
+        # Initialize key values
+        expected = '{1}{0}pattoo_apid'.format(
+            os.sep, self.config.daemon_directory())
+
+        # Test
+        result = self.config.response_cache_directory()
+        self.assertEqual(result, expected)
+
+    def test_response_cache_servers(self):
+        """Testing method response_cache_servers."""
+        # Test. No servers are required by the default cache type
+        result = self.config.response_cache_servers()
+        self.assertEqual(result, [])
+
+    def test_response_cache_timeout(self):
+        """Testing method response_cache_timeout."""
+        # Test
+        result = self.config.response_cache_timeout()
+        self.assertEqual(result, 300)
+
+    def test_db_value_type(self):
+        """Testing method db_value_type."""
+        # Initialize key values
+        expected = 'numeric'
+
+        # Test
+        result = self.config.db_value_type()
+        self.assertEqual(result, expected)
+
     def test_db_hostname(self):
         """Testing method db_hostname."""
         # Initialize key values
@@ -263,6 +362,33 @@ class TestConfigAgent(unittest.TestCase):
 
         self.assertEqual(result, expected)
 
+    def test_spool_mode(self):
+        """Testing function spool_mode."""
+        # Initialize key values
+        expected = 'files'
+
+        # Test
+        result = self.config.spool_mode()
+        self.assertEqual(result, expected)
+
+    def test_spool_segment_size(self):
+        """Testing function spool_segment_size."""
+        # Initialize key values
+        expected = 4194304
+
+        # Test
+        result = self.config.spool_segment_size()
+        self.assertEqual(result, expected)
+
+    def test_spool_segment_age(self):
+        """Testing function spool_segment_age."""
+        # Initialize key values
+        expected = 10
+
+        # Test
+        result = self.config.spool_segment_age()
+        self.assertEqual(result, expected)
+
 
 class TestConfigIngester(unittest.TestCase):
     """Checks all ConfigIngester methods."""
@@ -303,6 +429,135 @@ class TestConfigIngester(unittest.TestCase):
         result = self.config.batch_size()
         self.assertEqual(result, expected)
 
+    def test_worker_max_tasks(self):
+        """Testing function worker_max_tasks."""
+        # Initialize key values
+        expected = 1000
+
+        # Test
+        result = self.config.worker_max_tasks()
+        self.assertEqual(result, expected)
+
+    def test_checksum_cache_size(self):
+        """Testing function checksum_cache_size."""
+        # Initialize key values
+        expected = 10000
+
+        # Test
+        result = self.config.checksum_cache_size()
+        self.assertEqual(result, expected)
+
+    def test_checksum_cache_ttl(self):
+        """Testing function checksum_cache_ttl."""
+        # Initialize key values
+        expected = 600
+
+        # Test
+        result = self.config.checksum_cache_ttl()
+        self.assertEqual(result, expected)
+
+    def test_bulk_ingest(self):
+        """Testing function bulk_ingest."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.bulk_ingest()
+        self.assertEqual(result, expected)
+
+    def test__boolean(self):
+        """Testing function _boolean."""
+        # Test
+        self.assertTrue(configuration._boolean(True))
+        self.assertTrue(configuration._boolean('True'))
+        self.assertTrue(configuration._boolean(' yes '))
+        self.assertFalse(configuration._boolean('False', default=True))
+        self.assertFalse(configuration._boolean('no', default=True))
+        self.assertFalse(configuration._boolean(0, default=True))
+        self.assertTrue(configuration._boolean(None, default=True))
+        self.assertTrue(configuration._boolean('maybe', default=True))
+
+    def test_bulk_chunk_size(self):
+        """Testing function bulk_chunk_size."""
+        # Initialize key values
+        expected = 1000
+
+        # Test
+        result = self.config.bulk_chunk_size()
+        self.assertEqual(result, expected)
+
+    def test_record_budget(self):
+        """Testing function record_budget."""
+        # Initialize key values
+        expected = 50000
+
+        # Test
+        result = self.config.record_budget()
+        self.assertEqual(result, expected)
+
+    def test_ingester_mode(self):
+        """Testing function ingester_mode."""
+        # Initialize key values
+        expected = 'interval'
+
+        # Test
+        result = self.config.ingester_mode()
+        self.assertEqual(result, expected)
+
+    def test_batch_latency(self):
+        """Testing function batch_latency."""
+        # Initialize key values
+        expected = 1.0
+
+        # Test
+        result = self.config.batch_latency()
+        self.assertEqual(result, expected)
+
+    def test_stats_interval(self):
+        """Testing function stats_interval."""
+        # Initialize key values
+        expected = 60
+
+        # Test
+        result = self.config.stats_interval()
+        self.assertEqual(result, expected)
+
+    def test_retention(self):
+        """Testing function retention."""
+        # Initialize key values
+        expected = {'default': 0, 'data_types': {}, 'agent_programs': {}}
+
+        # Test
+        result = self.config.retention()
+        self.assertEqual(result, expected)
+
+    def test_rollup_retention(self):
+        """Testing function rollup_retention."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.rollup_retention()
+        self.assertEqual(result, expected)
+
+    def test_purge_interval(self):
+        """Testing function purge_interval."""
+        # Initialize key values
+        expected = 3600
+
+        # Test
+        result = self.config.purge_interval()
+        self.assertEqual(result, expected)
+
+    def test_purge_chunk_size(self):
+        """Testing function purge_chunk_size."""
+        # Initialize key values
+        expected = 10000
+
+        # Test
+        result = self.config.purge_chunk_size()
+        self.assertEqual(result, expected)
+
     def test_daemon_directory(self):
         """Test pattoo_shared.Config inherited method daemon_directory."""
         # Nothing should happen. Directory exists in testing.
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Test the pattoo counters module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+
+# PIP3 imports
+import numpy as np
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from pattoo_shared.constants import DATA_COUNT, DATA_COUNT64
+from tests.libraries.configuration import UnittestConfig
+from pattoo import counters
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_deltas(self):
+        """Testing method / function deltas."""
+        # Changes across gaps must be calculated
+        result = counters.deltas(np.array([1, 3, np.nan, 5, 9]))
+        self.assertEqual(result.tolist(), [2, None, 2, 4])
+
+        # 32 bit counters must wrap at 2 ** 32
+        result = counters.deltas(
+            np.array([2 ** 32 - 10, 5]), data_type=DATA_COUNT)
+        self.assertEqual(result.tolist(), [15])
+
+        # 32 bit counters with larger values must wrap at 2 ** 64
+        result = counters.deltas(
+            np.array([3 * 2 ** 62, 2 ** 62]), data_type=DATA_COUNT)
+        self.assertEqual(result.tolist(), [2 ** 63])
+
+        # Small decreases are resets
+        for data_type in [DATA_COUNT, DATA_COUNT64, None]:
+            result = counters.deltas(
+                np.array([1000, 50]), data_type=data_type)
+            self.assertEqual(result.tolist(), [50])
+        result = counters.deltas(
+            np.array([2 ** 32 - 10, 5]), data_type=DATA_COUNT64)
+        self.assertEqual(result.tolist(), [5])
+
+        # Test without enough values
+        self.assertEqual(counters.deltas(np.array([1])).size, 0)
+        result = counters.deltas(np.array([np.nan, 1, np.nan]))
+        self.assertEqual(result.tolist(), [None, None])
+
+    def test_rates(self):
+        """Testing method / function rates."""
+        # Rates across gaps must be averaged over the gap
+        values = np.array([1, 3, np.nan, 5, 2])
+        result = counters.rates(values, 2000, places=1)
+        self.assertEqual(result[0], 1)
+        self.assertTrue(np.isnan(result[1]))
+        self.assertEqual(result[2], 0.5)
+        self.assertEqual(result[3], 1)
+
+        # Wrapped counters must not create spikes
+        values = np.array([2 ** 32 - 1000, 1000])
+        result = counters.rates(values, 1000, data_type=DATA_COUNT)
+        self.assertEqual(result.tolist(), [2000])
+
+        # Test without values
+        result = counters.rates(np.array([]), 1000)
+        self.assertEqual(result.size, 0)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Test the pattoo downsample module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from tests.libraries.configuration import UnittestConfig
+from pattoo import downsample
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_downsample(self):
+        """Testing method / function downsample."""
+        # Initialize key variables
+        points = _points(100)
+
+        # Nothing must happen if there are few enough points
+        self.assertEqual(downsample.downsample(points, 100), points)
+        self.assertEqual(downsample.downsample(points, None), points)
+        self.assertEqual(downsample.downsample(points, -1), points)
+
+        # Test
+        for method in downsample.METHODS + ['unknown']:
+            for count in [1, 2, 3, 10]:
+                result = downsample.downsample(points, count, method=method)
+                self.assertTrue(0 < len(result) <= count)
+        self.assertEqual(
+            downsample.downsample(points, 10, method='unknown'),
+            downsample.lttb(points, 10))
+
+    def test_lttb(self):
+        """Testing method / function lttb."""
+        # Initialize key variables
+        points = _points(100)
+        points[50]['value'] = 1000
+        points[60]['value'] = None
+
+        # Test
+        result = downsample.lttb(points, 10)
+        self.assertEqual(len(result), 10)
+        self.assertEqual(result[0], points[0])
+        self.assertEqual(result[-1], points[-1])
+        self.assertTrue(points[50] in result)
+        self.assertFalse(points[60] in result)
+        timestamps = [_['timestamp'] for _ in result]
+        self.assertEqual(timestamps, sorted(timestamps))
+
+        # Thresholds too small for buckets keep the first and last points
+        self.assertEqual(downsample.lttb(points, 2), [points[0], points[-1]])
+        self.assertEqual(downsample.lttb(points, 1), [points[-1]])
+
+    def test_minmax(self):
+        """Testing method / function minmax."""
+        # Initialize key variables
+        points = _points(100)
+        points[5]['value'] = -1000
+        points[2]['value'] = 1000
+        for index in range(50, 100):
+            points[index]['value'] = None
+
+        # Test
+        result = downsample.minmax(points, 4)
+        self.assertEqual(result, [points[2], points[5], points[50]])
+        self.assertEqual(downsample.minmax(points, 1), [points[2]])
+
+    def test_mean(self):
+        """Testing method / function mean."""
+        # Initialize key variables
+        points = _points(10)
+        for index in range(5, 10):
+            points[index]['value'] = None
+        points[4]['value'] = None
+
+        # Test
+        result = downsample.mean(points, 2)
+        self.assertEqual(result, [
+            {'timestamp': 0, 'value': 1.5},
+            {'timestamp': 5000, 'value': None}])
+
+
+def _points(size):
+    """Create a list of timestamp, value dicts.
+
+    Args:
+        size: Number of points
+
+    Returns:
+        result: List of dicts
+
+    """
+    result = [
+        {'timestamp': _ * 1000, 'value': _ % 7} for _ in range(size)]
+    return result
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
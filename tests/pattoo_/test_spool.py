@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Test the pattoo spool module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from tests.libraries.configuration import UnittestConfig
+from pattoo import spool
+
+
+class TestWriter(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def setUp(self):
+        """Create a temporary spool directory."""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Delete the temporary spool directory."""
+        shutil.rmtree(self.directory)
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_append(self):
+        """Testing method / function append."""
+        # Nothing is available to the ingester until the segment is closed
+        writer = spool.Writer(self.directory, max_size=100, max_age=60)
+        writer.append({'a': 1})
+        self.assertEqual(_segments(self.directory), [])
+        self.assertEqual(len(_segments(self.directory, spool.OPEN_SUFFIX)), 1)
+
+        # Segments must be rotated when full
+        large = {'b': 'x' * 100}
+        writer.append(large)
+        writer.append({'c': 3})
+        segments = _segments(self.directory)
+        self.assertEqual(len(segments), 1)
+        self.assertEqual(
+            list(spool.records(segments[0])), [{'a': 1}, large])
+
+        # Closing publishes the remainder
+        writer.close()
+        segments = _segments(self.directory)
+        self.assertEqual(len(segments), 2)
+        self.assertEqual(list(spool.records(segments[1])), [{'c': 3}])
+        self.assertEqual(_segments(self.directory, spool.OPEN_SUFFIX), [])
+
+    def test_close(self):
+        """Testing method / function close."""
+        # Closing without data must do nothing
+        writer = spool.Writer(self.directory)
+        writer.close()
+        self.assertEqual(_segments(self.directory), [])
+
+        # Test
+        writer.append({'a': 1})
+        writer.close()
+        segments = _segments(self.directory)
+        self.assertEqual(len(segments), 1)
+        self.assertEqual(list(spool.records(segments[0])), [{'a': 1}])
+
+        # Segments are named after their oldest timestamp
+        writer.append({'b': 2}, timestamp=2000)
+        writer.append({'c': 3}, timestamp=1000)
+        writer.close()
+        segments = _segments(self.directory)
+        self.assertEqual(len(segments), 2)
+        self.assertTrue(os.path.basename(segments[0]).startswith('1000_'))
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def setUp(self):
+        """Create a temporary spool directory."""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Delete the temporary spool directory."""
+        shutil.rmtree(self.directory)
+
+    def test_writer(self):
+        """Testing method / function writer."""
+        # The same writer must be used by the process
+        result = spool.writer(self.directory)
+        self.assertTrue(isinstance(result, spool.Writer))
+        self.assertTrue(spool.writer(self.directory) is result)
+
+    def test_records(self):
+        """Testing method / function records."""
+        # Initialize key variables
+        expected = [{'a': 1}, {'b': [1, 2]}]
+        writer = spool.Writer(self.directory)
+        for item in expected:
+            writer.append(item)
+        writer.close()
+        filepath = _segments(self.directory)[0]
+
+        # Test
+        self.assertEqual(list(spool.records(filepath)), expected)
+
+        # Truncated records must be ignored
+        with open(filepath, 'ab') as _fp:
+            _fp.write(b'\xff\x00\x00\x00{')
+        self.assertEqual(list(spool.records(filepath)), expected)
+
+        # Files without a valid header must be ignored
+        with open(filepath, 'r+b') as _fp:
+            _fp.write(b'XXXX')
+        self.assertEqual(list(spool.records(filepath)), [])
+        with open(filepath, 'wb') as _fp:
+            _fp.write(b'')
+        self.assertEqual(list(spool.records(filepath)), [])
+
+    def test_recover(self):
+        """Testing method / function recover."""
+        # Segments of running processes must not be touched
+        writer = spool.Writer(self.directory)
+        writer.append({'a': 1})
+        spool.recover(self.directory)
+        self.assertEqual(_segments(self.directory), [])
+
+        # Segments of dead processes must be closed
+        writer.append({'pattoo_agent_timestamp': 1000})
+        writer.close()
+        filepath = _segments(self.directory)[0]
+        os.rename(filepath, os.path.join(
+            self.directory,
+            '5000_999999999_000001{}'.format(spool.OPEN_SUFFIX)))
+        self.assertEqual(_segments(self.directory), [])
+        spool.recover(self.directory)
+        segments = _segments(self.directory)
+        self.assertEqual(len(segments), 1)
+        self.assertEqual(
+            list(spool.records(segments[0])),
+            [{'a': 1}, {'pattoo_agent_timestamp': 1000}])
+
+        # Recovered segments are named after their oldest agent timestamp
+        self.assertEqual(
+            os.path.basename(segments[0]),
+            '1000_999999999_000001{}'.format(spool.SUFFIX))
+
+    def test_recover_locks(self):
+        """Testing method / function recover with reused process IDs."""
+        # Segments that are locked by their writer must not be touched,
+        # even if the process ID in the filename is not running
+        writer = spool.Writer(self.directory)
+        writer.append({'a': 1})
+        filepath = _segments(self.directory, spool.OPEN_SUFFIX)[0]
+        os.rename(filepath, os.path.join(
+            self.directory,
+            '5000_999999999_000001{}'.format(spool.OPEN_SUFFIX)))
+        writer._filepath = _segments(self.directory, spool.OPEN_SUFFIX)[0]
+        spool.recover(self.directory)
+        self.assertEqual(_segments(self.directory), [])
+        writer.close()
+        self.assertEqual(len(_segments(self.directory)), 1)
+
+        # Unlocked segments must be closed, even if the process ID in the
+        # filename has been reused by a running process
+        filepath = os.path.join(
+            self.directory,
+            '6000_{}_000001{}'.format(os.getpid(), spool.OPEN_SUFFIX))
+        with open(filepath, 'wb') as _fp:
+            _fp.write(b'PSPL\x01\x00\x00\x00')
+        spool.recover(self.directory)
+        self.assertEqual(_segments(self.directory, spool.OPEN_SUFFIX), [])
+        self.assertEqual(len(_segments(self.directory)), 2)
+
+
+def _segments(directory, suffix=spool.SUFFIX):
+    """Get the sorted list of segments in a directory.
+
+    Args:
+        directory: Directory
+        suffix: Segment filename suffix
+
+    Returns:
+        result: List of filepaths
+
+    """
+    result = sorted([
+        os.path.join(directory, _) for _ in os.listdir(directory)
+        if _.endswith(suffix)])
+    return result
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -76,6 +76,17 @@ class TestBasicFunctiions(unittest.TestCase):
             result = uri.chart_timestamp_args(idx_datapoint, value)
             self.assertEqual(result + 604800000, now)
 
+    def test_timestamp_args(self):
+        """Testing function timestamp_args."""
+        # Test
+        now = 10000000
+        for value in [False, None, 'foo']:
+            result = uri.timestamp_args(value, now=now)
+            self.assertEqual(result + 604800000, now)
+        for value in [-1, 6011]:
+            result = uri.timestamp_args(value, now=now)
+            self.assertEqual(result + (abs(value) * 1000), now)
+
 
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
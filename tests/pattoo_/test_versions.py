@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Test the pattoo versions module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+from multiprocessing import get_context
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from tests.libraries.configuration import UnittestConfig
+from pattoo import versions
+
+
+class TestVersions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def setUp(self):
+        """Create a temporary directory."""
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'versions')
+
+    def tearDown(self):
+        """Delete the temporary directory."""
+        shutil.rmtree(self.directory)
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_get(self):
+        """Testing method / function get."""
+        # Nothing is published if the file doesn't exist
+        reader = versions.Versions(self.filename)
+        self.assertEqual(reader.get(5), 0)
+        self.assertFalse(os.path.isfile(self.filename))
+
+        # Readers must see values published by other objects
+        writer = versions.Versions(self.filename)
+        writer.publish({5: 100})
+        self.assertEqual(reader.get(5), 100)
+        self.assertEqual(reader.get(4), 0)
+
+        # Readers must see values beyond the end of their mapping once the
+        # file grows
+        writer.publish({500000: 200})
+        self.assertEqual(reader.get(500000), 200)
+        self.assertEqual(reader.get(50000000), 0)
+        reader.close()
+        writer.close()
+
+    def test_publish(self):
+        """Testing method / function publish."""
+        # Test
+        writer = versions.Versions(self.filename)
+        writer.publish({})
+        writer.publish({1: 100, 3: 50})
+        self.assertEqual(writer.get(1), 100)
+        self.assertEqual(writer.get(3), 50)
+
+        # Older values must be ignored
+        writer.publish({1: 90, 3: 60})
+        self.assertEqual(writer.get(1), 100)
+        self.assertEqual(writer.get(3), 60)
+        writer.close()
+
+    def test_publish_processes(self):
+        """Testing method / function publish with several processes."""
+        # Initialize key variables
+        processes = 4
+        count = 20000
+        context = get_context('fork')
+        barrier = context.Barrier(processes)
+
+        # Processes publish interleaved timestamps for the same DataPoints.
+        # Older values must never overwrite newer ones.
+        workers = [
+            context.Process(
+                target=_publish,
+                args=(self.filename, _, processes, count, barrier))
+            for _ in range(processes)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+
+        # Test
+        reader = versions.Versions(self.filename)
+        for idx_datapoint in range(1, 11):
+            self.assertEqual(reader.get(idx_datapoint), count - 1)
+        reader.close()
+
+    def test_close(self):
+        """Testing method / function close."""
+        # Values must persist
+        writer = versions.Versions(self.filename)
+        writer.publish({1: 100})
+        writer.close()
+        reader = versions.Versions(self.filename)
+        self.assertEqual(reader.get(1), 100)
+        reader.close()
+
+
+def _publish(filename, start, step, count, barrier):
+    """Publish timestamps to a versions file from a separate process.
+
+    Args:
+        filename: Name of the file
+        start: First timestamp
+        step: Increment between timestamps
+        count: Stop publishing before this timestamp
+        barrier: Barrier to start publishing at the same time as the other
+            processes
+
+    Returns:
+        None
+
+    """
+    # Publish
+    writer = versions.Versions(filename)
+    barrier.wait()
+    for timestamp in range(start, count, step):
+        writer.publish(
+            {idx_datapoint: timestamp for idx_datapoint in range(1, 11)})
+    writer.close()
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_versions(self):
+        """Testing method / function versions."""
+        # The same object must be returned
+        result = versions.versions()
+        self.assertTrue(isinstance(result, versions.Versions))
+        self.assertEqual(result, versions.versions())
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()